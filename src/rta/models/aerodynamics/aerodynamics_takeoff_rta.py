@@ -24,8 +24,10 @@ from fastoad_cs25.models.aerodynamics.constants import (
 )
 
 from .components.oei_effect import ComputeDeltaOEI
+from .constants import CT_POINT_COUNT
 from .components.initialize_in import InitializeIN
 from .components.lg_effect import ComputeDeltaLg
+from .components.takeoff_cl import ComputeTakeoffCL
 
 
 @RegisterOpenMDAOSystem("rta.aerodynamics.takeoff", domain=ModelDomain.AERODYNAMICS)
@@ -34,8 +36,19 @@ class AerodynamicsTakeoffRTA(om.Group):
     Computes aerodynamic characteristics at takeoff.
 
     - Computes CL and CD increments due to high-lift devices at takeoff.
+    - Computes lift coefficient during ground roll and max lift coefficient at takeoff.
+
+    Option "CT_point_count" sets the resolution of the thrust coefficient grid of OEI drag.
+
+    Low speed grids and landing gear increments do not depend on other variables. If option
+    "with_grids" is False, they are not computed here and "rta.aerodynamics.takeoff_grids" has
+    to be in the process, where it can be placed before the iterative loop.
     """
 
+    def initialize(self):
+        self.options.declare("CT_point_count", default=CT_POINT_COUNT, types=int, lower=2)
+        self.options.declare("with_grids", default=True, types=bool)
+
     def setup(self):
         landing_flag_option = {"landing_flag": False}
         polar_type_option = {"polar_type": PolarType.TAKEOFF}
@@ -44,10 +57,14 @@ class AerodynamicsTakeoffRTA(om.Group):
             RegisterSubmodel.get_submodel(SERVICE_HIGH_LIFT, landing_flag_option),
             promotes=["*"],
         )
+        self.add_subsystem("takeoff_CL", ComputeTakeoffCL(), promotes=["*"])
 
-        self.add_subsystem("inizialize_inputs", InitializeIN(), promotes=["*"])
-
-        self.add_subsystem("delta_lg", ComputeDeltaLg(landing_flag=False), promotes=["*"])
+        if self.options["with_grids"]:
+            self.add_subsystem(
+                "grids",
+                AerodynamicsTakeoffGridsRTA(CT_point_count=self.options["CT_point_count"]),
+                promotes=["*"],
+            )
 
         self.add_subsystem("delta_OEI", ComputeDeltaOEI(landing_flag=False), promotes=["*"])
         self.add_subsystem(
@@ -55,3 +72,24 @@ class AerodynamicsTakeoffRTA(om.Group):
             RegisterSubmodel.get_submodel(SERVICE_POLAR, polar_type_option),
             promotes=["*"],
         )
+
+
+@RegisterOpenMDAOSystem("rta.aerodynamics.takeoff_grids", domain=ModelDomain.AERODYNAMICS)
+class AerodynamicsTakeoffGridsRTA(om.Group):
+    """
+    Provides low speed grids and landing gear increments at takeoff, which are constant.
+
+    To be used with option "with_grids" of "rta.aerodynamics.takeoff" set to False, so that
+    these outputs are not computed at each iteration of the loop.
+    """
+
+    def initialize(self):
+        self.options.declare("CT_point_count", default=CT_POINT_COUNT, types=int, lower=2)
+
+    def setup(self):
+        self.add_subsystem(
+            "inizialize_inputs",
+            InitializeIN(CT_point_count=self.options["CT_point_count"]),
+            promotes=["*"],
+        )
+        self.add_subsystem("delta_lg", ComputeDeltaLg(landing_flag=False), promotes=["*"])
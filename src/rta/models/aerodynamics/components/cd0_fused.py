@@ -0,0 +1,294 @@
+"""
+Computation of CD0 of whole aircraft in a single component
+"""
+#  This file is part of FAST : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2020  ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import numpy as np
+from fastoad.module_management.service_registry import RegisterSubmodel
+from fastoad_cs25.models.aerodynamics.components.utils.cd0_lifting_surface import (
+    LiftingSurfaceGeometry,
+    compute_cd0_lifting_surface,
+)
+from fastoad_cs25.models.aerodynamics.constants import SERVICE_CD0
+from openmdao.core.explicitcomponent import ExplicitComponent
+
+from rta.models.aerodynamics.constants import LIFTING_SURFACE_INTERACTION_COEFFS
+from .cd0_fuselage import compute_cd0_fuselage, compute_cd0_fuselage_partials
+from .cd0_nacelle_pylons_tp import compute_cd0_nacelles, compute_cd0_nacelles_partials
+from .cd0_total import compute_k_parasite, compute_k_parasite_derivative
+from .friction_drag import get_flat_plate_friction_drag_partials
+
+RegisterSubmodel.active_models[SERVICE_CD0] = "fastoad.submodel.aerodynamics.CD0.legacy"
+
+
+def compute_cd0_lifting_surface_partials(
+    geometry: LiftingSurfaceGeometry, mach, reynolds, wing_area
+):
+    """
+    Computes derivatives of
+    :func:`~fastoad_cs25.models.aerodynamics.components.utils.cd0_lifting_surface.compute_cd0_lifting_surface`
+    for a lifting surface that is not cambered.
+
+    :return: dict of derivatives by name of geometry field or argument
+    """
+    cf, d_cf_d_length, d_cf_d_mach, d_cf_d_reynolds = get_flat_plate_friction_drag_partials(
+        geometry.MAC_length, mach, reynolds
+    )
+    thickness_ratio = geometry.thickness_ratio
+    sweep_25 = geometry.sweep_angle_25
+    thickness_contribution = 4.688 * thickness_ratio**2 + 3.146 * thickness_ratio
+    sweep_correction = 1 - 0.000178 * sweep_25**2 - 0.0065 * sweep_25
+    form_factor = thickness_contribution * sweep_correction + geometry.interaction_coeff + 1
+    area_ratio = geometry.wet_area / wing_area
+
+    return {
+        "thickness_ratio": (2 * 4.688 * thickness_ratio + 3.146)
+        * sweep_correction
+        * cf
+        * area_ratio,
+        "MAC_length": form_factor * d_cf_d_length * area_ratio,
+        "sweep_angle_25": thickness_contribution
+        * (-2 * 0.000178 * sweep_25 - 0.0065)
+        * cf
+        * area_ratio,
+        "wet_area": form_factor * cf / wing_area,
+        "wing_area": -form_factor * cf * area_ratio / wing_area,
+        "mach": form_factor * d_cf_d_mach * area_ratio,
+        "reynolds": form_factor * d_cf_d_reynolds * area_ratio,
+    }
+
+
+@RegisterSubmodel(SERVICE_CD0, "rta.submodel.aerodynamics.CD0.fused")
+class CD0Fused(ExplicitComponent):
+    """
+    Computation of form drag for whole aircraft, in one component with analytic partials.
+
+    Same models as the legacy CD0 group with RTA submodels of wing, fuselage, nacelles and sum,
+    and legacy submodels of tails. CD0 of all parts are still provided.
+    """
+
+    def initialize(self):
+        self.options.declare("low_speed_aero", default=False, types=bool)
+
+    def setup(self):
+        if self.options["low_speed_aero"]:
+            self._regime = "low_speed"
+            self._mach_name = "data:aerodynamics:aircraft:takeoff:mach"
+        else:
+            self._regime = "cruise"
+            self._mach_name = "data:TLAR:cruise_mach"
+        self._reynolds_name = "data:aerodynamics:wing:%s:reynolds" % self._regime
+        self._cl_name = "data:aerodynamics:aircraft:%s:CL" % self._regime
+
+        self.add_input(self._reynolds_name, val=np.nan)
+        self.add_input(self._mach_name, val=np.nan)
+        self.add_input(self._cl_name, shape_by_conn=True, val=np.nan)
+
+        self.add_input("data:geometry:wing:area", val=np.nan, units="m**2")
+        for surface in LIFTING_SURFACE_INTERACTION_COEFFS:
+            self.add_input("data:geometry:%s:thickness_ratio" % surface, val=np.nan)
+            self.add_input("data:geometry:%s:MAC:length" % surface, val=np.nan, units="m")
+            self.add_input("data:geometry:%s:sweep_25" % surface, val=np.nan, units="deg")
+            self.add_input("data:geometry:%s:wetted_area" % surface, val=np.nan, units="m**2")
+        self.add_input("data:geometry:fuselage:length", val=np.nan, units="m")
+        self.add_input("data:geometry:fuselage:maximum_width", val=np.nan, units="m")
+        self.add_input("data:geometry:fuselage:maximum_height", val=np.nan, units="m")
+        self.add_input("data:geometry:fuselage:wetted_area", val=np.nan, units="m**2")
+        self.add_input("data:geometry:propulsion:nacelle:length", val=np.nan, units="m")
+        self.add_input("data:geometry:propulsion:nacelle:wetted_area", val=np.nan, units="m**2")
+        self.add_input("data:geometry:propulsion:engine:count", val=np.nan)
+        self.add_input("data:geometry:aircraft:wetted_area", val=np.nan, units="m**2")
+        self.add_input("tuning:aerodynamics:aircraft:cruise:CD:parasite:k", val=np.nan)
+
+        for part in ["wing", "fuselage", "aircraft"]:
+            self.add_output(
+                "data:aerodynamics:%s:%s:CD0" % (part, self._regime), copy_shape=self._cl_name
+            )
+        for part in ["horizontal_tail", "vertical_tail", "nacelles"]:
+            self.add_output("data:aerodynamics:%s:%s:CD0" % (part, self._regime))
+
+    def setup_partials(self):
+        cl_size = self.get_io_metadata(
+            iotypes="input", metadata_keys=["size"], includes=[self._cl_name]
+        )[self._cl_name]["size"]
+        cl_indices = np.arange(cl_size)
+
+        aircraft_inputs = [
+            "data:geometry:aircraft:wetted_area",
+            "tuning:aerodynamics:aircraft:cruise:CD:parasite:k",
+        ]
+        for part, inputs in self._get_part_inputs().items():
+            input_names = [name for name in inputs.values() if name != self._cl_name]
+            self.declare_partials(self._get_part_cd0_name(part), input_names)
+            aircraft_inputs += [name for name in input_names if name not in aircraft_inputs]
+        self.declare_partials(self._get_part_cd0_name("aircraft"), aircraft_inputs)
+        self.declare_partials(
+            [self._get_part_cd0_name("fuselage"), self._get_part_cd0_name("aircraft")],
+            self._cl_name,
+            rows=cl_indices,
+            cols=cl_indices,
+        )
+
+    def compute(self, inputs, outputs, discrete_inputs=None, discrete_outputs=None):
+        part_cd0 = self._compute_part_cd0(inputs)
+        cd0_sum = sum(part_cd0.values())
+
+        for part, cd0 in part_cd0.items():
+            outputs[self._get_part_cd0_name(part)] = cd0
+        outputs[self._get_part_cd0_name("aircraft")] = cd0_sum * (
+            1.0
+            + compute_k_parasite(inputs["data:geometry:aircraft:wetted_area"])
+            * inputs["tuning:aerodynamics:aircraft:cruise:CD:parasite:k"]
+        )
+
+    def compute_partials(self, inputs, partials, discrete_inputs=None):
+        wet_area_total = inputs["data:geometry:aircraft:wetted_area"]
+        k_techno = inputs["tuning:aerodynamics:aircraft:cruise:CD:parasite:k"]
+        k_parasite = compute_k_parasite(wet_area_total)
+        parasite_factor = 1.0 + k_parasite * k_techno
+        cd0_sum = sum(self._compute_part_cd0(inputs).values())
+
+        aircraft_name = self._get_part_cd0_name("aircraft")
+        aircraft_partials = {
+            "data:geometry:aircraft:wetted_area": cd0_sum
+            * k_techno
+            * compute_k_parasite_derivative(wet_area_total),
+            "tuning:aerodynamics:aircraft:cruise:CD:parasite:k": cd0_sum * k_parasite,
+        }
+
+        part_derivatives = {
+            surface: compute_cd0_lifting_surface_partials(
+                self._get_lifting_surface_geometry(inputs, surface),
+                inputs[self._mach_name],
+                inputs[self._reynolds_name],
+                inputs["data:geometry:wing:area"],
+            )
+            for surface in LIFTING_SURFACE_INTERACTION_COEFFS
+        }
+        part_derivatives["fuselage"] = compute_cd0_fuselage_partials(
+            **self._get_arguments(inputs, self._get_fuselage_inputs())
+        )
+        part_derivatives["nacelles"] = compute_cd0_nacelles_partials(
+            **self._get_arguments(inputs, self._get_nacelle_inputs())
+        )
+        part_inputs = self._get_part_inputs()
+
+        for part, derivatives in part_derivatives.items():
+            for argument, input_name in part_inputs[part].items():
+                partials[self._get_part_cd0_name(part), input_name] = derivatives[argument]
+                aircraft_partials[input_name] = (
+                    aircraft_partials.get(input_name, 0.0) + derivatives[argument] * parasite_factor
+                )
+        for input_name, value in aircraft_partials.items():
+            partials[aircraft_name, input_name] = value
+
+    def _get_part_cd0_name(self, part):
+        return "data:aerodynamics:%s:%s:CD0" % (part, self._regime)
+
+    def _get_part_inputs(self):
+        """
+        :return: dict of input names by argument name of CD0 function, for each part
+        """
+        part_inputs = {
+            surface: self._get_lifting_surface_inputs(surface)
+            for surface in LIFTING_SURFACE_INTERACTION_COEFFS
+        }
+        part_inputs["fuselage"] = self._get_fuselage_inputs()
+        part_inputs["nacelles"] = self._get_nacelle_inputs()
+
+        return part_inputs
+
+    def _get_lifting_surface_inputs(self, surface):
+        """
+        :return: dict of input names by name of geometry field or argument
+        """
+        return {
+            "thickness_ratio": "data:geometry:%s:thickness_ratio" % surface,
+            "MAC_length": "data:geometry:%s:MAC:length" % surface,
+            "sweep_angle_25": "data:geometry:%s:sweep_25" % surface,
+            "wet_area": "data:geometry:%s:wetted_area" % surface,
+            "wing_area": "data:geometry:wing:area",
+            "mach": self._mach_name,
+            "reynolds": self._reynolds_name,
+        }
+
+    def _get_fuselage_inputs(self):
+        """
+        :return: dict of input names by argument name of :func:`compute_cd0_fuselage`
+        """
+        return {
+            "height_max": "data:geometry:fuselage:maximum_height",
+            "width_max": "data:geometry:fuselage:maximum_width",
+            "wet_area_fus": "data:geometry:fuselage:wetted_area",
+            "fus_length": "data:geometry:fuselage:length",
+            "wing_area": "data:geometry:wing:area",
+            "mach": self._mach_name,
+            "reynolds": self._reynolds_name,
+            "cl": self._cl_name,
+        }
+
+    def _get_nacelle_inputs(self):
+        """
+        :return: dict of input names by argument name of :func:`compute_cd0_nacelles`
+        """
+        return {
+            "nac_length": "data:geometry:propulsion:nacelle:length",
+            "wet_area_nac": "data:geometry:propulsion:nacelle:wetted_area",
+            "n_engines": "data:geometry:propulsion:engine:count",
+            "wing_area": "data:geometry:wing:area",
+            "mach": self._mach_name,
+            "reynolds": self._reynolds_name,
+        }
+
+    @staticmethod
+    def _get_arguments(inputs, input_names):
+        return {argument: inputs[name] for argument, name in input_names.items()}
+
+    @staticmethod
+    def _get_lifting_surface_geometry(inputs, surface):
+        return LiftingSurfaceGeometry(
+            thickness_ratio=inputs["data:geometry:%s:thickness_ratio" % surface],
+            MAC_length=inputs["data:geometry:%s:MAC:length" % surface],
+            sweep_angle_25=inputs["data:geometry:%s:sweep_25" % surface],
+            wet_area=inputs["data:geometry:%s:wetted_area" % surface],
+            cambered=False,
+            interaction_coeff=LIFTING_SURFACE_INTERACTION_COEFFS[surface],
+        )
+
+    def _compute_part_cd0(self, inputs):
+        """
+        :return: dict of CD0 by part, aircraft excluded
+        """
+        mach = inputs[self._mach_name]
+        reynolds = inputs[self._reynolds_name]
+        cl = inputs[self._cl_name]
+
+        part_cd0 = {
+            surface: compute_cd0_lifting_surface(
+                self._get_lifting_surface_geometry(inputs, surface),
+                mach,
+                reynolds,
+                inputs["data:geometry:wing:area"],
+            )
+            for surface in LIFTING_SURFACE_INTERACTION_COEFFS
+        }
+        part_cd0["wing"] = np.full_like(cl, part_cd0["wing"])
+        part_cd0["fuselage"] = compute_cd0_fuselage(
+            **self._get_arguments(inputs, self._get_fuselage_inputs())
+        )
+        part_cd0["nacelles"] = compute_cd0_nacelles(
+            **self._get_arguments(inputs, self._get_nacelle_inputs())
+        )
+
+        return part_cd0
@@ -16,11 +16,98 @@ FAST - Copyright (c) 2025 ONERA ISAE
 
 import numpy as np
 from fastoad.module_management.service_registry import RegisterSubmodel
+from fastoad_cs25.models.aerodynamics.components.utils.friction_drag import (
+    get_flat_plate_friction_drag_coefficient,
+)
 from fastoad_cs25.models.aerodynamics.constants import SERVICE_CD0_FUSELAGE
 from openmdao.core.explicitcomponent import ExplicitComponent
 
+from rta.models.aerodynamics.constants import FUSELAGE_FRICTION_INCREMENT
+from .friction_drag import get_flat_plate_friction_drag_partials
+
 RegisterSubmodel.active_models[SERVICE_CD0_FUSELAGE] = "rta.submodel.aerodynamics.CD0.fuselage"
 
+# Ratio of upsweep drag area to fuselage frontal area
+UPSWEEP_AREA_RATIO = 0.67 * 3.6
+# Polynomial coefficients of upsweep drag factor as function of CL, highest degree first
+UPSWEEP_FACTOR_POLYNOMIAL = np.array([0.0029, -0.0066, 0.0043])
+
+
+def compute_cd0_fuselage(
+    height_max, width_max, wet_area_fus, fus_length, wing_area, mach, reynolds, cl
+):
+    """
+    Computes CD0 of fuselage, as friction drag plus upsweep drag.
+
+    :param height_max: maximum height of fuselage, in m
+    :param width_max: maximum width of fuselage, in m
+    :param wet_area_fus: wet area of fuselage, in m**2
+    :param fus_length: length of fuselage, in m
+    :param wing_area: wing area, in m**2
+    :param mach: Mach number
+    :param reynolds: unitary Reynolds number, in 1/m
+    :param cl: lift coefficient
+    :return: CD0 of fuselage
+    """
+    cf_fus = get_flat_plate_friction_drag_coefficient(fus_length, mach, reynolds) * (
+        1 + FUSELAGE_FRICTION_INCREMENT
+    )
+
+    cd0_friction_fus = (
+        (0.98 + 0.745 * np.sqrt(height_max * width_max) / fus_length)
+        * cf_fus
+        * wet_area_fus
+        / wing_area
+    )
+    cd0_upsweep_fus = (
+        np.polyval(UPSWEEP_FACTOR_POLYNOMIAL, cl)
+        * UPSWEEP_AREA_RATIO
+        * height_max
+        * width_max
+        / wing_area
+    )
+
+    return cd0_friction_fus + cd0_upsweep_fus
+
+
+def compute_cd0_fuselage_partials(
+    height_max, width_max, wet_area_fus, fus_length, wing_area, mach, reynolds, cl
+):
+    """
+    Computes derivatives of :func:`compute_cd0_fuselage`.
+
+    :return: dict of derivatives by argument name
+    """
+    cf, d_cf_d_length, d_cf_d_mach, d_cf_d_reynolds = get_flat_plate_friction_drag_partials(
+        fus_length, mach, reynolds
+    )
+    cf_fus = cf * (1 + FUSELAGE_FRICTION_INCREMENT)
+    form_factor = 0.98 + 0.745 * np.sqrt(height_max * width_max) / fus_length
+    friction_ratio = (1 + FUSELAGE_FRICTION_INCREMENT) * form_factor * wet_area_fus / wing_area
+    d_friction_d_sqrt = 0.745 / fus_length * cf_fus * wet_area_fus / wing_area
+    upsweep_ratio = np.polyval(UPSWEEP_FACTOR_POLYNOMIAL, cl) * UPSWEEP_AREA_RATIO / wing_area
+
+    return {
+        "height_max": d_friction_d_sqrt * 0.5 * np.sqrt(width_max / height_max)
+        + upsweep_ratio * width_max,
+        "width_max": d_friction_d_sqrt * 0.5 * np.sqrt(height_max / width_max)
+        + upsweep_ratio * height_max,
+        "wet_area_fus": form_factor * cf_fus / wing_area,
+        "fus_length": friction_ratio * d_cf_d_length
+        - d_friction_d_sqrt * np.sqrt(height_max * width_max) / fus_length,
+        "wing_area": -compute_cd0_fuselage(
+            height_max, width_max, wet_area_fus, fus_length, wing_area, mach, reynolds, cl
+        )
+        / wing_area,
+        "mach": friction_ratio * d_cf_d_mach,
+        "reynolds": friction_ratio * d_cf_d_reynolds,
+        "cl": np.polyval(np.polyder(UPSWEEP_FACTOR_POLYNOMIAL), cl)
+        * UPSWEEP_AREA_RATIO
+        * height_max
+        * width_max
+        / wing_area,
+    }
+
 
 @RegisterSubmodel(SERVICE_CD0_FUSELAGE, "rta.submodel.aerodynamics.CD0.fuselage")
 class Cd0Fuselage(ExplicitComponent):
@@ -73,31 +160,10 @@ class Cd0Fuselage(ExplicitComponent):
             mach = inputs["data:TLAR:cruise_mach"]
             reynolds = inputs["data:aerodynamics:wing:cruise:reynolds"]
 
-        # Reference for deltas: Conceptual Aircraft Design: An Industrial Approach.
-        # Authors: Ajoy Kumar Kundu, Mark A. Price, David Riordan Pag 493
-        delta_cf_karman = 0.1  # find formulas to estimate (cd0 should be around 7 dc)
-        delta_cf_bellyfairing = 0.2  # find formulas to estimate (cd0 should be around 15 dc)
-
-        cf_fus_opt = 0.455 / (
-            (1 + 0.144 * mach**2) ** 0.65 * (np.log10(reynolds * fus_length)) ** 2.58
+        cd0_fus = compute_cd0_fuselage(
+            height_max, width_max, wet_area_fus, fus_length, wing_area, mach, reynolds, cl
         )
 
-        cf_fus = cf_fus_opt * (1 + delta_cf_karman + delta_cf_bellyfairing)
-
-        cd0_friction_fus = (
-            (0.98 + 0.745 * np.sqrt(height_max * width_max) / fus_length)
-            * cf_fus
-            * wet_area_fus
-            / wing_area
-        )
-        cd0_upsweep_fus = (
-            (0.0029 * cl**2 - 0.0066 * cl + 0.0043)
-            * (0.67 * 3.6 * height_max * width_max)
-            / wing_area
-        )
-
-        cd0_fus = cd0_friction_fus + cd0_upsweep_fus
-
         if self.low_speed_aero:
             outputs["data:aerodynamics:fuselage:low_speed:CD0"] = cd0_fus
         else:
@@ -23,11 +23,52 @@ from fastoad_cs25.models.aerodynamics.components.utils.friction_drag import (
 )
 from openmdao.core.explicitcomponent import ExplicitComponent
 
+from rta.models.aerodynamics.constants import NACELLE_INTERFERENCE_CD0
+from .friction_drag import get_flat_plate_friction_drag_partials
+
 RegisterSubmodel.active_models[SERVICE_CD0_NACELLES_PYLONS] = (
     "rta.submodel.aerodynamics.CD0.nacelles"
 )
 
 
+def compute_cd0_nacelles(nac_length, wet_area_nac, n_engines, wing_area, mach, reynolds):
+    """
+    Computes CD0 of all nacelles, as friction drag plus interference drag.
+
+    :param nac_length: length of one nacelle, in m
+    :param wet_area_nac: wet area of one nacelle, in m**2
+    :param n_engines: number of engines
+    :param wing_area: wing area, in m**2
+    :param mach: Mach number
+    :param reynolds: unitary Reynolds number, in 1/m
+    :return: CD0 of nacelles
+    """
+    cf_nac = get_flat_plate_friction_drag_coefficient(nac_length, mach, reynolds)
+
+    return n_engines * (cf_nac * wet_area_nac / wing_area + NACELLE_INTERFERENCE_CD0)
+
+
+def compute_cd0_nacelles_partials(nac_length, wet_area_nac, n_engines, wing_area, mach, reynolds):
+    """
+    Computes derivatives of :func:`compute_cd0_nacelles`.
+
+    :return: dict of derivatives by argument name
+    """
+    cf, d_cf_d_length, d_cf_d_mach, d_cf_d_reynolds = get_flat_plate_friction_drag_partials(
+        nac_length, mach, reynolds
+    )
+    area_ratio = wet_area_nac / wing_area
+
+    return {
+        "nac_length": n_engines * d_cf_d_length * area_ratio,
+        "wet_area_nac": n_engines * cf / wing_area,
+        "n_engines": cf * area_ratio + NACELLE_INTERFERENCE_CD0,
+        "wing_area": -n_engines * cf * area_ratio / wing_area,
+        "mach": n_engines * d_cf_d_mach * area_ratio,
+        "reynolds": n_engines * d_cf_d_reynolds * area_ratio,
+    }
+
+
 @RegisterSubmodel(SERVICE_CD0_NACELLES_PYLONS, "rta.submodel.aerodynamics.CD0.nacelles")
 class Cd0NacelleAndPylonsTP(ExplicitComponent):
     def initialize(self):
@@ -65,10 +106,9 @@ class Cd0NacelleAndPylonsTP(ExplicitComponent):
             mach = inputs["data:TLAR:cruise_mach"]
             reynolds = inputs["data:aerodynamics:wing:cruise:reynolds"]
 
-        cf_nac = get_flat_plate_friction_drag_coefficient(nac_length, mach, reynolds)
-
-        cd0_int_nac = 0.0005  # subject to discussion
-        cd0_nac = n_engines * (cf_nac * wet_area_nac / wing_area + cd0_int_nac)
+        cd0_nac = compute_cd0_nacelles(
+            nac_length, wet_area_nac, n_engines, wing_area, mach, reynolds
+        )
 
         if self.low_speed_aero:
             outputs["data:aerodynamics:nacelles:low_speed:CD0"] = cd0_nac
@@ -29,6 +29,27 @@ Does not use OEI effect or landing gear drag
 RegisterSubmodel.active_models[SERVICE_CD0_SUM] = "rta.submodel.aerodynamics.CD0.sum"
 
 
+# Polynomial coefficients of ratio of parasite drag to sum of CD0 of aircraft parts, as function
+# of aircraft wet area in m**2, highest degree first
+K_PARASITE_POLYNOMIAL = np.array([-2.39e-12, 2.58e-8, -0.89e-4, 0.163])
+
+
+def compute_k_parasite(wet_area_total):
+    """
+    :param wet_area_total: wet area of aircraft, in m**2
+    :return: ratio of parasite drag to sum of CD0 of aircraft parts
+    """
+    return np.polyval(K_PARASITE_POLYNOMIAL, wet_area_total)
+
+
+def compute_k_parasite_derivative(wet_area_total):
+    """
+    :param wet_area_total: wet area of aircraft, in m**2
+    :return: derivative of :func:`compute_k_parasite`, in 1/m**2
+    """
+    return np.polyval(np.polyder(K_PARASITE_POLYNOMIAL), wet_area_total)
+
+
 @RegisterSubmodel(SERVICE_CD0_SUM, "rta.submodel.aerodynamics.CD0.sum")
 class Cd0Total(ExplicitComponent):
     def initialize(self):
@@ -84,12 +105,7 @@ class Cd0Total(ExplicitComponent):
             cd0_vt = inputs["data:aerodynamics:vertical_tail:cruise:CD0"]
             cd0_nac = inputs["data:aerodynamics:nacelles:cruise:CD0"]
 
-        k_parasite = (
-            -2.39 * pow(10, -12) * wet_area_total**3
-            + 2.58 * pow(10, -8) * wet_area_total**2
-            - 0.89 * pow(10, -4) * wet_area_total
-            + 0.163
-        )
+        k_parasite = compute_k_parasite(wet_area_total)
 
         cd0_total_hs = cd0_wing + cd0_fus + cd0_ht + cd0_vt + cd0_nac
         cd0_total = cd0_total_hs * (1.0 + k_parasite * k_techno)
@@ -23,6 +23,8 @@ from fastoad_cs25.models.aerodynamics.components.utils.cd0_lifting_surface impor
 from fastoad_cs25.models.aerodynamics.constants import SERVICE_CD0_WING
 from openmdao.core.explicitcomponent import ExplicitComponent
 
+from rta.models.aerodynamics.constants import LIFTING_SURFACE_INTERACTION_COEFFS
+
 RegisterSubmodel.active_models[SERVICE_CD0_WING] = "rta.submodel.aerodynamics.CD0.wing"
 
 
@@ -80,7 +82,7 @@ class Cd0Wing(ExplicitComponent):
             sweep_angle_25=inputs["data:geometry:wing:sweep_25"],
             wet_area=inputs["data:geometry:wing:wetted_area"],
             cambered=False,
-            interaction_coeff=0.04,
+            interaction_coeff=LIFTING_SURFACE_INTERACTION_COEFFS["wing"],
         )
 
         cd0_wing = compute_cd0_lifting_surface(wing_geometry, mach, reynolds, wing_area, cl)
@@ -0,0 +1,33 @@
+"""
+Base class for components with constant outputs
+"""
+#  This file is part of FAST : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2020  ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from openmdao.core.explicitcomponent import ExplicitComponent
+
+
+class ConstantOutputs(ExplicitComponent):
+    """
+    Component whose outputs do not depend on anything.
+
+    Output values are provided once at setup, as default values of outputs. Computation does
+    nothing and no partial is declared, so that solver iterations only find these outputs
+    unchanged and linear solves get a zero right-hand side for them.
+
+    Outputs are not tagged as independent variables, as outputs of an IndepVarComp would be,
+    so they are not listed as problem inputs by FAST-OAD.
+    """
+
+    def compute(self, inputs, outputs, discrete_inputs=None, discrete_outputs=None):
+        pass
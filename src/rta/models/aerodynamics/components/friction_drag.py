@@ -0,0 +1,41 @@
+"""
+Derivatives of friction drag of flat plate
+"""
+
+#  This file is part of FAST : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2020  ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import numpy as np
+from fastoad_cs25.models.aerodynamics.components.utils.friction_drag import (
+    get_flat_plate_friction_drag_coefficient,
+)
+
+
+def get_flat_plate_friction_drag_partials(length, mach, reynolds):
+    """
+    :param length: flat plate length in meters
+    :param mach: Mach number
+    :param reynolds: unitary Reynolds number
+    :return: friction drag coefficient of
+             :func:`~fastoad_cs25.models.aerodynamics.components.utils.friction_drag.get_flat_plate_friction_drag_coefficient`
+             and its derivatives with respect to length, Mach number and Reynolds number
+    """
+    cf = get_flat_plate_friction_drag_coefficient(length, mach, reynolds)
+    d_cf_d_log = -2.58 * cf / (np.log10(reynolds * length) * np.log(10.0))
+
+    return (
+        cf,
+        d_cf_d_log / length,
+        -0.65 * cf * 0.288 * mach / (1.0 + 0.144 * mach**2),
+        d_cf_d_log / reynolds,
+    )
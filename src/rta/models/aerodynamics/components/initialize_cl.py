@@ -0,0 +1,146 @@
+"""
+Initialization of CL vector of polars, with configurable resolution
+"""
+#  This file is part of FAST : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2020  ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import numpy as np
+from fastoad.module_management.service_registry import RegisterSubmodel
+from fastoad_cs25.models.aerodynamics.constants import SERVICE_INITIALIZE_CL
+from openmdao.core.explicitcomponent import ExplicitComponent
+
+from rta.models.aerodynamics.constants import POLAR_CL_RANGE, POLAR_POINT_COUNT
+
+RegisterSubmodel.active_models[SERVICE_INITIALIZE_CL] = "rta.submodel.aerodynamics.initialize_CL"
+
+
+def get_adaptive_grid(lower, upper, point_count, dense_range, dense_ratio):
+    """
+    Grid whose point density is dense_ratio times higher in dense_range than elsewhere.
+
+    Points are placed so that the integral of density between consecutive points is constant.
+
+    :param lower: first point
+    :param upper: upper bound, excluded as in np.arange
+    :param point_count: number of points
+    :param dense_range: (lower, upper) bounds of the interval with dense points
+    :param dense_ratio: ratio of point densities inside and outside dense_range
+    :return: sorted array of point_count values
+    """
+    bounds = np.clip(np.array([lower, *dense_range, upper], dtype=float), lower, upper)
+    densities = np.array([1.0, dense_ratio, 1.0])
+    cumulated_density = np.concatenate([[0.0], np.cumsum(np.diff(bounds) * densities)])
+
+    return np.interp(
+        np.arange(point_count) * cumulated_density[-1] / point_count, cumulated_density, bounds
+    )
+
+
+@RegisterSubmodel(SERVICE_INITIALIZE_CL, "rta.submodel.aerodynamics.initialize_CL")
+class InitializeClPolar(ExplicitComponent):
+    """
+    Initialization of CL vector, as the legacy one, with a configurable number of points.
+
+    With option "adaptive", points are gathered in the "dense_CL_range" option, where the
+    mission flies (climb and cruise for high speed polar), "dense_ratio" times more densely
+    than elsewhere. Curvature of the parabolic part of the polar does not depend on CL, so that
+    interpolation error of a uniform grid would be the same all along the polar.
+
+    Computation cost of polar components with finite-difference partials is proportional to
+    the number of points.
+    """
+
+    def initialize(self):
+        self.options.declare("low_speed_aero", default=False, types=bool)
+        self.options.declare("polar_point_count", default=POLAR_POINT_COUNT, types=int, lower=2)
+        self.options.declare("adaptive", default=False, types=bool)
+        self.options.declare(
+            "dense_CL_range",
+            default=(0.3, 0.9),
+            types=tuple,
+            desc="CL range with dense points in adaptive mode, before tuning",
+        )
+        self.options.declare("dense_ratio", default=4.0, types=float, lower=1.0)
+
+    def setup(self):
+        self.add_input("tuning:aerodynamics:aircraft:cruise:CL:k", val=np.nan)
+        self.add_input("tuning:aerodynamics:aircraft:cruise:CL:offset", val=np.nan)
+        self.add_input("tuning:aerodynamics:aircraft:cruise:CL:winglet_effect:k", val=np.nan)
+        self.add_input("tuning:aerodynamics:aircraft:cruise:CL:winglet_effect:offset", val=np.nan)
+
+        point_count = self.options["polar_point_count"]
+        if self.options["adaptive"]:
+            self._base_cl = get_adaptive_grid(
+                *POLAR_CL_RANGE,
+                point_count,
+                self.options["dense_CL_range"],
+                self.options["dense_ratio"],
+            )
+        else:
+            self._base_cl = np.linspace(*POLAR_CL_RANGE, point_count, endpoint=False)
+
+        if self.options["low_speed_aero"]:
+            self._cl_name = "data:aerodynamics:aircraft:low_speed:CL"
+        else:
+            self._cl_name = "data:aerodynamics:aircraft:cruise:CL"
+        self.add_output(self._cl_name, shape=point_count)
+
+    def setup_partials(self):
+        self.declare_partials(
+            self._cl_name,
+            [
+                "tuning:aerodynamics:aircraft:cruise:CL:k",
+                "tuning:aerodynamics:aircraft:cruise:CL:winglet_effect:k",
+            ],
+        )
+        self.declare_partials(
+            self._cl_name,
+            [
+                "tuning:aerodynamics:aircraft:cruise:CL:offset",
+                "tuning:aerodynamics:aircraft:cruise:CL:winglet_effect:offset",
+            ],
+            val=1.0,
+        )
+
+    def compute(self, inputs, outputs, discrete_inputs=None, discrete_outputs=None):
+        k_cl = inputs["tuning:aerodynamics:aircraft:cruise:CL:k"]
+        offset_cl = inputs["tuning:aerodynamics:aircraft:cruise:CL:offset"]
+        k_winglet_cl = inputs["tuning:aerodynamics:aircraft:cruise:CL:winglet_effect:k"]
+        offset_winglet_cl = inputs["tuning:aerodynamics:aircraft:cruise:CL:winglet_effect:offset"]
+
+        outputs[self._cl_name] = self._base_cl * k_cl * k_winglet_cl + offset_cl + offset_winglet_cl
+
+    def compute_partials(self, inputs, partials, discrete_inputs=None):
+        k_cl = inputs["tuning:aerodynamics:aircraft:cruise:CL:k"]
+        k_winglet_cl = inputs["tuning:aerodynamics:aircraft:cruise:CL:winglet_effect:k"]
+
+        partials[self._cl_name, "tuning:aerodynamics:aircraft:cruise:CL:k"] = (
+            self._base_cl * k_winglet_cl
+        )
+        partials[self._cl_name, "tuning:aerodynamics:aircraft:cruise:CL:winglet_effect:k"] = (
+            self._base_cl * k_cl
+        )
+
+
+@RegisterSubmodel(SERVICE_INITIALIZE_CL, "rta.submodel.aerodynamics.initialize_CL.adaptive")
+class InitializeClPolarAdaptive(InitializeClPolar):
+    """
+    Adaptive initialization of CL vector, with half the legacy number of points.
+
+    Unlike options, submodel identifiers can be chosen in the configuration file.
+    """
+
+    def initialize(self):
+        super().initialize()
+        self.options["polar_point_count"] = POLAR_POINT_COUNT // 2
+        self.options["adaptive"] = True
@@ -15,13 +15,16 @@ FAST - Copyright (c) 2025 ONERA ISAE
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import numpy as np
-from openmdao.core.explicitcomponent import ExplicitComponent
 
 from rta.models.aerodynamics.constants import (
     CT_POINT_COUNT,
     ALPHA_POINT_COUNT,
     H_POINT_COUNT,
+    LOW_SPEED_ALPHA_LIST,
+    LOW_SPEED_CT_RANGE,
+    LOW_SPEED_H_LIST,
 )
+from .constant_outputs import ConstantOutputs
 
 
 """
@@ -29,21 +32,26 @@ Unknown usage for CT, alpha list and H_list
 """
 
 
-class InitializeIN(ExplicitComponent):
+class InitializeIN(ConstantOutputs):
+    """Provides CT, alpha and height grids of low speed aerodynamics, set at setup"""
+
+    def initialize(self):
+        self.options.declare("CT_point_count", default=CT_POINT_COUNT, types=int, lower=2)
+
     def setup(self):
-        self.add_output("data:aerodynamics:aircraft:low_speed:CT", shape=CT_POINT_COUNT)
+        self.add_output(
+            "data:aerodynamics:aircraft:low_speed:CT",
+            val=np.linspace(*LOW_SPEED_CT_RANGE, self.options["CT_point_count"]),
+        )
         self.add_output(
             "data:aerodynamics:aircraft:low_speed:alpha",
+            val=LOW_SPEED_ALPHA_LIST,
             units="deg",
             shape=ALPHA_POINT_COUNT,
         )
-        self.add_output("data:aerodynamics:aircraft:low_speed:H", shape=H_POINT_COUNT, units="m")
-
-    def compute(self, inputs, outputs):
-        CT_list = np.linspace(-2, 2.0, CT_POINT_COUNT)
-        alpha_list = np.linspace(-1, 12.0, ALPHA_POINT_COUNT)
-        H_list = np.linspace(0.0, 30.0, H_POINT_COUNT)
-
-        outputs["data:aerodynamics:aircraft:low_speed:CT"] = CT_list
-        outputs["data:aerodynamics:aircraft:low_speed:alpha"] = alpha_list
-        outputs["data:aerodynamics:aircraft:low_speed:H"] = H_list
+        self.add_output(
+            "data:aerodynamics:aircraft:low_speed:H",
+            val=LOW_SPEED_H_LIST,
+            shape=H_POINT_COUNT,
+            units="m",
+        )
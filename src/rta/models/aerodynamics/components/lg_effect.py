@@ -15,55 +15,29 @@ Computation of Oswald coefficient
 #  You should have received a copy of the GNU General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-import numpy as np
-from openmdao.core.explicitcomponent import ExplicitComponent
-
-
-from rta.models.aerodynamics.constants import ALPHA_POINT_COUNT
+from rta.models.aerodynamics.constants import ALPHA_POINT_COUNT, LANDING_GEAR_DCD, LANDING_GEAR_DCL
+from .constant_outputs import ConstantOutputs
 
 """
 Undocumented
 """
 
 
-class ComputeDeltaLg(ExplicitComponent):
-    """Computes landing gear extension effect on Cl and Cd"""
+class ComputeDeltaLg(ConstantOutputs):
+    """Provides landing gear extension effect on Cl and Cd, set at setup"""
 
     def initialize(self):
         self.options.declare("landing_flag", default=False, types=bool)
 
     def setup(self):
-        if self.options["landing_flag"]:
-            self.add_output(
-                "data:aerodynamics:aircraft:landing:lg_effect:DCL",
-                shape=ALPHA_POINT_COUNT,
-            )
-            self.add_output(
-                "data:aerodynamics:aircraft:landing:lg_effect:DCD",
-                shape=ALPHA_POINT_COUNT,
-            )
-        else:
-            self.add_output(
-                "data:aerodynamics:aircraft:takeoff:lg_effect:DCL",
-                shape=ALPHA_POINT_COUNT,
-            )
-            self.add_output(
-                "data:aerodynamics:aircraft:takeoff:lg_effect:DCD",
-                shape=ALPHA_POINT_COUNT,
-            )
-
-    def compute(self, inputs, outputs):
-        if self.options["landing_flag"]:
-            outputs["data:aerodynamics:aircraft:landing:lg_effect:DCL"] = (
-                np.ones(ALPHA_POINT_COUNT) * 0.02
-            )
-            outputs["data:aerodynamics:aircraft:landing:lg_effect:DCD"] = (
-                np.ones(ALPHA_POINT_COUNT) * 0.02
-            )
-        else:
-            outputs["data:aerodynamics:aircraft:takeoff:lg_effect:DCL"] = (
-                np.ones(ALPHA_POINT_COUNT) * 0.02
-            )
-            outputs["data:aerodynamics:aircraft:takeoff:lg_effect:DCD"] = (
-                np.ones(ALPHA_POINT_COUNT) * 0.02
-            )
+        flight_phase = "landing" if self.options["landing_flag"] else "takeoff"
+        self.add_output(
+            "data:aerodynamics:aircraft:%s:lg_effect:DCL" % flight_phase,
+            val=LANDING_GEAR_DCL,
+            shape=ALPHA_POINT_COUNT,
+        )
+        self.add_output(
+            "data:aerodynamics:aircraft:%s:lg_effect:DCD" % flight_phase,
+            val=LANDING_GEAR_DCD,
+            shape=ALPHA_POINT_COUNT,
+        )
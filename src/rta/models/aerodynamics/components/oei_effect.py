@@ -19,8 +19,6 @@ import numpy as np
 from openmdao.core.explicitcomponent import ExplicitComponent
 from scipy import constants
 
-from rta.models.aerodynamics.constants import CT_POINT_COUNT
-
 
 class ComputeDeltaOEI(ExplicitComponent):
     """
@@ -28,6 +26,22 @@ class ComputeDeltaOEI(ExplicitComponent):
     Trim effects calculation is not referenced
     """
 
+    OEI_DCD_NAMES = [
+        "data:aerodynamics:aircraft:landing:OEI_effect:DCD",
+        "data:aerodynamics:aircraft:takeoff:OEI_effect:DCD",
+        "data:aerodynamics:aircraft:low_speed:OEI_effect:DCD",
+    ]
+    SCALAR_INPUT_NAMES = [
+        "data:geometry:propulsion:nacelle:y",
+        "data:geometry:propulsion:propeller:B",
+        "data:geometry:propulsion:propeller:diameter",
+        "data:geometry:vertical_tail:aspect_ratio",
+        "data:geometry:wing:area",
+        "data:geometry:vertical_tail:area",
+        "data:geometry:vertical_tail:MAC:at25percent:x:from_wingMAC25",
+        "data:aerodynamics:aircraft:low_speed:DCD_ext",
+    ]
+
     def initialize(self):
         self.options.declare("landing_flag", default=False, types=bool)
 
@@ -44,7 +58,7 @@ class ComputeDeltaOEI(ExplicitComponent):
             units="m",
         )
 
-        self.add_input("data:aerodynamics:aircraft:low_speed:CT", shape=CT_POINT_COUNT)
+        self.add_input("data:aerodynamics:aircraft:low_speed:CT", shape_by_conn=True, val=np.nan)
         self.add_input("data:aerodynamics:aircraft:low_speed:DCD_ext", val=0.0)
 
         self.add_output("data:aerodynamics:aircraft:low_speed:DCD_feather", val=0.004)
@@ -60,39 +74,135 @@ class ComputeDeltaOEI(ExplicitComponent):
             "data:aerodynamics:aircraft:low_speed:OEI_effect:DCD",
             copy_shape="data:aerodynamics:aircraft:low_speed:CT",
         )
-        self.declare_partials("*", "*", method="fd")
+
+    def setup_partials(self):
+        ct_name = "data:aerodynamics:aircraft:low_speed:CT"
+        ct_indices = np.arange(
+            self.get_io_metadata(iotypes="input", metadata_keys=["size"], includes=[ct_name])[
+                ct_name
+            ]["size"]
+        )
+        for output_name in self.OEI_DCD_NAMES:
+            self.declare_partials(
+                output_name,
+                "data:aerodynamics:aircraft:low_speed:CT",
+                rows=ct_indices,
+                cols=ct_indices,
+            )
+            self.declare_partials(output_name, self.SCALAR_INPUT_NAMES)
+        self.declare_partials(
+            "data:aerodynamics:aircraft:low_speed:DCD_feather",
+            [
+                "data:geometry:propulsion:propeller:B",
+                "data:geometry:propulsion:propeller:diameter",
+                "data:geometry:wing:area",
+            ],
+        )
 
     def compute(self, inputs, outputs):
+        dCd_feather = self._compute_dCd_feather(*self._get_feather_inputs(inputs))
+        trim_factor = self._compute_trim_factor(*self._get_trim_inputs(inputs))
+        CT = inputs["data:aerodynamics:aircraft:low_speed:CT"]
+
+        dCd_OEI = (
+            trim_factor * (CT + dCd_feather) ** 2
+            + dCd_feather
+            + inputs["data:aerodynamics:aircraft:low_speed:DCD_ext"]
+        )
+
+        outputs["data:aerodynamics:aircraft:low_speed:DCD_feather"] = dCd_feather
+        for output_name in self.OEI_DCD_NAMES:
+            outputs[output_name] = dCd_OEI
+
+    def compute_partials(self, inputs, partials):
         n_blades = inputs["data:geometry:propulsion:propeller:B"]
         d_prop = inputs["data:geometry:propulsion:propeller:diameter"]
-        dCd_ext = inputs["data:aerodynamics:aircraft:low_speed:DCD_ext"]
-        CT_list = inputs["data:aerodynamics:aircraft:low_speed:CT"]
         y_nacelle = inputs["data:geometry:propulsion:nacelle:y"]
         lambda_vt = inputs["data:geometry:vertical_tail:aspect_ratio"]
         wing_area = inputs["data:geometry:wing:area"]
         vt_area = inputs["data:geometry:vertical_tail:area"]
         lp_vt = inputs["data:geometry:vertical_tail:MAC:at25percent:x:from_wingMAC25"]
-        dCd_feather = (
-            1.0
-            / (wing_area / constants.foot**2)
-            * (0.1 * n_blades / (8 * np.pi) * (np.pi * (d_prop / 2.0 / constants.foot) ** 2))
+        CT = inputs["data:aerodynamics:aircraft:low_speed:CT"]
+
+        dCd_feather = self._compute_dCd_feather(n_blades, d_prop, wing_area)
+        trim_factor = self._compute_trim_factor(y_nacelle, lambda_vt, wing_area, vt_area, lp_vt)
+        dCd_trim = trim_factor * (CT + dCd_feather) ** 2
+        d_dCd_OEI_d_feather = 2.0 * trim_factor * (CT + dCd_feather) + 1.0
+
+        # dCd_feather is proportional to n_blades * d_prop**2 / wing_area, and trim factor to
+        # y_nacelle**2. Their partials are computed without dividing by n_blades, d_prop or
+        # y_nacelle, so they remain finite when these inputs are zero.
+        d_feather_d_blades = self._compute_dCd_feather(1.0, d_prop, wing_area)
+        d_feather_d_diameter = 2.0 * d_prop * self._compute_dCd_feather(n_blades, 1.0, wing_area)
+        d_feather_d_wing_area = -dCd_feather / wing_area
+        d_trim_factor_d_y_nacelle = (
+            2.0 * y_nacelle * self._compute_trim_factor(1.0, lambda_vt, wing_area, vt_area, lp_vt)
         )
 
-        DCD_trim_list = []
-        for CT in CT_list:
-            dCd_trim = (
-                1.75
-                / (np.pi * lambda_vt)
-                * y_nacelle**2
-                * wing_area
-                / (lp_vt**2 * vt_area)
-                * (CT + dCd_feather) ** 2
+        partials[
+            "data:aerodynamics:aircraft:low_speed:DCD_feather",
+            "data:geometry:propulsion:propeller:B",
+        ] = d_feather_d_blades
+        partials[
+            "data:aerodynamics:aircraft:low_speed:DCD_feather",
+            "data:geometry:propulsion:propeller:diameter",
+        ] = d_feather_d_diameter
+        partials["data:aerodynamics:aircraft:low_speed:DCD_feather", "data:geometry:wing:area"] = (
+            d_feather_d_wing_area
+        )
+
+        for output_name in self.OEI_DCD_NAMES:
+            partials[output_name, "data:aerodynamics:aircraft:low_speed:CT"] = (
+                2.0 * trim_factor * (CT + dCd_feather)
+            )
+            partials[output_name, "data:geometry:propulsion:propeller:B"] = (
+                d_dCd_OEI_d_feather * d_feather_d_blades
+            )
+            partials[output_name, "data:geometry:propulsion:propeller:diameter"] = (
+                d_dCd_OEI_d_feather * d_feather_d_diameter
             )
-            DCD_trim_list.append(dCd_trim)
+            partials[output_name, "data:geometry:wing:area"] = (
+                dCd_trim / wing_area + d_dCd_OEI_d_feather * d_feather_d_wing_area
+            )
+            partials[output_name, "data:geometry:propulsion:nacelle:y"] = (
+                d_trim_factor_d_y_nacelle * (CT + dCd_feather) ** 2
+            )
+            partials[output_name, "data:geometry:vertical_tail:aspect_ratio"] = (
+                -dCd_trim / lambda_vt
+            )
+            partials[output_name, "data:geometry:vertical_tail:area"] = -dCd_trim / vt_area
+            partials[
+                output_name, "data:geometry:vertical_tail:MAC:at25percent:x:from_wingMAC25"
+            ] = -2.0 * dCd_trim / lp_vt
+            partials[output_name, "data:aerodynamics:aircraft:low_speed:DCD_ext"] = 1.0
+
+    @staticmethod
+    def _get_feather_inputs(inputs):
+        return (
+            inputs["data:geometry:propulsion:propeller:B"],
+            inputs["data:geometry:propulsion:propeller:diameter"],
+            inputs["data:geometry:wing:area"],
+        )
 
-        dCd_OEI = np.array(DCD_trim_list) + dCd_feather + dCd_ext
+    @staticmethod
+    def _get_trim_inputs(inputs):
+        return (
+            inputs["data:geometry:propulsion:nacelle:y"],
+            inputs["data:geometry:vertical_tail:aspect_ratio"],
+            inputs["data:geometry:wing:area"],
+            inputs["data:geometry:vertical_tail:area"],
+            inputs["data:geometry:vertical_tail:MAC:at25percent:x:from_wingMAC25"],
+        )
 
-        outputs["data:aerodynamics:aircraft:low_speed:DCD_feather"] = dCd_feather
-        outputs["data:aerodynamics:aircraft:landing:OEI_effect:DCD"] = dCd_OEI
-        outputs["data:aerodynamics:aircraft:takeoff:OEI_effect:DCD"] = dCd_OEI
-        outputs["data:aerodynamics:aircraft:low_speed:OEI_effect:DCD"] = dCd_OEI
+    @staticmethod
+    def _compute_dCd_feather(n_blades, d_prop, wing_area):
+        return (
+            1.0
+            / (wing_area / constants.foot**2)
+            * (0.1 * n_blades / (8 * np.pi) * (np.pi * (d_prop / 2.0 / constants.foot) ** 2))
+        )
+
+    @staticmethod
+    def _compute_trim_factor(y_nacelle, lambda_vt, wing_area, vt_area, lp_vt):
+        """Factor of (CT + dCd_feather)**2 in trim drag."""
+        return 1.75 / (np.pi * lambda_vt) * y_nacelle**2 * wing_area / (lp_vt**2 * vt_area)
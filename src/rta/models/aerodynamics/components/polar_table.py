@@ -0,0 +1,288 @@
+"""
+Computation of cruise polar for several Mach numbers
+"""
+#  This file is part of FAST : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2020  ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import numpy as np
+from fastoad.module_management.constants import ModelDomain
+from fastoad.module_management.service_registry import RegisterOpenMDAOSystem
+from fastoad_cs25.models.aerodynamics.components.utils.cd0_lifting_surface import (
+    LiftingSurfaceGeometry,
+    compute_cd0_lifting_surface,
+)
+from openmdao.core.explicitcomponent import ExplicitComponent
+from scipy import constants
+from scipy.interpolate import RegularGridInterpolator
+from stdatm import AtmosphereSI
+
+from rta.models.aerodynamics.constants import LIFTING_SURFACE_INTERACTION_COEFFS
+from .cd0_fuselage import compute_cd0_fuselage
+from .cd0_nacelle_pylons_tp import compute_cd0_nacelles
+from .cd0_total import compute_k_parasite
+
+# Factor of CL in trim drag, as in legacy model
+TRIM_DRAG_FACTOR = 5.89e-4
+
+# Number of altitude points used for inverting the climb schedule
+SCHEDULE_POINT_COUNT = 101
+
+
+def compute_cd_compressibility(
+    mach, cl, sweep_25, thickness_ratio, max_cd_comp=0.5, delta_m_charac_0=0.0
+):
+    """
+    Computes drag increment due to compressibility, with the formula of the legacy
+    compressibility model of FAST-OAD CS-25.
+
+    :param mach: Mach number
+    :param cl: lift coefficient
+    :param sweep_25: sweep angle of wing at 25% chord, in degrees
+    :param thickness_ratio: average thickness ratio of wing
+    :param max_cd_comp: upper bound of drag increment
+    :param delta_m_charac_0: increment of characteristic Mach number
+    :return: drag increment
+    """
+    # Characteristic Mach for 28° sweep and 0.12 of relative thickness
+    m_charac_comp_0 = (
+        -0.5 * np.maximum(0.35, cl) ** 2 + 0.35 * np.maximum(0.35, cl) + 0.765 + delta_m_charac_0
+    )
+
+    # Characteristic Mach for actual sweep angle and relative thickness
+    m_charac_comp = (m_charac_comp_0 * np.cos(np.radians(28)) + 0.12 - thickness_ratio) / np.cos(
+        np.radians(sweep_25)
+    )
+
+    return np.minimum(max_cd_comp, 0.002 * np.exp(42.58 * (mach - m_charac_comp)))
+
+
+def compute_climb_schedule_altitude(mach, cruise_mach, cruise_altitude, climb_EAS):
+    """
+    Altitudes where Mach numbers are flown during a climb at constant equivalent airspeed up to
+    cruise Mach number, then at cruise Mach number up to cruise altitude.
+
+    Mach numbers below the one of climb_EAS at sea level are put at sea level. Mach numbers not
+    lower than cruise Mach number, or not reached before cruise altitude, are put at cruise
+    altitude.
+
+    :param mach: Mach numbers
+    :param cruise_mach: cruise Mach number
+    :param cruise_altitude: cruise altitude, in m
+    :param climb_EAS: equivalent airspeed of climb, in m/s
+    :return: altitudes in m
+    """
+    schedule_atmosphere = AtmosphereSI(np.linspace(0.0, cruise_altitude, SCHEDULE_POINT_COUNT))
+    schedule_atmosphere.equivalent_airspeed = climb_EAS
+    altitude = np.interp(mach, schedule_atmosphere.mach, schedule_atmosphere.altitude)
+
+    return np.where(np.asarray(mach) < cruise_mach, altitude, cruise_altitude)
+
+
+def get_polar_interpolant(mach_list, cl, cd_table):
+    """
+    Interpolant of a polar table.
+
+    Mach numbers and lift coefficients outside of the table are brought back to its bounds.
+
+    :param mach_list: Mach numbers of the table, increasing
+    :param cl: lift coefficients of the table, increasing
+    :param cd_table: drag coefficients, with shape (len(mach_list), len(cl))
+    :return: function that provides drag coefficients for Mach numbers and lift coefficients,
+             broadcast together
+    """
+    interpolator = RegularGridInterpolator((mach_list, cl), cd_table)
+
+    def get_cd(mach, cl_value):
+        mach, cl_value = np.broadcast_arrays(
+            np.clip(mach, mach_list[0], mach_list[-1]), np.clip(cl_value, cl[0], cl[-1])
+        )
+        return interpolator(np.stack([mach, cl_value], axis=-1)).reshape(mach.shape)
+
+    return get_cd
+
+
+@RegisterOpenMDAOSystem("rta.aerodynamics.cruise_polar_table", domain=ModelDomain.AERODYNAMICS)
+class ComputeCruisePolarTable(ExplicitComponent):
+    """
+    Cruise polar for Mach numbers of "mach_list" option and CL values of cruise polar.
+
+    Drag is built up as in the high speed polar, with the RTA models of CD0 of wing, fuselage
+    and nacelles, and legacy models of CD0 of tails, compressibility and trim drag. All
+    contributions are computed at once for all Mach numbers and CL values. Arguments of the
+    drag functions are broadcast together, with Mach numbers along the first axis and CL values
+    along the second one.
+
+    Unitary Reynolds number of each Mach number is computed at the matching altitude of
+    "altitude_list" option. If this option is not provided, altitudes follow the climb schedule
+    of :class:`~rta.models.loops.compute_engine_sizing_cases.ComputeEngineSizingCases`, i.e.
+    constant equivalent airspeed of "climb_EAS" option, then cruise Mach number up to cruise
+    altitude (see :func:`compute_climb_schedule_altitude`). The row of cruise Mach number is
+    then at cruise altitude, like the cruise polar.
+
+    The table can be used with :func:`get_polar_interpolant`, for evaluating drag at the Mach
+    number of each flight point instead of cruise Mach number.
+    """
+
+    def initialize(self):
+        self.options.declare("mach_list", default=(0.2, 0.3, 0.4, 0.5, 0.6), types=tuple)
+        self.options.declare(
+            "altitude_list",
+            default=None,
+            types=tuple,
+            allow_none=True,
+            desc="in m, one value per Mach number",
+        )
+        self.options.declare(
+            "climb_EAS",
+            default=170.0 * constants.knot,
+            types=float,
+            desc="in m/s, used for altitudes if altitude_list is not provided",
+        )
+
+    def setup(self):
+        mach_list = np.array(self.options["mach_list"], dtype=float)
+        if self.options["altitude_list"] is not None and len(self.options["altitude_list"]) != len(
+            mach_list
+        ):
+            raise ValueError('Options "mach_list" and "altitude_list" must have the same length.')
+
+        self.add_input("data:aerodynamics:aircraft:cruise:CL", shape_by_conn=True, val=np.nan)
+        self.add_input("data:mission:sizing:main_route:cruise:altitude", val=np.nan, units="m")
+        self.add_input("data:TLAR:cruise_mach", val=np.nan)
+        self.add_input("data:geometry:wing:area", val=np.nan, units="m**2")
+        self.add_input("data:geometry:wing:thickness_ratio", val=np.nan)
+        self.add_input("data:geometry:wing:wetted_area", val=np.nan, units="m**2")
+        self.add_input("data:geometry:wing:MAC:length", val=np.nan, units="m")
+        self.add_input("data:geometry:wing:sweep_25", val=np.nan, units="deg")
+        self.add_input("data:geometry:fuselage:length", val=np.nan, units="m")
+        self.add_input("data:geometry:fuselage:maximum_width", val=np.nan, units="m")
+        self.add_input("data:geometry:fuselage:maximum_height", val=np.nan, units="m")
+        self.add_input("data:geometry:fuselage:wetted_area", val=np.nan, units="m**2")
+        for tail in ["horizontal_tail", "vertical_tail"]:
+            self.add_input("data:geometry:%s:thickness_ratio" % tail, val=np.nan)
+            self.add_input("data:geometry:%s:MAC:length" % tail, val=np.nan, units="m")
+            self.add_input("data:geometry:%s:sweep_25" % tail, val=np.nan, units="deg")
+            self.add_input("data:geometry:%s:wetted_area" % tail, val=np.nan, units="m**2")
+        self.add_input("data:geometry:propulsion:nacelle:length", val=np.nan, units="m")
+        self.add_input("data:geometry:propulsion:nacelle:wetted_area", val=np.nan, units="m**2")
+        self.add_input("data:geometry:propulsion:engine:count", val=np.nan)
+        self.add_input("data:geometry:aircraft:wetted_area", val=np.nan, units="m**2")
+        self.add_input("data:aerodynamics:aircraft:cruise:induced_drag_coefficient", val=np.nan)
+        self.add_input("tuning:aerodynamics:aircraft:cruise:CD:parasite:k", val=np.nan)
+        self.add_input("tuning:aerodynamics:aircraft:cruise:CD:compressibility:max_value", val=0.5)
+        self.add_input(
+            "tuning:aerodynamics:aircraft:cruise:CD:compressibility:characteristic_mach_increment",
+            val=0.0,
+        )
+        self.add_input("tuning:aerodynamics:aircraft:cruise:CD:k", val=np.nan)
+        self.add_input("tuning:aerodynamics:aircraft:cruise:CD:offset", val=np.nan)
+        self.add_input("tuning:aerodynamics:aircraft:cruise:CD:winglet_effect:k", val=np.nan)
+        self.add_input("tuning:aerodynamics:aircraft:cruise:CD:winglet_effect:offset", val=np.nan)
+
+        self.add_output("data:aerodynamics:aircraft:cruise:polar_table:mach", val=mach_list)
+        self.add_output(
+            "data:aerodynamics:aircraft:cruise:polar_table:CD",
+            compute_shape=lambda shapes: (
+                len(mach_list),
+                shapes["data:aerodynamics:aircraft:cruise:CL"][0],
+            ),
+        )
+
+    def setup_partials(self):
+        self.declare_partials("data:aerodynamics:aircraft:cruise:polar_table:CD", "*", method="fd")
+
+    def compute(self, inputs, outputs, discrete_inputs=None, discrete_outputs=None):
+        mach = np.array(self.options["mach_list"], dtype=float)[:, np.newaxis]
+        cl = inputs["data:aerodynamics:aircraft:cruise:CL"][np.newaxis, :]
+        if self.options["altitude_list"] is None:
+            altitude = compute_climb_schedule_altitude(
+                mach,
+                inputs["data:TLAR:cruise_mach"][0],
+                inputs["data:mission:sizing:main_route:cruise:altitude"][0],
+                self.options["climb_EAS"],
+            )
+        else:
+            altitude = np.array(self.options["altitude_list"], dtype=float)[:, np.newaxis]
+        atmosphere = AtmosphereSI(altitude)
+        atmosphere.mach = mach
+        reynolds = atmosphere.unitary_reynolds
+        wing_area = inputs["data:geometry:wing:area"]
+
+        wing_geometry = LiftingSurfaceGeometry(
+            thickness_ratio=inputs["data:geometry:wing:thickness_ratio"],
+            MAC_length=inputs["data:geometry:wing:MAC:length"],
+            sweep_angle_25=inputs["data:geometry:wing:sweep_25"],
+            wet_area=inputs["data:geometry:wing:wetted_area"],
+            cambered=False,
+            interaction_coeff=LIFTING_SURFACE_INTERACTION_COEFFS["wing"],
+        )
+        cd0_wing = compute_cd0_lifting_surface(wing_geometry, mach, reynolds, wing_area, cl)
+        cd0_fus = compute_cd0_fuselage(
+            inputs["data:geometry:fuselage:maximum_height"],
+            inputs["data:geometry:fuselage:maximum_width"],
+            inputs["data:geometry:fuselage:wetted_area"],
+            inputs["data:geometry:fuselage:length"],
+            wing_area,
+            mach,
+            reynolds,
+            cl,
+        )
+        cd0_tails = 0.0
+        for tail in ["horizontal_tail", "vertical_tail"]:
+            tail_geometry = LiftingSurfaceGeometry(
+                thickness_ratio=inputs["data:geometry:%s:thickness_ratio" % tail],
+                MAC_length=inputs["data:geometry:%s:MAC:length" % tail],
+                sweep_angle_25=inputs["data:geometry:%s:sweep_25" % tail],
+                wet_area=inputs["data:geometry:%s:wetted_area" % tail],
+                cambered=False,
+                interaction_coeff=LIFTING_SURFACE_INTERACTION_COEFFS[tail],
+            )
+            cd0_tails = cd0_tails + compute_cd0_lifting_surface(
+                tail_geometry, mach, reynolds, wing_area
+            )
+        cd0_nac = compute_cd0_nacelles(
+            inputs["data:geometry:propulsion:nacelle:length"],
+            inputs["data:geometry:propulsion:nacelle:wetted_area"],
+            inputs["data:geometry:propulsion:engine:count"],
+            wing_area,
+            mach,
+            reynolds,
+        )
+        cd0 = (cd0_wing + cd0_fus + cd0_tails + cd0_nac) * (
+            1.0
+            + compute_k_parasite(inputs["data:geometry:aircraft:wetted_area"])
+            * inputs["tuning:aerodynamics:aircraft:cruise:CD:parasite:k"]
+        )
+
+        cd_comp = compute_cd_compressibility(
+            mach,
+            cl,
+            inputs["data:geometry:wing:sweep_25"],
+            inputs["data:geometry:wing:thickness_ratio"],
+            inputs["tuning:aerodynamics:aircraft:cruise:CD:compressibility:max_value"],
+            inputs[
+                "tuning:aerodynamics:aircraft:cruise:CD:compressibility:characteristic_mach_increment"
+            ],
+        )
+        cd_trim = TRIM_DRAG_FACTOR * cl
+        cd_induced = inputs["data:aerodynamics:aircraft:cruise:induced_drag_coefficient"] * cl**2
+
+        outputs["data:aerodynamics:aircraft:cruise:polar_table:CD"] = (
+            cd0
+            + cd_comp
+            + cd_trim
+            + cd_induced * inputs["tuning:aerodynamics:aircraft:cruise:CD:winglet_effect:k"]
+            + inputs["tuning:aerodynamics:aircraft:cruise:CD:winglet_effect:offset"]
+        ) * inputs["tuning:aerodynamics:aircraft:cruise:CD:k"] + inputs[
+            "tuning:aerodynamics:aircraft:cruise:CD:offset"
+        ]
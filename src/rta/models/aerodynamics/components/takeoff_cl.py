@@ -0,0 +1,62 @@
+"""
+Computation of lift coefficients at takeoff
+"""
+
+#  This file is part of FAST : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2020  ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import numpy as np
+import openmdao.api as om
+
+from rta.models.aerodynamics.constants import TAKEOFF_CL_MAX_RATIO
+
+
+class ComputeTakeoffCL(om.ExplicitComponent):
+    """
+    Lift coefficients used for takeoff field length.
+
+    Lift coefficient during ground roll is the clean lift coefficient at zero angle of attack,
+    as used by the low speed polar, increased by high-lift devices at takeoff. Max lift coefficient at takeoff is a fixed ratio
+    of max lift coefficient at landing.
+    """
+
+    def setup(self):
+        self.add_input("data:aerodynamics:aircraft:low_speed:CL0", val=np.nan)
+        self.add_input("data:aerodynamics:high_lift_devices:takeoff:CL", val=np.nan)
+        self.add_input("data:aerodynamics:aircraft:landing:CL_max", val=np.nan)
+
+        self.add_output("data:aerodynamics:aircraft:takeoff:CL0")
+        self.add_output("data:aerodynamics:aircraft:takeoff:CL_max")
+
+        self.declare_partials(
+            "data:aerodynamics:aircraft:takeoff:CL0",
+            [
+                "data:aerodynamics:aircraft:low_speed:CL0",
+                "data:aerodynamics:high_lift_devices:takeoff:CL",
+            ],
+            val=1.0,
+        )
+        self.declare_partials(
+            "data:aerodynamics:aircraft:takeoff:CL_max",
+            "data:aerodynamics:aircraft:landing:CL_max",
+            val=TAKEOFF_CL_MAX_RATIO,
+        )
+
+    def compute(self, inputs, outputs, discrete_inputs=None, discrete_outputs=None):
+        outputs["data:aerodynamics:aircraft:takeoff:CL0"] = (
+            inputs["data:aerodynamics:aircraft:low_speed:CL0"]
+            + inputs["data:aerodynamics:high_lift_devices:takeoff:CL"]
+        )
+        outputs["data:aerodynamics:aircraft:takeoff:CL_max"] = (
+            TAKEOFF_CL_MAX_RATIO * inputs["data:aerodynamics:aircraft:landing:CL_max"]
+        )
@@ -21,8 +21,10 @@ import numpy as np
 from fastoad.testing import run_system
 from fastoad.io import VariableIO
 from openmdao.core.group import Group
+from openmdao.core.problem import Problem
 from pytest import approx
 from scipy.interpolate import interp1d
+from stdatm import AtmosphereSI
 from numpy.testing import assert_allclose
 
 from ..cd0_fuselage import Cd0Fuselage
@@ -32,6 +34,15 @@ from ..cd0_nacelle_pylons_tp import Cd0NacelleAndPylonsTP
 from ..oei_effect import ComputeDeltaOEI
 from ..initialize_in import InitializeIN
 from ..lg_effect import ComputeDeltaLg
+from ..takeoff_cl import ComputeTakeoffCL
+from ..initialize_cl import InitializeClPolar as InitializeClPolarRTA
+from ..initialize_cl import InitializeClPolarAdaptive
+from ..polar_table import (
+    ComputeCruisePolarTable,
+    compute_climb_schedule_altitude,
+    get_polar_interpolant,
+)
+from ..cd0_fused import CD0Fused
 from rta.models.aerodynamics.constants import ALPHA_POINT_COUNT, POLAR_POINT_COUNT
 
 from fastoad_cs25.models.aerodynamics.components.oswald import (
@@ -44,7 +55,12 @@ from fastoad_cs25.models.aerodynamics.components.high_lift_aero import (
     ComputeDeltaHighLift,
 )
 from fastoad_cs25.models.aerodynamics.components.initialize_cl import InitializeClPolar
+from openmdao.core.indepvarcomp import IndepVarComp
 from fastoad_cs25.models.aerodynamics.components.cd_trim import CdTrim
+from fastoad_cs25.models.aerodynamics.components.cd_compressibility import CdCompressibility
+from fastoad_cs25.models.aerodynamics.components.cd0_ht import Cd0HorizontalTail
+from fastoad_cs25.models.aerodynamics.components.cd0_vt import Cd0VerticalTail
+from fastoad.openmdao.variables import VariableList
 from fastoad_cs25.models.aerodynamics.constants import PolarType
 
 
@@ -391,6 +407,19 @@ def test_cd_OEI():
 
     assert_allclose(np.interp(ct_test, ct, cd_landing), [0.6445, 0.1637, 0.1679, 0.6527], rtol=1e-3)
 
+    data = problem.check_partials(out_stream=None, form="central")
+    for partials in data["component"].values():
+        assert_allclose(partials["J_fwd"], partials["J_fd"], rtol=1e-5, atol=1e-10)
+
+    # Partials remain finite for a centerline propeller without blades
+    problem["data:geometry:propulsion:nacelle:y"] = 0.0
+    problem["data:geometry:propulsion:propeller:B"] = 0.0
+    problem.run_model()
+    data = problem.check_partials(out_stream=None, form="central")
+    for partials in data["component"].values():
+        assert np.all(np.isfinite(partials["J_fwd"]))
+        assert_allclose(partials["J_fwd"], partials["J_fd"], rtol=1e-5, atol=1e-10)
+
 
 def test_cd0_wing():
     input_list = [
@@ -458,6 +487,17 @@ def test_cd_landing_gear():
     )
 
 
+def test_takeoff_cl():
+    ivc = get_indep_var_comp(["data:aerodynamics:aircraft:landing:CL_max"])
+    ivc.add_output("data:aerodynamics:aircraft:low_speed:CL0", val=0.2)
+    ivc.add_output("data:aerodynamics:high_lift_devices:takeoff:CL", val=0.7305462509831384)
+
+    problem = run_system(ComputeTakeoffCL(), ivc)
+
+    assert problem["data:aerodynamics:aircraft:takeoff:CL0"] == approx(0.93055, abs=1e-5)
+    assert problem["data:aerodynamics:aircraft:takeoff:CL_max"] == approx(2.24, abs=1e-5)
+
+
 def test_initialize_in():
     ivc = get_indep_var_comp(["data:geometry:wing:area"])
 
@@ -480,3 +520,194 @@ def test_initialize_in():
     assert H_list[0] == approx(0, abs=1e-5)
     assert H_list[5] == approx(7.5, abs=1e-5)
     assert H_list[15] == approx(22.5, abs=1e-5)
+
+    # Grids are set at setup, without computation nor partials
+    group = Group()
+    group.add_subsystem("grids", InitializeIN(), promotes=["*"])
+    problem = Problem(group)
+    problem.setup()
+    problem.final_setup()
+    assert_allclose(problem["data:aerodynamics:aircraft:low_speed:CT"], CT_list)
+    assert_allclose(problem["data:aerodynamics:aircraft:low_speed:alpha"], alpha_list)
+    assert_allclose(problem["data:aerodynamics:aircraft:low_speed:H"], H_list)
+    assert not problem.check_partials(out_stream=None).get("grids")
+
+
+def test_initialize_in_resolution():
+    ivc = get_indep_var_comp(
+        [
+            "data:geometry:propulsion:nacelle:y",
+            "data:geometry:propulsion:propeller:B",
+            "data:geometry:propulsion:propeller:diameter",
+            "data:geometry:vertical_tail:aspect_ratio",
+            "data:geometry:wing:area",
+            "data:geometry:vertical_tail:area",
+            "data:geometry:vertical_tail:MAC:at25percent:x:from_wingMAC25",
+            "data:aerodynamics:aircraft:low_speed:DCD_ext",
+        ]
+    )
+    group = Group()
+    group.add_subsystem("initialize_in", InitializeIN(CT_point_count=38), promotes=["*"])
+    group.add_subsystem("delta_OEI", ComputeDeltaOEI(), promotes=["*"])
+    problem = run_system(group, ivc)
+
+    CT_list = problem["data:aerodynamics:aircraft:low_speed:CT"]
+    assert len(CT_list) == 38
+    assert CT_list[[0, -1]] == approx([-2.0, 2.0])
+    assert problem["data:aerodynamics:aircraft:landing:OEI_effect:DCD"].shape == (38,)
+
+    data = problem.check_partials(out_stream=None, form="central")
+    for partials in data["component.delta_OEI"].values():
+        assert_allclose(partials["J_fwd"], partials["J_fd"], rtol=1e-5, atol=1e-10)
+
+
+def test_initialize_cl():
+    ivc = IndepVarComp()
+    ivc.add_output("tuning:aerodynamics:aircraft:cruise:CL:k", 1.05)
+    ivc.add_output("tuning:aerodynamics:aircraft:cruise:CL:offset", 0.01)
+    ivc.add_output("tuning:aerodynamics:aircraft:cruise:CL:winglet_effect:k", 0.98)
+    ivc.add_output("tuning:aerodynamics:aircraft:cruise:CL:winglet_effect:offset", -0.02)
+
+    # Default grid is the legacy one
+    legacy_cl = run_system(InitializeClPolar(), ivc)["data:aerodynamics:aircraft:cruise:CL"]
+    problem = run_system(InitializeClPolarRTA(), ivc)
+    assert_allclose(problem["data:aerodynamics:aircraft:cruise:CL"], legacy_cl, rtol=1e-14)
+
+    data = problem.check_partials(out_stream=None)
+    for partials in data["component"].values():
+        assert_allclose(partials["J_fwd"], partials["J_fd"], rtol=1e-5, atol=1e-10)
+
+    problem = run_system(InitializeClPolarRTA(low_speed_aero=True, polar_point_count=50), ivc)
+    cl = problem["data:aerodynamics:aircraft:low_speed:CL"]
+    assert len(cl) == 50
+    assert_allclose(np.diff(cl), 0.03 * 1.05 * 0.98, rtol=1e-12)
+
+    # Adaptive grid has half the points, 4 times denser between CL=0.3 and CL=0.9
+    problem = run_system(InitializeClPolarAdaptive(), ivc)
+    cl = (problem["data:aerodynamics:aircraft:cruise:CL"] + 0.01) / (1.05 * 0.98)
+    assert len(cl) == POLAR_POINT_COUNT // 2
+    assert cl[0] == approx(0.0, abs=1e-12)
+    assert cl[-1] < 1.5
+    assert np.all(np.diff(cl) > 0.0)
+    step = np.diff(cl)
+    dense_steps = step[(cl[:-1] >= 0.3) & (cl[1:] <= 0.9)]
+    sparse_steps = step[(cl[1:] <= 0.3) | (cl[:-1] >= 0.9)]
+    assert_allclose(dense_steps, 3.3 / 75.0 / 4.0, rtol=1e-10)
+    assert_allclose(sparse_steps, 3.3 / 75.0, rtol=1e-10)
+
+
+def test_cruise_polar_table():
+    group = Group()
+    group.add_subsystem("reynolds", ComputeReynolds(), promotes=["*"])
+    group.add_subsystem("initialize_cl", InitializeClPolarRTA(), promotes=["*"])
+    group.add_subsystem("cd0_wing", Cd0Wing(), promotes=["*"])
+    group.add_subsystem("cd0_fuselage", Cd0Fuselage(), promotes=["*"])
+    group.add_subsystem("cd0_ht", Cd0HorizontalTail(), promotes=["*"])
+    group.add_subsystem("cd0_vt", Cd0VerticalTail(), promotes=["*"])
+    group.add_subsystem("cd0_nac_pylons", Cd0NacelleAndPylonsTP(), promotes=["*"])
+    group.add_subsystem("cd0_total", Cd0Total(), promotes=["*"])
+    group.add_subsystem("cd_comp", CdCompressibility(), promotes=["*"])
+    group.add_subsystem("cd_trim", CdTrim(), promotes=["*"])
+    group.add_subsystem("polar", ComputePolar(), promotes=["*"])
+    group.add_subsystem(
+        "polar_table", ComputeCruisePolarTable(mach_list=(0.3, 0.45, 0.6)), promotes=["*"]
+    )
+    problem = Problem(group)
+    problem.setup()
+    ivc = get_indep_var_comp(VariableList.from_problem(problem, io_status="inputs").names())
+    problem = run_system(group, ivc)
+
+    # Table at cruise Mach number is the cruise polar
+    cl = problem["data:aerodynamics:aircraft:cruise:CL"]
+    cd = problem["data:aerodynamics:aircraft:cruise:CD"]
+    cd_table = problem["data:aerodynamics:aircraft:cruise:polar_table:CD"]
+    assert cd_table.shape == (3, POLAR_POINT_COUNT)
+    assert_allclose(cd_table[1], cd, rtol=1e-10)
+
+    # Friction drag decreases with Mach number and Reynolds number at low CL
+    assert np.all(np.diff(cd_table[:, cl <= 0.5], axis=0) < 0.0)
+
+    get_cd = get_polar_interpolant(
+        problem["data:aerodynamics:aircraft:cruise:polar_table:mach"], cl, cd_table
+    )
+    assert_allclose(get_cd(0.45, cl), cd, rtol=1e-10)
+    assert get_cd([0.3, 0.375], 0.5) == approx(
+        [cd_table[0, cl == 0.5][0], np.mean(cd_table[:2, cl == 0.5])], rel=1e-10
+    )
+    assert get_cd(0.1, 0.5) == approx(cd_table[0, cl == 0.5][0], rel=1e-10)
+
+    # Default altitudes follow the climb schedule at constant EAS, then at cruise Mach number
+    altitude = compute_climb_schedule_altitude([0.1, 0.3, 0.45, 0.6], 0.45, 6000.0, 87.5)
+    assert altitude[[0, 2, 3]] == approx([0.0, 6000.0, 6000.0])
+    atmosphere = AtmosphereSI(altitude[1])
+    atmosphere.mach = 0.3
+    assert atmosphere.equivalent_airspeed == approx(87.5, rel=1e-3)
+
+
+def test_cd0_fused():
+    input_list = [
+        "data:geometry:wing:area",
+        "data:geometry:fuselage:length",
+        "data:geometry:fuselage:maximum_width",
+        "data:geometry:fuselage:maximum_height",
+        "data:geometry:fuselage:wetted_area",
+        "data:geometry:propulsion:nacelle:length",
+        "data:geometry:propulsion:nacelle:wetted_area",
+        "data:geometry:propulsion:pylon:wetted_area",
+        "data:geometry:propulsion:engine:count",
+        "data:geometry:aircraft:wetted_area",
+        "settings:aerodynamics:wing:CD:fuselage_interaction",
+        "tuning:aerodynamics:aircraft:cruise:CD:parasite:k",
+    ]
+    for surface in ["wing", "horizontal_tail", "vertical_tail"]:
+        input_list += [
+            "data:geometry:%s:thickness_ratio" % surface,
+            "data:geometry:%s:MAC:length" % surface,
+            "data:geometry:%s:sweep_25" % surface,
+            "data:geometry:%s:wetted_area" % surface,
+        ]
+
+    for low_speed_aero, regime, mach_name in [
+        (True, "low_speed", "data:aerodynamics:aircraft:takeoff:mach"),
+        (False, "cruise", "data:TLAR:cruise_mach"),
+    ]:
+        ivc = get_indep_var_comp(
+            input_list
+            + [
+                "data:aerodynamics:wing:%s:reynolds" % regime,
+                "data:aerodynamics:aircraft:%s:CL" % regime,
+                mach_name,
+            ]
+        )
+        group = Group()
+        group.add_subsystem("cd0_wing", Cd0Wing(low_speed_aero=low_speed_aero), promotes=["*"])
+        group.add_subsystem(
+            "cd0_fuselage", Cd0Fuselage(low_speed_aero=low_speed_aero), promotes=["*"]
+        )
+        group.add_subsystem(
+            "cd0_ht", Cd0HorizontalTail(low_speed_aero=low_speed_aero), promotes=["*"]
+        )
+        group.add_subsystem(
+            "cd0_vt", Cd0VerticalTail(low_speed_aero=low_speed_aero), promotes=["*"]
+        )
+        group.add_subsystem(
+            "cd0_nac_pylons", Cd0NacelleAndPylonsTP(low_speed_aero=low_speed_aero), promotes=["*"]
+        )
+        group.add_subsystem("cd0_total", Cd0Total(low_speed_aero=low_speed_aero), promotes=["*"])
+        legacy_problem = run_system(group, ivc)
+        fused_problem = run_system(CD0Fused(low_speed_aero=low_speed_aero), ivc)
+
+        for part in [
+            "wing",
+            "fuselage",
+            "horizontal_tail",
+            "vertical_tail",
+            "nacelles",
+            "aircraft",
+        ]:
+            name = "data:aerodynamics:%s:%s:CD0" % (part, regime)
+            assert_allclose(fused_problem[name], legacy_problem[name], rtol=1e-10)
+
+        data = fused_problem.check_partials(out_stream=None, form="central")
+        for partials in data["component"].values():
+            assert_allclose(partials["J_fwd"], partials["J_fd"], rtol=1e-5, atol=1e-10)
@@ -11,7 +11,40 @@
 #  You should have received a copy of the GNU General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import numpy as np
+
 POLAR_POINT_COUNT = 150
 CT_POINT_COUNT = 150  # 5
 H_POINT_COUNT = 21
 ALPHA_POINT_COUNT = 21
+
+# Grids of low speed aerodynamics
+LOW_SPEED_CT_RANGE = (-2.0, 2.0)
+LOW_SPEED_ALPHA_LIST = np.linspace(-1.0, 12.0, ALPHA_POINT_COUNT)  # in deg
+LOW_SPEED_H_LIST = np.linspace(0.0, 30.0, H_POINT_COUNT)  # in m
+
+# Increments of lift and drag coefficients due to landing gear extension
+LANDING_GEAR_DCL = 0.02
+LANDING_GEAR_DCD = 0.02
+
+# Range of CL values of polars, before tuning, with upper bound excluded
+POLAR_CL_RANGE = (0.0, 1.5)
+
+# Max lift coefficient at takeoff relative to max lift coefficient at landing, for flaps in
+# takeoff position
+TAKEOFF_CL_MAX_RATIO = 0.8
+
+# Ratios of additional drag of lifting surfaces due to interaction effects
+LIFTING_SURFACE_INTERACTION_COEFFS = {
+    "wing": 0.04,
+    "horizontal_tail": 0.01,
+    "vertical_tail": 0.005,
+}
+
+# Ratio of additional fuselage friction due to Karman and belly fairing (0.1 and 0.2).
+# Reference: Conceptual Aircraft Design: An Industrial Approach.
+# Authors: Ajoy Kumar Kundu, Mark A. Price, David Riordan Pag 493
+FUSELAGE_FRICTION_INCREMENT = 0.1 + 0.2
+
+# Interference drag of each nacelle, subject to discussion
+NACELLE_INTERFERENCE_CD0 = 0.0005
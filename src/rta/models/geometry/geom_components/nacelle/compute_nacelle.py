@@ -19,11 +19,13 @@ import openmdao.api as om
 import scipy.constants as constants
 from fastoad.module_management.service_registry import RegisterSubmodel
 from fastoad_cs25.models.geometry.constants import SERVICE_NACELLE_PYLON_GEOMETRY
+from rta.models.memoization import memoize_compute
 
 RegisterSubmodel.active_models[SERVICE_NACELLE_PYLON_GEOMETRY] = "rta.submodel.geometry.nacelles"
 
 
 @RegisterSubmodel(SERVICE_NACELLE_PYLON_GEOMETRY, "rta.submodel.geometry.nacelles")
+@memoize_compute
 class ComputeNacelleGeometry(om.ExplicitComponent):
     # TODO: Document equations. Cite sources
     """Nacelle geometry estimation"""
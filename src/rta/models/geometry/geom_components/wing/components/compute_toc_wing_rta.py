@@ -17,8 +17,10 @@ Estimation of wing ToC
 
 import numpy as np
 from openmdao.core.explicitcomponent import ExplicitComponent
+from rta.models.memoization import memoize_compute
 
 
+@memoize_compute
 class ComputeToCWingRTA(ExplicitComponent):
     # TODO: Document equations. Cite sources
     """Wing ToC estimation
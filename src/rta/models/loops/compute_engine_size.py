@@ -14,21 +14,53 @@ Computation of turbopropeller output power
 #  You should have received a copy of the GNU General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import warnings
+
 import numpy as np
 import openmdao.api as om
-import warnings
 from fastoad.module_management.constants import ModelDomain
 from fastoad.module_management.service_registry import RegisterOpenMDAOSystem
 
 
+def _warn_if_sizing_cases_inactive(inputs):
+    """
+    Warns if data:propulsion:sizing:RTO_power is not positive, i.e. if it is not computed by
+    "rta.loop.engine_sizing_cases", in which case engine is sized by takeoff only.
+    """
+    if inputs["data:propulsion:sizing:RTO_power"][0] <= 0.0:
+        warnings.warn(
+            "Engine sizing cases OEI_ceiling, Time To Climb and cruise Mach number are "
+            "deactivated: data:propulsion:sizing:RTO_power is not positive. Add "
+            '"rta.loop.engine_sizing_cases" to the process to activate them.'
+        )
+
+
 @RegisterOpenMDAOSystem("rta.loop.engine_size", domain=ModelDomain.PROPULSION)
 class ComputeEngineSize(om.ExplicitComponent):
     """
     May be replaced by an implicit component coupled with a mission module computing only takeoff
+
+    RTO power is updated from its value of previous call. This state belongs to the instance
+    and restarts at the first call of each run of the problem, i.e. when run_model resets
+    iteration counts, from settings:propulsion:initial_RTO_power, or from option
+    "initial_RTO_power" if this input is 0. Results of a run therefore do not depend on previous
+    runs, and successive cases of a DOE can be warm-started through the input. Calls for
+    approximation of partials start from the same value as the call they differentiate and do
+    not update the state.
+
+    OEI ceiling, time to climb and cruise Mach number are accounted for through
+    data:propulsion:sizing:RTO_power, as computed by "rta.loop.engine_sizing_cases", which
+    is a lower bound of RTO power. A warning is issued at each run if it is not positive, e.g.
+    if "rta.loop.engine_sizing_cases" is not in the process.
     """
 
-    initial_RTO_power = 2051000
-    previous_RTO_power = 0
+    def initialize(self):
+        self.options.declare(
+            "initial_RTO_power",
+            default=2051000.0,
+            types=float,
+            desc="in W, used if settings:propulsion:initial_RTO_power is 0",
+        )
 
     def setup(self):
         self.add_input("data:mission:sizing:takeoff:distance", val=np.nan, units="m")
@@ -36,41 +68,215 @@ class ComputeEngineSize(om.ExplicitComponent):
         self.add_input("data:TLAR:TTC", val=np.nan, units="min")
         self.add_input("data:TLAR:OEI_ceiling", val=np.nan, units="m")
         self.add_input("data:TLAR:cruise_mach", val=np.nan)
+        self.add_input("settings:propulsion:initial_RTO_power", val=0.0, units="W")
+        # RTO power needed by other sizing cases, see ComputeEngineSizingCases
+        self.add_input("data:propulsion:sizing:RTO_power", val=0.0, units="W")
 
-        self.add_output("data:propulsion:RTO_power", val=self.initial_RTO_power, units="W")
+        initial_RTO_power = self.options["initial_RTO_power"]
+        self.add_output("data:propulsion:RTO_power", val=initial_RTO_power, units="W")
         self.add_output(
             "data:propulsion:Design_Thermo_Power",
-            val=self.initial_RTO_power * 1.22,
+            val=initial_RTO_power * 1.22,
             units="W",
         )
         self.add_output(
             "data:propulsion:propeller:max_power",
-            val=self.initial_RTO_power * 1.094,
+            val=initial_RTO_power * 1.094,
             units="W",
         )
 
         self.declare_partials("data:propulsion:RTO_power", "*", method="fd")
 
-        warnings.warn(
-            "Engine sizing cases OEI_ceiling, Time To Climb and cruise Mach number are deactivated."
-        )
+        # RTO power before and after the last call that was not an approximation
+        self.previous_RTO_power = None
+        self.RTO_power = None
 
     def compute(self, inputs, outputs, discrete_inputs=None, discrete_outputs=None):
         TOD = inputs["data:mission:sizing:takeoff:distance"]
         TOD_target = inputs["data:TLAR:TOD"]
 
-        if self.previous_RTO_power == 0:
-            previous_RTO_power = self.initial_RTO_power
-        else:
+        # Calls of current run that have updated the state, the one being differentiated
+        # excluded
+        update_count = self.iter_count_without_approx
+        if self.under_approx:
+            update_count -= 1
+
+        if update_count <= 0:
+            _warn_if_sizing_cases_inactive(inputs)
+            previous_RTO_power = float(inputs["settings:propulsion:initial_RTO_power"][0])
+            if previous_RTO_power <= 0.0:
+                previous_RTO_power = self.options["initial_RTO_power"]
+        elif self.under_approx:
             previous_RTO_power = self.previous_RTO_power
+        else:
+            previous_RTO_power = self.RTO_power
 
         delta_TOD = 1500 * (TOD - TOD_target)  # 1500
         if abs(max(TOD - TOD_target)) < 10:  # 10m, 10s, 0.0
             RTO_power = previous_RTO_power
         else:
             RTO_power = previous_RTO_power + delta_TOD
+        RTO_power = np.maximum(RTO_power, inputs["data:propulsion:sizing:RTO_power"])
+
+        if not self.under_approx:
+            self.previous_RTO_power = previous_RTO_power
+            self.RTO_power = RTO_power
+
+        outputs["data:propulsion:RTO_power"] = RTO_power
+        outputs["data:propulsion:Design_Thermo_Power"] = RTO_power * 1.22
+        outputs["data:propulsion:propeller:max_power"] = RTO_power * 1.094
+
+
+@RegisterOpenMDAOSystem("rta.loop.engine_size_implicit", domain=ModelDomain.PROPULSION)
+class ComputeEngineSizeImplicit(om.ImplicitComponent):
+    """
+    Engine sizing with takeoff distance as residual.
+
+    RTO power is the output whose residual is the difference between takeoff distance and its
+    target, so the component can be solved by a Newton solver at group level. When used in a
+    NonlinearBlockGS loop, RTO power is updated with secant steps on the takeoff distance, the
+    fixed gain of :class:`ComputeEngineSize` being used as initial slope of each run. If takeoff distance is
+    computed by "rta.performances.takeoff", its derivative with respect to RTO power,
+    data:mission:sizing:takeoff:RTO_power_sensitivity, is used as slope instead.
+
+    As in :class:`ComputeEngineSize`, data:propulsion:sizing:RTO_power is a lower bound of RTO
+    power. The residual is the maximum of the takeoff distance error and of the lacking power
+    converted to a distance with the initial gain, so that it is zero either when takeoff
+    distance is on target with enough power, or when power is at its lower bound with a takeoff
+    distance below target. Partials follow the active term.
+    """
+
+    def initialize(self):
+        self.options.declare("initial_RTO_power", default=2051000.0, types=float)
+        self.options.declare(
+            "initial_gain", default=1500.0, types=float, desc="in W/m, used for first step"
+        )
+        self.options.declare("TOD_tolerance", default=10.0, types=float, desc="in m")
+        self.options.declare(
+            "max_relative_step", default=0.5, types=float, desc="relative to RTO power"
+        )
+
+    def setup(self):
+        self.add_input("data:mission:sizing:takeoff:distance", val=np.nan, units="m")
+        self.add_input("data:TLAR:TOD", val=np.nan, units="m")
+        # Not used if not negative
+        self.add_input("data:mission:sizing:takeoff:RTO_power_sensitivity", val=0.0, units="m/W")
+        # RTO power needed by other sizing cases, see ComputeEngineSizingCases
+        self.add_input("data:propulsion:sizing:RTO_power", val=0.0, units="W")
+
+        initial_RTO_power = self.options["initial_RTO_power"]
+        # Residual of RTO power is a takeoff distance error in m
+        self.add_output("data:propulsion:RTO_power", val=initial_RTO_power, units="W", ref=1e6)
+        self.add_output(
+            "data:propulsion:Design_Thermo_Power",
+            val=initial_RTO_power * 1.22,
+            units="W",
+            ref=1e6,
+        )
+        self.add_output(
+            "data:propulsion:propeller:max_power",
+            val=initial_RTO_power * 1.094,
+            units="W",
+            ref=1e6,
+        )
+
+        self.declare_partials(
+            "data:propulsion:RTO_power",
+            [
+                "data:mission:sizing:takeoff:distance",
+                "data:TLAR:TOD",
+                "data:propulsion:sizing:RTO_power",
+                "data:propulsion:RTO_power",
+            ],
+        )
+        self.declare_partials(
+            "data:propulsion:Design_Thermo_Power", "data:propulsion:Design_Thermo_Power", val=1.0
+        )
+        self.declare_partials(
+            "data:propulsion:Design_Thermo_Power", "data:propulsion:RTO_power", val=-1.22
+        )
+        self.declare_partials(
+            "data:propulsion:propeller:max_power", "data:propulsion:propeller:max_power", val=1.0
+        )
+        self.declare_partials(
+            "data:propulsion:propeller:max_power", "data:propulsion:RTO_power", val=-1.094
+        )
+
+        # (RTO power, takeoff distance error) of previous call of solve_nonlinear in current run,
+        # approximation calls excluded
+        self._previous_point = None
+
+    def apply_nonlinear(self, inputs, outputs, residuals):
+        if self.iter_count + self.iter_count_apply == 0:
+            _warn_if_sizing_cases_inactive(inputs)
+
+        RTO_power = outputs["data:propulsion:RTO_power"]
+
+        residuals["data:propulsion:RTO_power"] = np.maximum(
+            inputs["data:mission:sizing:takeoff:distance"] - inputs["data:TLAR:TOD"],
+            (inputs["data:propulsion:sizing:RTO_power"] - RTO_power) / self.options["initial_gain"],
+        )
+        residuals["data:propulsion:Design_Thermo_Power"] = (
+            outputs["data:propulsion:Design_Thermo_Power"] - RTO_power * 1.22
+        )
+        residuals["data:propulsion:propeller:max_power"] = (
+            outputs["data:propulsion:propeller:max_power"] - RTO_power * 1.094
+        )
+
+    def linearize(self, inputs, outputs, partials):
+        gain = self.options["initial_gain"]
+        is_power_bound_active = (
+            inputs["data:propulsion:sizing:RTO_power"] - outputs["data:propulsion:RTO_power"]
+        ) / gain > inputs["data:mission:sizing:takeoff:distance"] - inputs["data:TLAR:TOD"]
+
+        partials["data:propulsion:RTO_power", "data:mission:sizing:takeoff:distance"] = np.where(
+            is_power_bound_active, 0.0, 1.0
+        )
+        partials["data:propulsion:RTO_power", "data:TLAR:TOD"] = np.where(
+            is_power_bound_active, 0.0, -1.0
+        )
+        partials["data:propulsion:RTO_power", "data:propulsion:sizing:RTO_power"] = np.where(
+            is_power_bound_active, 1.0 / gain, 0.0
+        )
+        partials["data:propulsion:RTO_power", "data:propulsion:RTO_power"] = np.where(
+            is_power_bound_active, -1.0 / gain, 0.0
+        )
+
+    def solve_nonlinear(self, inputs, outputs):
+        # Secant steps use only points of current run, which starts when run_model resets
+        # iteration counts, as in ComputeEngineSize
+        if self.iter_count_without_approx == 0 and not self.under_approx:
+            self._previous_point = None
+        if self.iter_count + self.iter_count_apply == 0:
+            _warn_if_sizing_cases_inactive(inputs)
+
+        RTO_power = float(outputs["data:propulsion:RTO_power"][0])
+        delta_TOD = float(
+            inputs["data:mission:sizing:takeoff:distance"][0] - inputs["data:TLAR:TOD"][0]
+        )
+
+        if abs(delta_TOD) >= self.options["TOD_tolerance"]:
+            # Takeoff distance decreases when RTO power increases. Computed or secant slope is
+            # used only if it is consistent with that.
+            slope = -1.0 / self.options["initial_gain"]  # m/W
+            sensitivity = float(inputs["data:mission:sizing:takeoff:RTO_power_sensitivity"][0])
+            if sensitivity < 0.0:
+                slope = sensitivity
+            elif self._previous_point is not None:
+                previous_RTO_power, previous_delta_TOD = self._previous_point
+                if RTO_power != previous_RTO_power:
+                    secant_slope = (delta_TOD - previous_delta_TOD) / (
+                        RTO_power - previous_RTO_power
+                    )
+                    if secant_slope < 0.0:
+                        slope = secant_slope
+
+            max_step = self.options["max_relative_step"] * RTO_power
+            if not self.under_approx:
+                self._previous_point = (RTO_power, delta_TOD)
+            RTO_power += np.clip(-delta_TOD / slope, -max_step, max_step)
 
-        self.previous_RTO_power = RTO_power
+        RTO_power = max(RTO_power, float(inputs["data:propulsion:sizing:RTO_power"][0]))
 
         outputs["data:propulsion:RTO_power"] = RTO_power
         outputs["data:propulsion:Design_Thermo_Power"] = RTO_power * 1.22
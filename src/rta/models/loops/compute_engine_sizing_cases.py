@@ -0,0 +1,264 @@
+"""
+Computation of RTO power required by OEI ceiling, time to climb and cruise Mach number
+"""
+#  This file is part of FAST : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2020  ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import numpy as np
+import openmdao.api as om
+from fastoad.constants import EngineSetting
+from fastoad.module_management.constants import ModelDomain
+from fastoad.module_management.service_registry import RegisterOpenMDAOSystem
+from scipy import constants
+from scipy.optimize import brentq
+from stdatm import AtmosphereSI
+
+from ..aerodynamics.components.polar_table import get_polar_interpolant
+from ..propulsion.fuel_engine.turboprop_engine.openmdao import OMMLTPL1Wrapper
+
+# Number of altitude steps used for integrating time to climb
+CLIMB_STEP_COUNT = 10
+# Bounds of the ratio of needed and current RTO power for time to climb
+TTC_POWER_RATIO_BOUNDS = (1.0e-3, 100.0)
+
+
+@RegisterOpenMDAOSystem("rta.loop.engine_sizing_cases", domain=ModelDomain.PERFORMANCE)
+class ComputeEngineSizingCases(om.ExplicitComponent):
+    """
+    RTO power needed for OEI ceiling, time to climb and cruise Mach number.
+
+    Each case is evaluated at a few flight points at MTOW with the cruise polar, without
+    running a mission. Max power of the engine model is proportional to RTO power, so the
+    needed RTO power is the current one scaled by the ratio of needed and available shaft
+    powers:
+
+    - OEI ceiling: at data:TLAR:OEI_ceiling, remaining engines at maximum continuous rating
+      (climb rating scaled by gearbox limits) must provide the gross climb gradient of the
+      "OEI_climb_gradient" option, for the best polar point at lift coefficients lower than
+      the optimal one and speeds lower than cruise speed. Feathered propeller drag is added.
+    - Time to climb: climb at constant equivalent airspeed, limited by cruise Mach number, from
+      "climb_start_altitude" option to cruise altitude at climb rating must last
+      data:TLAR:TTC.
+    - Cruise Mach number: level flight at data:TLAR:cruise_mach and cruise altitude must be
+      possible at cruise rating.
+
+    With option "use_polar_table", drag of each point is interpolated at its Mach number in the
+    table of :class:`~rta.models.aerodynamics.components.polar_table.ComputeCruisePolarTable`.
+
+    The most demanding case is provided as data:propulsion:sizing:RTO_power, for use by
+    :class:`~.compute_engine_size.ComputeEngineSize`.
+    """
+
+    def initialize(self):
+        self.options.declare(
+            "OEI_climb_gradient",
+            default=0.011,
+            types=float,
+            desc="gross gradient at OEI ceiling, so that net gradient is 0 for a twin",
+        )
+        self.options.declare(
+            "climb_EAS", default=170.0 * constants.knot, types=float, desc="in m/s"
+        )
+        self.options.declare(
+            "climb_start_altitude", default=1500.0 * constants.foot, types=float, desc="in m"
+        )
+        self.options.declare(
+            "use_polar_table",
+            default=False,
+            types=bool,
+            desc="if True, drag is interpolated at the Mach number of each point in the cruise "
+            "polar table of rta.aerodynamics.cruise_polar_table",
+        )
+
+    def setup(self):
+        self._engine_wrapper = OMMLTPL1Wrapper()
+        self._engine_wrapper.setup(self)
+
+        self.add_input("data:TLAR:OEI_ceiling", val=np.nan, units="m")
+        self.add_input("data:TLAR:TTC", val=np.nan, units="s")
+        self.add_input("data:TLAR:cruise_mach", val=np.nan)
+        self.add_input("data:mission:sizing:main_route:cruise:altitude", val=np.nan, units="m")
+        self.add_input("data:weight:aircraft:MTOW", val=np.nan, units="kg")
+        self.add_input("data:geometry:wing:area", val=np.nan, units="m**2")
+        self.add_input("data:aerodynamics:aircraft:cruise:CL", val=np.nan, shape_by_conn=True)
+        self.add_input("data:aerodynamics:aircraft:cruise:CD", val=np.nan, shape_by_conn=True)
+        self.add_input("data:aerodynamics:aircraft:cruise:optimal_CL", val=np.nan)
+        self.add_input("data:aerodynamics:aircraft:low_speed:DCD_feather", val=np.nan)
+        if self.options["use_polar_table"]:
+            self.add_input(
+                "data:aerodynamics:aircraft:cruise:polar_table:mach", shape_by_conn=True, val=np.nan
+            )
+            self.add_input(
+                "data:aerodynamics:aircraft:cruise:polar_table:CD", shape_by_conn=True, val=np.nan
+            )
+
+        self.add_output("data:propulsion:sizing:OEI_ceiling:RTO_power", units="W")
+        self.add_output("data:propulsion:sizing:TTC:RTO_power", units="W")
+        self.add_output("data:propulsion:sizing:cruise_mach:RTO_power", units="W")
+        self.add_output("data:propulsion:sizing:RTO_power", units="W")
+
+        self.declare_partials("*", "*", method="fd")
+
+    def compute(self, inputs, outputs, discrete_inputs=None, discrete_outputs=None):
+        propulsion = self._engine_wrapper.get_model(inputs)
+        engine = propulsion.engine
+        engine_count = float(propulsion.engine_count[0])
+
+        RTO_power = float(inputs["data:propulsion:RTO_power"][0])
+        weight = float(inputs["data:weight:aircraft:MTOW"][0]) * constants.g
+        wing_area = float(inputs["data:geometry:wing:area"][0])
+        cruise_altitude = float(inputs["data:mission:sizing:main_route:cruise:altitude"][0])
+        cruise_mach = float(inputs["data:TLAR:cruise_mach"][0])
+        polar_CL = inputs["data:aerodynamics:aircraft:cruise:CL"]
+        polar_CD = inputs["data:aerodynamics:aircraft:cruise:CD"]
+        if self.options["use_polar_table"]:
+            get_CD = get_polar_interpolant(
+                inputs["data:aerodynamics:aircraft:cruise:polar_table:mach"],
+                polar_CL,
+                inputs["data:aerodynamics:aircraft:cruise:polar_table:CD"],
+            )
+        else:
+
+            def get_CD(mach, CL):
+                """Drag coefficient interpolated in polar, assumed sorted by increasing CL."""
+                return np.interp(CL, polar_CL, polar_CD)
+
+        # OEI ceiling: one point per polar point, at speeds not greater than cruise speed
+        OEI_atmosphere = AtmosphereSI(inputs["data:TLAR:OEI_ceiling"][0])
+        OEI_mach = (
+            np.sqrt(
+                2.0 * weight / (OEI_atmosphere.density * wing_area * np.maximum(polar_CL, 1e-6))
+            )
+            / OEI_atmosphere.speed_of_sound
+        )
+        is_OEI_point = (OEI_mach <= cruise_mach) & (
+            polar_CL <= inputs["data:aerodynamics:aircraft:cruise:optimal_CL"][0]
+        )
+        if not np.any(is_OEI_point):
+            raise ValueError(
+                "OEI ceiling case cannot be evaluated: no point of cruise polar is below optimal "
+                "CL with a speed at OEI ceiling lower than cruise speed."
+            )
+        OEI_mach = OEI_mach[is_OEI_point]
+        OEI_CD = (
+            get_CD(OEI_mach, polar_CL[is_OEI_point])
+            + inputs["data:aerodynamics:aircraft:low_speed:DCD_feather"]
+        )
+        OEI_thrust = weight * (OEI_CD / polar_CL[is_OEI_point] + self.options["OEI_climb_gradient"])
+
+        # Time to climb: one point at the middle of each altitude step
+        climb_altitudes = np.linspace(
+            self.options["climb_start_altitude"], cruise_altitude, CLIMB_STEP_COUNT + 1
+        )
+        climb_atmosphere = AtmosphereSI((climb_altitudes[:-1] + climb_altitudes[1:]) / 2.0)
+        climb_atmosphere.equivalent_airspeed = self.options["climb_EAS"]
+        climb_mach = np.minimum(climb_atmosphere.mach, cruise_mach)
+        climb_true_airspeed = climb_mach * climb_atmosphere.speed_of_sound
+        climb_dynamic_pressure = 0.5 * climb_atmosphere.density * climb_true_airspeed**2
+        climb_drag = (
+            climb_dynamic_pressure
+            * wing_area
+            * get_CD(climb_mach, weight / (climb_dynamic_pressure * wing_area))
+        )
+
+        # Cruise
+        cruise_atmosphere = AtmosphereSI(cruise_altitude)
+        cruise_atmosphere.mach = cruise_mach
+        cruise_dynamic_pressure = (
+            0.5 * cruise_atmosphere.density * cruise_atmosphere.true_airspeed**2
+        )
+        cruise_thrust = (
+            cruise_dynamic_pressure
+            * wing_area
+            * get_CD(cruise_mach, weight / (cruise_dynamic_pressure * wing_area))
+        )
+
+        # Max performances of all points are computed at once
+        altitude = np.concatenate(
+            [
+                np.full_like(OEI_mach, OEI_atmosphere.altitude),
+                climb_atmosphere.altitude,
+                [cruise_altitude],
+            ]
+        )
+        mach = np.concatenate([OEI_mach, climb_mach, [cruise_mach]])
+        engine_setting = np.concatenate(
+            [
+                np.full(len(OEI_mach) + CLIMB_STEP_COUNT, EngineSetting.CLIMB.value),
+                [EngineSetting.CRUISE.value],
+            ]
+        )
+        atmosphere = AtmosphereSI(altitude)
+        max_shaft_power, _, residual_thrust, _ = engine.compute_max_thrust(
+            atmosphere, mach, engine_setting
+        )
+
+        climb_points = slice(len(OEI_mach), len(OEI_mach) + CLIMB_STEP_COUNT)
+
+        # OEI ceiling and cruise have a given thrust. Propeller provides what residual thrust
+        # does not.
+        thrust_points = np.append(np.arange(len(OEI_mach)), len(mach) - 1)
+        thrust = np.append(OEI_thrust / (engine_count - 1.0), cruise_thrust / engine_count)
+        shaft_power, _ = engine.propeller.thrust_to_power(
+            engine,
+            AtmosphereSI(altitude[thrust_points]),
+            mach[thrust_points],
+            np.maximum(thrust - residual_thrust[thrust_points], 0.0),
+        )
+        power_ratio = shaft_power / max_shaft_power[thrust_points]
+        OEI_RTO_power = (
+            RTO_power
+            * np.min(power_ratio[:-1])
+            * inputs["settings:propulsion:ratings:MCL:k_gb"][0]
+            / inputs["settings:propulsion:ratings:MCT:k_gb"][0]
+        )
+        cruise_RTO_power = RTO_power * power_ratio[-1]
+
+        # Time to climb is solved on the ratio of available shaft power
+        climb_altitude_step = np.diff(climb_altitudes)
+        climb_max_shaft_power = max_shaft_power[climb_points]
+        climb_residual_thrust = residual_thrust[climb_points]
+
+        def time_to_climb_error(power_ratio):
+            propeller_thrust, _ = engine.propeller.power_to_thrust(
+                engine, climb_atmosphere, climb_mach, power_ratio * climb_max_shaft_power
+            )
+            thrust = engine_count * (propeller_thrust + climb_residual_thrust)
+            rate_of_climb = (thrust - climb_drag) * climb_true_airspeed / weight
+            time = np.sum(climb_altitude_step / np.maximum(rate_of_climb, 1.0e-3))
+            return time - inputs["data:TLAR:TTC"][0]
+
+        # Bracket of available power is widened until it contains the one for time to climb
+        min_ratio, max_ratio = TTC_POWER_RATIO_BOUNDS
+        lower_ratio = 0.05
+        upper_ratio = 1.0
+        while time_to_climb_error(upper_ratio) > 0.0 and upper_ratio < max_ratio:
+            lower_ratio = upper_ratio
+            upper_ratio *= 2.0
+        while time_to_climb_error(lower_ratio) < 0.0 and lower_ratio > min_ratio:
+            upper_ratio = lower_ratio
+            lower_ratio /= 2.0
+        if time_to_climb_error(lower_ratio) * time_to_climb_error(upper_ratio) > 0.0:
+            raise ValueError(
+                "Time to climb case cannot be evaluated: data:TLAR:TTC is not achieved with "
+                "RTO power between %g W and %g W."
+                % (lower_ratio * RTO_power, upper_ratio * RTO_power)
+            )
+        TTC_RTO_power = RTO_power * brentq(time_to_climb_error, lower_ratio, upper_ratio, rtol=1e-6)
+
+        outputs["data:propulsion:sizing:OEI_ceiling:RTO_power"] = OEI_RTO_power
+        outputs["data:propulsion:sizing:TTC:RTO_power"] = TTC_RTO_power
+        outputs["data:propulsion:sizing:cruise_mach:RTO_power"] = cruise_RTO_power
+        outputs["data:propulsion:sizing:RTO_power"] = max(
+            OEI_RTO_power, TTC_RTO_power, cruise_RTO_power
+        )
@@ -1,8 +1,24 @@
+import numpy as np
+import os.path as pth
+
+from fastoad.io import VariableIO
+import pytest
 from pytest import approx
 from fastoad.testing import run_system
+from openmdao.api import (
+    DirectSolver,
+    ExecComp,
+    Group,
+    NewtonSolver,
+    NonlinearBlockGS,
+    Problem,
+)
 from openmdao.core.indepvarcomp import IndepVarComp
 
-from ..compute_engine_size import ComputeEngineSize
+from ..compute_engine_size import ComputeEngineSize, ComputeEngineSizeImplicit
+from ..compute_engine_sizing_cases import ComputeEngineSizingCases
+
+DATA_FOLDER_PATH = pth.join(pth.dirname(__file__), "data")
 
 
 def test_compute_engine_size():
@@ -14,8 +30,224 @@ def test_compute_engine_size():
     ivc.add_output("data:TLAR:OEI_ceiling", val=8000, units="m")
     ivc.add_output("data:TLAR:cruise_mach", val=0.55)
 
-    problem = run_system(ComputeEngineSize(), ivc)
+    # Without RTO power of sizing cases, engine is sized by takeoff only
+    with pytest.warns(UserWarning, match="deactivated"):
+        problem = run_system(ComputeEngineSize(), ivc)
 
     assert problem["data:propulsion:RTO_power"] == approx(4.301e6, rel=1e-3)
     assert problem["data:propulsion:Design_Thermo_Power"] == approx(5.247e6, rel=1e-3)
     assert problem["data:propulsion:propeller:max_power"] == approx(4.705e6, rel=1e-3)
+
+
+def test_compute_engine_size_state():
+    def get_ivc(initial_RTO_power=None):
+        ivc = IndepVarComp()
+        ivc.add_output("data:mission:sizing:takeoff:distance", val=950, units="m")
+        ivc.add_output("data:TLAR:TOD", val=800, units="m")
+        ivc.add_output("data:TLAR:TTC", val=30, units="min")
+        ivc.add_output("data:TLAR:OEI_ceiling", val=8000, units="m")
+        ivc.add_output("data:TLAR:cruise_mach", val=0.55)
+        if initial_RTO_power is not None:
+            ivc.add_output(
+                "settings:propulsion:initial_RTO_power", val=initial_RTO_power, units="W"
+            )
+        return ivc
+
+    # Instances do not share their state
+    RTO_power = run_system(ComputeEngineSize(), get_ivc())["data:propulsion:RTO_power"]
+    assert run_system(ComputeEngineSize(), get_ivc())["data:propulsion:RTO_power"] == approx(
+        RTO_power, rel=1e-12
+    )
+
+    # State is reset by setup
+    problem = Problem()
+    problem.model.add_subsystem("ivc", get_ivc(), promotes=["*"])
+    problem.model.add_subsystem("engine_size", ComputeEngineSize(), promotes=["*"])
+    problem.setup()
+    problem.run_model()
+    first_RTO_power = problem["data:propulsion:RTO_power"]
+    problem.setup()
+    problem.run_model()
+    assert problem["data:propulsion:RTO_power"] == approx(first_RTO_power, rel=1e-12)
+
+    # Warm start, each run restarting from the initial value
+    problem = run_system(ComputeEngineSize(), get_ivc(2.5e6))
+    assert problem["data:propulsion:RTO_power"] == approx(RTO_power + 0.449e6, rel=1e-12)
+    problem.run_model()
+    assert problem["data:propulsion:RTO_power"] == approx(RTO_power + 0.449e6, rel=1e-12)
+    problem["settings:propulsion:initial_RTO_power"] = 0.0
+    problem.run_model()
+    assert problem["data:propulsion:RTO_power"] == approx(RTO_power, rel=1e-12)
+    problem["settings:propulsion:initial_RTO_power"] = 2.5e6
+    problem.run_model()
+    assert problem["data:propulsion:RTO_power"] == approx(RTO_power + 0.449e6, rel=1e-12)
+
+    # Approximated partials are taken around the computed point and do not change the state
+    data = problem.check_partials(out_stream=None, form="central")
+    partials = data["component"][
+        "data:propulsion:RTO_power", "data:mission:sizing:takeoff:distance"
+    ]
+    assert partials["J_fwd"] == approx(1500.0, rel=1e-6)
+    problem.run_model()
+    assert problem["data:propulsion:RTO_power"] == approx(RTO_power + 0.449e6, rel=1e-12)
+
+
+def test_compute_engine_sizing_cases():
+    ivc = VariableIO(pth.join(DATA_FOLDER_PATH, "engine_sizing.xml")).read().to_ivc()
+    problem = run_system(ComputeEngineSizingCases(), ivc)
+
+    OEI_RTO_power = problem["data:propulsion:sizing:OEI_ceiling:RTO_power"][0]
+    TTC_RTO_power = problem["data:propulsion:sizing:TTC:RTO_power"][0]
+    cruise_RTO_power = problem["data:propulsion:sizing:cruise_mach:RTO_power"][0]
+    assert OEI_RTO_power == approx(2.122e6, rel=1e-3)
+    assert TTC_RTO_power == approx(1.690e6, rel=1e-3)
+    assert cruise_RTO_power == approx(1.685e6, rel=1e-3)
+    assert problem["data:propulsion:sizing:RTO_power"] == approx(OEI_RTO_power)
+
+    # Needed RTO power barely depends on current one, as only shaft power is scaled, not
+    # residual thrust of engines
+    problem["data:propulsion:RTO_power"] = TTC_RTO_power
+    problem.run_model()
+    assert problem["data:propulsion:sizing:OEI_ceiling:RTO_power"] == approx(
+        OEI_RTO_power, rel=2e-2
+    )
+    assert problem["data:propulsion:sizing:TTC:RTO_power"] == approx(TTC_RTO_power, rel=2e-2)
+    assert problem["data:propulsion:sizing:cruise_mach:RTO_power"] == approx(
+        cruise_RTO_power, rel=2e-2
+    )
+
+    # Cases that cannot be evaluated fail explicitly
+    problem["data:aerodynamics:aircraft:cruise:optimal_CL"] = -1.0
+    with pytest.raises(ValueError, match="OEI ceiling case cannot be evaluated"):
+        problem.run_model()
+    problem["data:aerodynamics:aircraft:cruise:optimal_CL"] = 1.0
+    problem["data:TLAR:TTC"] = 0.01
+    with pytest.raises(ValueError, match="Time to climb case cannot be evaluated"):
+        problem.run_model()
+
+    # Polar table with the cruise polar at all Mach numbers gives the same results
+    variables = VariableIO(pth.join(DATA_FOLDER_PATH, "engine_sizing.xml")).read()
+    cruise_CD = variables["data:aerodynamics:aircraft:cruise:CD"].value
+    variables["data:aerodynamics:aircraft:cruise:polar_table:mach"] = dict(value=[0.2, 0.6])
+    variables["data:aerodynamics:aircraft:cruise:polar_table:CD"] = dict(
+        value=[cruise_CD, cruise_CD]
+    )
+    problem = run_system(ComputeEngineSizingCases(use_polar_table=True), variables.to_ivc())
+    assert problem["data:propulsion:sizing:OEI_ceiling:RTO_power"] == approx(OEI_RTO_power)
+    assert problem["data:propulsion:sizing:TTC:RTO_power"] == approx(TTC_RTO_power, rel=1e-5)
+    assert problem["data:propulsion:sizing:cruise_mach:RTO_power"] == approx(cruise_RTO_power)
+
+    # More drag at low Mach number increases power needed for climb, not for cruise
+    problem["data:aerodynamics:aircraft:cruise:polar_table:CD"] = np.array(
+        [1.2 * np.array(cruise_CD), cruise_CD]
+    )
+    problem["data:aerodynamics:aircraft:cruise:polar_table:mach"] = np.array([0.2, 0.45])
+    problem.run_model()
+    assert problem["data:propulsion:sizing:TTC:RTO_power"] > 1.01 * TTC_RTO_power
+    assert problem["data:propulsion:sizing:cruise_mach:RTO_power"] == approx(cruise_RTO_power)
+
+    # RTO power from takeoff distance is increased up to the needed one
+    ivc = IndepVarComp()
+    ivc.add_output("data:mission:sizing:takeoff:distance", val=700, units="m")
+    ivc.add_output("data:TLAR:TOD", val=800, units="m")
+    ivc.add_output("data:TLAR:TTC", val=30, units="min")
+    ivc.add_output("data:TLAR:OEI_ceiling", val=8000, units="m")
+    ivc.add_output("data:TLAR:cruise_mach", val=0.55)
+    ivc.add_output("data:propulsion:sizing:RTO_power", val=2.5e6, units="W")
+    problem = run_system(ComputeEngineSize(), ivc)
+    assert problem["data:propulsion:RTO_power"] == approx(2.5e6)
+
+
+def _get_engine_sizing_problem(
+    nonlinear_solver,
+    linear_solver=None,
+    sizing_RTO_power=0.0,
+    with_sensitivity=False,
+    TOD=800.0,
+):
+    # Takeoff distance model where 800 m are reached for RTO power = 2.3 MW
+    model = Group()
+    model.add_subsystem(
+        "takeoff",
+        ExecComp(
+            [
+                "TOD = 800.0 * (2.3e6 / RTO_power) ** 1.5",
+                "sensitivity = -1.5 * 800.0 * (2.3e6 / RTO_power) ** 1.5 / RTO_power",
+            ],
+            TOD={"units": "m"},
+            sensitivity={"units": "m/W"},
+            RTO_power={"units": "W", "val": 2.051e6},
+        ),
+        promotes_inputs=[("RTO_power", "data:propulsion:RTO_power")],
+        promotes_outputs=[("TOD", "data:mission:sizing:takeoff:distance")]
+        + (
+            [("sensitivity", "data:mission:sizing:takeoff:RTO_power_sensitivity")]
+            if with_sensitivity
+            else []
+        ),
+    )
+    model.add_subsystem("engine_size", ComputeEngineSizeImplicit(), promotes=["*"])
+    model.nonlinear_solver = nonlinear_solver
+    if linear_solver:
+        model.linear_solver = linear_solver
+
+    problem = Problem(model)
+    problem.setup()
+    problem["data:TLAR:TOD"] = TOD
+    problem["data:propulsion:sizing:RTO_power"] = sizing_RTO_power
+    problem.run_model()
+
+    return problem
+
+
+def test_compute_engine_size_implicit():
+    # Secant updates in a NonlinearBlockGS loop
+    problem = _get_engine_sizing_problem(NonlinearBlockGS(maxiter=20, atol=1.0, iprint=0))
+
+    assert problem["data:mission:sizing:takeoff:distance"] == approx(800.0, abs=10.0)
+    assert problem["data:propulsion:RTO_power"] == approx(2.3e6, rel=1e-2)
+    assert problem["data:propulsion:Design_Thermo_Power"] == approx(
+        problem["data:propulsion:RTO_power"] * 1.22
+    )
+    assert problem.model.nonlinear_solver._iter_count <= 6
+
+    # Secant steps do not use points of previous runs: a run from the same starting point gives
+    # the same result as with a new problem
+    problem["data:TLAR:TOD"] = 900.0
+    problem["data:propulsion:RTO_power"] = 2.051e6
+    problem.run_model()
+    new_problem = _get_engine_sizing_problem(
+        NonlinearBlockGS(maxiter=20, atol=1.0, iprint=0), TOD=900.0
+    )
+    assert problem["data:propulsion:RTO_power"] == approx(
+        new_problem["data:propulsion:RTO_power"], rel=1e-12
+    )
+    assert problem.model.nonlinear_solver._iter_count == (
+        new_problem.model.nonlinear_solver._iter_count
+    )
+
+    # Newton steps in a NonlinearBlockGS loop with derivative of takeoff distance
+    problem = _get_engine_sizing_problem(
+        NonlinearBlockGS(maxiter=20, atol=1.0, iprint=0), with_sensitivity=True
+    )
+
+    assert problem["data:mission:sizing:takeoff:distance"] == approx(800.0, abs=10.0)
+    assert problem.model.nonlinear_solver._iter_count <= 4
+
+    # Takeoff distance as residual of a Newton solver
+    problem = _get_engine_sizing_problem(
+        NewtonSolver(maxiter=20, atol=1e-6, solve_subsystems=False, iprint=0), DirectSolver()
+    )
+
+    assert problem["data:mission:sizing:takeoff:distance"] == approx(800.0, abs=1e-3)
+    assert problem["data:propulsion:RTO_power"] == approx(2.3e6, rel=1e-6)
+    assert problem["data:propulsion:propeller:max_power"] == approx(2.3e6 * 1.094, rel=1e-6)
+
+    # RTO power needed by other sizing cases is a lower bound, as in ComputeEngineSize
+    for nonlinear_solver, linear_solver in [
+        (NonlinearBlockGS(maxiter=20, atol=1.0, iprint=0), None),
+        (NewtonSolver(maxiter=20, atol=1e-6, solve_subsystems=False, iprint=0), DirectSolver()),
+    ]:
+        problem = _get_engine_sizing_problem(nonlinear_solver, linear_solver, 2.5e6)
+        assert problem["data:propulsion:RTO_power"] == approx(2.5e6, rel=1e-6)
+        assert problem["data:mission:sizing:takeoff:distance"] < 800.0
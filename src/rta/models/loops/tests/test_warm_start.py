@@ -0,0 +1,99 @@
+from openmdao.api import ExecComp, Group, IndepVarComp, NonlinearBlockGS, Problem
+from pytest import approx, raises
+
+from ..warm_start import DesignCache
+
+
+def get_problem(wing_area, maxiter=50):
+    # MTOW depends on itself through wing area, as in the sizing loop
+    model = Group()
+    ivc = IndepVarComp()
+    ivc.add_output("data:geometry:wing:area", val=wing_area, units="m**2")
+    ivc.add_output("settings:propulsion:initial_RTO_power", val=0.0, units="W")
+    model.add_subsystem("inputs", ivc, promotes=["*"])
+    model.add_subsystem(
+        "weight",
+        ExecComp(
+            "OWE = 10000.0 + 100.0 * area + 0.3 * MTOW",
+            OWE={"units": "kg"},
+            MTOW={"units": "kg"},
+            area={"units": "m**2"},
+        ),
+        promotes_inputs=[
+            ("area", "data:geometry:wing:area"),
+            ("MTOW", "data:weight:aircraft:MTOW"),
+        ],
+        promotes_outputs=[("OWE", "data:weight:aircraft:OWE")],
+    )
+    model.add_subsystem(
+        "mtow",
+        ExecComp(
+            ["MTOW = OWE + 5000.0", "RTO_power = 100.0 * (OWE + 5000.0)"],
+            MTOW={"units": "kg"},
+            OWE={"units": "kg"},
+            RTO_power={"units": "W"},
+        ),
+        promotes_inputs=[("OWE", "data:weight:aircraft:OWE")],
+        promotes_outputs=[
+            ("MTOW", "data:weight:aircraft:MTOW"),
+            ("RTO_power", "data:propulsion:RTO_power"),
+        ],
+    )
+    model.nonlinear_solver = NonlinearBlockGS(maxiter=maxiter, atol=1e-2, rtol=1e-12, iprint=0)
+
+    problem = Problem(model)
+    problem.setup()
+    return problem
+
+
+def test_design_cache(tmp_path):
+    design_cache = DesignCache(str(tmp_path))
+
+    # Empty cache
+    problem = get_problem(60.0)
+    assert design_cache.warm_start(problem) is None
+    problem.run_model()
+    cold_start_iterations = problem.model.nonlinear_solver._iter_count
+    key = design_cache.store(problem)
+
+    # Same inputs
+    problem = get_problem(60.0)
+    assert design_cache.warm_start(problem) == key
+    assert problem["data:weight:aircraft:MTOW"] == approx(21000.0 / 0.7)
+    assert problem["settings:propulsion:initial_RTO_power"] == approx(2.1e6 / 0.7)
+    problem.run_model()
+    assert problem.model.nonlinear_solver._iter_count < cold_start_iterations
+
+    # Nearest design is used for new inputs
+    problem = get_problem(80.0)
+    problem.run_model()
+    design_cache.store(problem)
+    problem = get_problem(61.0)
+    assert design_cache.warm_start(problem) == key
+    problem.run_model()
+    assert problem.model.nonlinear_solver._iter_count < cold_start_iterations
+    assert problem["data:weight:aircraft:MTOW"] == approx(21100.0 / 0.7)
+
+    key_61 = design_cache.store(problem)
+    assert key_61 != key
+    assert len(list(tmp_path.glob("*.json"))) == 3
+
+    # Too distant designs are not used
+    assert DesignCache(str(tmp_path), max_distance=0.01).warm_start(get_problem(100.0)) is None
+    assert DesignCache(str(tmp_path / "empty")).warm_start(get_problem(60.0)) is None
+
+
+def test_design_cache_convergence(tmp_path):
+    design_cache = DesignCache(str(tmp_path))
+
+    # Problems that have not been run or did not converge are not stored
+    problem = get_problem(60.0)
+    with raises(ValueError, match="not been run"):
+        design_cache.store(problem)
+
+    problem = get_problem(60.0, maxiter=2)
+    problem.run_model()
+    with raises(ValueError, match="did not converge"):
+        design_cache.store(problem)
+
+    assert not list(tmp_path.glob("*.json"))
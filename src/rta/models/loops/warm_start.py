@@ -0,0 +1,218 @@
+"""
+Warm start of sizing processes from previously converged designs
+"""
+#  This file is part of FAST : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2020  ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import glob
+import hashlib
+import json
+import os
+import os.path as pth
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import openmdao.api as om
+from fastoad.openmdao.variables import VariableList
+
+#: Coupling variables of the sizing process, stored for converged designs
+COUPLING_VARIABLES = (
+    "data:weight:aircraft:MTOW",
+    "data:weight:aircraft:OWE",
+    "data:mission:sizing:fuel",
+    "data:geometry:wing:area",
+    "data:geometry:wing:MAC:at25percent:x",
+    "data:propulsion:RTO_power",
+    "data:weight:aircraft:CG:aft:MAC_position",
+)
+
+#: Problem inputs that are set by warm start, hence not part of the design key
+WARM_START_INPUTS = {"settings:propulsion:initial_RTO_power": "data:propulsion:RTO_power"}
+
+
+class DesignCache:
+    def __init__(
+        self,
+        folder_path: str,
+        variable_names: Sequence[str] = COUPLING_VARIABLES,
+        max_distance: Optional[float] = None,
+        tolerance: float = 1.0e-3,
+    ):
+        """
+        On-disk cache of converged designs, for warm-starting sizing processes.
+
+        Each design is stored in a JSON file named after a hash of problem inputs, with the
+        values of coupling variables. Before a run, coupling variables are initialized with
+        values of the stored design with nearest inputs, which is the design itself if its
+        inputs did not change. Inputs of :data:`WARM_START_INPUTS` are also set, e.g. initial
+        RTO power of :class:`~.compute_engine_size.ComputeEngineSize`.
+
+        Usage with a FAST-OAD problem::
+
+            problem = configurator.get_problem(read_inputs=True)
+            problem.setup()
+            design_cache.warm_start(problem)
+            problem.run_model()
+            design_cache.store(problem)
+
+        :param folder_path: folder of design files, created if needed
+        :param variable_names: coupling variables, the ones absent from a problem are ignored
+        :param max_distance: if provided, stored designs whose inputs differ more than this
+                             (as a RMS relative difference) are not used
+        :param tolerance: designs are stored only if residuals of coupling variables,
+                          relative to their values, are below this tolerance
+        """
+        self.folder_path = folder_path
+        self.variable_names = list(variable_names)
+        self.max_distance = max_distance
+        self.tolerance = tolerance
+
+    def store(self, problem: om.Problem) -> str:
+        """
+        Stores values of coupling variables of a converged problem.
+
+        Convergence is checked by evaluating residuals of coupling variables, which runs
+        the model once more without modifying its outputs.
+
+        :param problem: a problem that has been run
+        :return: key of the design
+        :raise ValueError: if the problem has not been run or did not converge
+        """
+        variables = VariableList.from_problem(problem, io_status="outputs")
+        self._check_convergence(
+            problem, [name for name in self.variable_names if name in variables.names()]
+        )
+
+        inputs = self._get_inputs(problem)
+        key = self.get_key(inputs)
+
+        content = {
+            "inputs": inputs,
+            "outputs": {
+                name: {
+                    "value": np.ravel(problem.get_val(name, units=variables[name].units)).tolist(),
+                    "units": variables[name].units,
+                }
+                for name in self.variable_names
+                if name in variables.names()
+            },
+        }
+
+        os.makedirs(self.folder_path, exist_ok=True)
+        # File is renamed once written, so concurrent runs never read a partial file
+        file_path = pth.join(self.folder_path, key + ".json")
+        temp_file_path = "%s.%i.tmp" % (file_path, os.getpid())
+        with open(temp_file_path, "w") as file:
+            json.dump(content, file)
+        os.replace(temp_file_path, file_path)
+
+        return key
+
+    def warm_start(self, problem: om.Problem) -> Optional[str]:
+        """
+        Initializes coupling variables of a problem that has been set up with values of the
+        nearest stored design.
+
+        :param problem: a problem that has been set up, with its inputs
+        :return: key of the used design, or None if no design could be used
+        """
+        inputs = self._get_inputs(problem)
+        key, distance = self.get_nearest_key(inputs)
+        if key is None or (self.max_distance is not None and distance > self.max_distance):
+            return None
+
+        with open(pth.join(self.folder_path, key + ".json")) as file:
+            outputs = json.load(file)["outputs"]
+
+        problem_outputs = VariableList.from_problem(problem, io_status="outputs").names()
+        for name, variable in outputs.items():
+            if name in problem_outputs:
+                problem.set_val(name, np.array(variable["value"]), units=variable["units"])
+
+        problem_inputs = VariableList.from_problem(problem, io_status="inputs").names()
+        for input_name, output_name in WARM_START_INPUTS.items():
+            if input_name in problem_inputs and output_name in outputs:
+                variable = outputs[output_name]
+                problem.set_val(input_name, np.array(variable["value"]), units=variable["units"])
+
+        return key
+
+    def get_nearest_key(self, inputs: Dict[str, dict]) -> Tuple[Optional[str], float]:
+        """
+        :param inputs: problem inputs, as provided in design files
+        :return: key of stored design with nearest inputs and its distance, as the RMS of
+                 relative differences of input values, or (None, inf) if no stored design
+                 has the same input variables
+        """
+        key = self.get_key(inputs)
+        if pth.exists(pth.join(self.folder_path, key + ".json")):
+            return key, 0.0
+
+        values = self._get_values(inputs)
+        nearest_key, nearest_distance = None, np.inf
+        for file_path in glob.glob(pth.join(self.folder_path, "*.json")):
+            with open(file_path) as file:
+                stored_inputs = json.load(file)["inputs"]
+            if stored_inputs.keys() != inputs.keys():
+                continue
+            stored_values = self._get_values(stored_inputs)
+            if stored_values.shape != values.shape:
+                continue
+
+            scale = np.maximum(np.maximum(np.abs(values), np.abs(stored_values)), 1e-12)
+            distance = np.sqrt(np.mean(((values - stored_values) / scale) ** 2))
+            if distance < nearest_distance:
+                nearest_key = pth.splitext(pth.basename(file_path))[0]
+                nearest_distance = distance
+
+        return nearest_key, nearest_distance
+
+    @staticmethod
+    def get_key(inputs: Dict[str, dict]) -> str:
+        """
+        :param inputs: problem inputs, as provided in design files
+        :return: hash of inputs
+        """
+        return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode()).hexdigest()
+
+    def _check_convergence(self, problem: om.Problem, variable_names: Sequence[str]):
+        if problem.model.iter_count == 0:
+            raise ValueError("Design cannot be stored: problem has not been run.")
+
+        problem.model.run_apply_nonlinear()
+        for name in variable_names:
+            value = np.abs(problem.model.get_val(name))
+            residual = np.abs(problem.model.get_val(name, kind="residual"))
+            if not np.all(residual <= self.tolerance * np.maximum(value, 1.0)):
+                raise ValueError(
+                    "Design cannot be stored: problem did not converge (relative residual of "
+                    "%s is %s)." % (name, np.max(residual / np.maximum(value, 1.0)))
+                )
+
+    @staticmethod
+    def _get_inputs(problem: om.Problem) -> Dict[str, dict]:
+        variables = VariableList.from_problem(problem, io_status="inputs")
+        return {
+            name: {
+                "value": np.ravel(problem.get_val(name, units=variables[name].units)).tolist(),
+                "units": variables[name].units,
+            }
+            for name in sorted(variables.names())
+            if name not in WARM_START_INPUTS
+        }
+
+    @staticmethod
+    def _get_values(inputs: Dict[str, dict]) -> np.ndarray:
+        return np.concatenate(
+            [np.asarray(inputs[name]["value"], dtype=float) for name in sorted(inputs)]
+        )
@@ -0,0 +1,115 @@
+"""
+Memoization of computations of explicit components
+"""
+#  This file is part of FAST : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2020  ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import functools
+from dataclasses import dataclass
+from typing import Type, TypeVar
+
+from openmdao.core.explicitcomponent import ExplicitComponent
+
+T = TypeVar("T", bound=ExplicitComponent)
+
+
+@dataclass
+class MemoizationStatistics:
+    """Counts of compute calls of a memoized component."""
+
+    #: calls where outputs of previous call have been reused
+    hits: int = 0
+    #: calls where outputs have been computed
+    misses: int = 0
+
+
+def memoize_compute(component_class: Type[T]) -> Type[T]:
+    """
+    Class decorator for explicit components whose outputs only depend on inputs.
+
+    It adds the `memoize_compute` option to the component, which is False by default. When
+    this option is True, computation is skipped when input values are bit-identical to the
+    ones of the previous call, and outputs of the previous call are used instead. Counts of
+    reused and computed calls are available in the `memoization_statistics` attribute of
+    instances, which is reset, as the stored call, when the problem is set up again.
+
+    Calls for finite difference or complex step approximation of partials are not memoized
+    and do not replace the stored call, so the call at the linearization point is still
+    reused after partials are computed. Discrete variables are not supported.
+
+    Only `initialize` and `compute` are wrapped. A subclass that overrides `initialize`
+    without calling the parent method has no `memoize_compute` option, and is not memoized.
+
+    Usage::
+
+        @memoize_compute
+        class MyComponent(ExplicitComponent):
+            ...
+
+        model.add_subsystem("my_component", MyComponent(memoize_compute=True))
+
+    :param component_class: an ExplicitComponent subclass
+    :return: the same class, with optionally memoized compute
+    """
+    initialize = component_class.initialize
+    compute = component_class.compute
+
+    @functools.wraps(initialize)
+    def initialize_with_memoization(self):
+        initialize(self)
+        if "memoize_compute" not in self.options:
+            self.options.declare(
+                "memoize_compute",
+                default=False,
+                types=bool,
+                desc="If True, outputs of previous call are reused for identical inputs",
+            )
+        self.memoization_statistics = MemoizationStatistics()
+        self._memoized_vector = None
+        self._memoized_inputs = None
+        self._memoized_outputs = None
+
+    @functools.wraps(compute)
+    def memoized_compute(self, inputs, outputs, *args, **kwargs):
+        if (
+            "memoize_compute" not in self.options
+            or not self.options["memoize_compute"]
+            or self.under_approx
+        ):
+            compute(self, inputs, outputs, *args, **kwargs)
+            return
+
+        if inputs is not self._memoized_vector:
+            # New vectors are allocated at each setup of the problem
+            self.memoization_statistics = MemoizationStatistics()
+            self._memoized_vector = inputs
+            self._memoized_inputs = None
+
+        input_values = inputs.asarray()
+        if (
+            self._memoized_inputs is not None
+            and self._memoized_inputs.tobytes() == input_values.tobytes()
+        ):
+            outputs.set_val(self._memoized_outputs)
+            self.memoization_statistics.hits += 1
+            return
+
+        compute(self, inputs, outputs, *args, **kwargs)
+        self._memoized_inputs = input_values.copy()
+        self._memoized_outputs = outputs.asarray().copy()
+        self.memoization_statistics.misses += 1
+
+    component_class.initialize = initialize_with_memoization
+    component_class.compute = memoized_compute
+
+    return component_class
@@ -0,0 +1,311 @@
+"""
+Computation of takeoff field length
+"""
+#  This file is part of FAST : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2020  ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from typing import Tuple
+
+import numpy as np
+import openmdao.api as om
+from fastoad.constants import EngineSetting
+from fastoad.module_management.constants import ModelDomain
+from fastoad.module_management.service_registry import RegisterOpenMDAOSystem
+from scipy import constants
+from scipy.integrate import trapezoid
+from stdatm import AtmosphereSI
+
+from ..aerodynamics.constants import ALPHA_POINT_COUNT
+from ..propulsion.fuel_engine.turboprop_engine.ml_tp_l1 import ML_TP_L1
+from ..propulsion.fuel_engine.turboprop_engine.openmdao import OMMLTPL1Wrapper
+
+# Number of speed steps of each ground roll integration
+SPEED_STEP_COUNT = 20
+
+# Takeoff speeds relative to stall speed
+LIFT_OFF_SPEED_RATIO = 1.1
+V2_SPEED_RATIO = 1.13  # CS 25.107
+
+SCREEN_HEIGHT = 35.0 * constants.foot  # m
+
+# Margin on all engines operative takeoff distance (CS 25.113)
+AEO_DISTANCE_FACTOR = 1.15
+
+# Engine setting of remaining engine after engine failure, rated with k_gb_RTO in ML_TP_L1
+RTO_ENGINE_SETTING = 8
+
+
+def compute_takeoff_distance(
+    engine: ML_TP_L1,
+    engine_count: float,
+    mass: float,
+    wing_area: float,
+    aerodynamics: dict,
+    altitude: float = 0.0,
+    friction_coefficient: float = 0.02,
+    engine_failure_speed_ratio: float = 0.9,
+    rotation_duration: float = 3.0,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Takeoff distances up to screen height, with all engines operative (AEO) and with one
+    engine inoperative (OEI) from engine failure speed.
+
+    Ground roll is integrated in speed, with engine performances of all speed steps computed
+    in one call. Rotation is done at lift-off speed during rotation_duration, and the airborne
+    segment up to V2 and screen height is computed with an energy balance at V2. Engines are at
+    takeoff rating, except the remaining engine after engine failure, which is at RTO rating.
+
+    Engine may have several designs, e.g. several RTO powers, in which case one distance is
+    computed per design.
+
+    :param engine: the engine model
+    :param engine_count: number of engines
+    :param mass: aircraft mass in kg
+    :param wing_area: wing area in m**2
+    :param aerodynamics: dict with takeoff polar ("CL", "CD"), lift coefficient during ground
+                         roll ("CL0"), max lift coefficient ("CL_max"), landing gear drag
+                         ("DCD_gear") and OEI drag ("OEI_DCD") as function of the thrust
+                         coefficient of operative engine ("CT")
+    :param altitude: altitude of runway in m
+    :param friction_coefficient: rolling friction coefficient of runway
+    :param engine_failure_speed_ratio: engine failure speed relative to lift-off speed
+    :param rotation_duration: duration of rotation in s
+    :return: AEO and OEI takeoff distances in m, without the AEO margin
+    :raise ValueError: if thrust does not exceed drag and friction at some speed, in which case
+                       takeoff distance is not defined
+    """
+    weight = mass * constants.g
+    atmosphere = AtmosphereSI(altitude)
+    stall_speed = np.sqrt(2.0 * weight / (atmosphere.density * wing_area * aerodynamics["CL_max"]))
+    lift_off_speed = LIFT_OFF_SPEED_RATIO * stall_speed
+    V2 = V2_SPEED_RATIO * stall_speed
+
+    # Speed steps before and after engine failure, then V2
+    speed_ratios = np.linspace(0.0, 1.0, SPEED_STEP_COUNT + 1)
+    engine_failure_speed = engine_failure_speed_ratio * lift_off_speed
+    speeds = np.concatenate(
+        [
+            speed_ratios * engine_failure_speed,
+            engine_failure_speed + speed_ratios * (lift_off_speed - engine_failure_speed),
+            [V2],
+        ]
+    )
+    before_failure = slice(0, SPEED_STEP_COUNT + 1)
+    after_failure = slice(SPEED_STEP_COUNT + 1, 2 * SPEED_STEP_COUNT + 2)
+    from_failure = slice(SPEED_STEP_COUNT + 1, None)
+
+    # Points at takeoff rating, then points after engine failure at RTO rating
+    engine_speeds = np.concatenate([speeds, speeds[from_failure]])
+    engine_settings = np.concatenate(
+        [
+            np.full(len(speeds), EngineSetting.TAKEOFF.value),
+            np.full(len(speeds[from_failure]), RTO_ENGINE_SETTING),
+        ]
+    )
+    _, _, _, engine_thrust = engine.compute_max_thrust(
+        AtmosphereSI(np.full_like(engine_speeds, altitude)),
+        engine_speeds / atmosphere.speed_of_sound,
+        engine_settings,
+    )
+    thrust = engine_thrust[..., : len(speeds)]
+    OEI_thrust = np.concatenate(
+        [thrust[..., before_failure], engine_thrust[..., len(speeds) :]], axis=-1
+    )
+
+    dynamic_pressure = 0.5 * atmosphere.density * speeds**2
+    CL = np.concatenate(
+        [
+            np.full(2 * SPEED_STEP_COUNT + 2, aerodynamics["CL0"]),
+            weight / (dynamic_pressure[-1:] * wing_area),
+        ]
+    )
+    CD = np.interp(CL, aerodynamics["CL"], aerodynamics["CD"]) + aerodynamics["DCD_gear"]
+    is_on_ground = np.arange(len(speeds)) <= 2 * SPEED_STEP_COUNT + 1
+    lift = dynamic_pressure * wing_area * CL
+
+    # Asymmetric thrust increases drag with one engine inoperative
+    with np.errstate(divide="ignore"):
+        CT = OEI_thrust / (dynamic_pressure * wing_area)
+    OEI_CD = CD + np.interp(CT, aerodynamics["CT"], aerodynamics["OEI_DCD"])
+
+    AEO_force = (
+        engine_count * thrust
+        - dynamic_pressure * wing_area * CD
+        - friction_coefficient * np.maximum(weight - lift, 0.0) * is_on_ground
+    )
+    OEI_force = (
+        (engine_count - 1.0) * OEI_thrust
+        - dynamic_pressure * wing_area * OEI_CD
+        - friction_coefficient * np.maximum(weight - lift, 0.0) * is_on_ground
+    )
+
+    for force, used_points, case in [
+        (AEO_force, slice(None), "all engines operative"),
+        (OEI_force, from_failure, "one engine inoperative"),
+    ]:
+        if np.any(force[..., used_points] <= 0.0):
+            raise ValueError(
+                "Takeoff distance with %s cannot be computed: thrust does not exceed drag and "
+                "friction up to V2." % case
+            )
+
+    def ground_distance(force, speed_slice):
+        # dx = V dV / a, integrated with trapezoidal rule
+        integrand = (mass * speeds / force)[..., speed_slice]
+        return trapezoid(integrand, speeds[speed_slice], axis=-1)
+
+    def airborne_distance(force):
+        return (weight * SCREEN_HEIGHT + 0.5 * mass * (V2**2 - lift_off_speed**2)) / force
+
+    rotation_distance = lift_off_speed * rotation_duration
+
+    AEO_distance = (
+        ground_distance(AEO_force, before_failure)
+        + ground_distance(AEO_force, after_failure)
+        + rotation_distance
+        + airborne_distance(AEO_force[..., -1])
+    )
+    OEI_distance = (
+        ground_distance(AEO_force, before_failure)
+        + ground_distance(OEI_force, after_failure)
+        + rotation_distance
+        + airborne_distance(OEI_force[..., -1])
+    )
+
+    return AEO_distance, OEI_distance
+
+
+@RegisterOpenMDAOSystem("rta.performances.takeoff", domain=ModelDomain.PERFORMANCE)
+class ComputeTakeoffDistance(om.ExplicitComponent):
+    """
+    Takeoff field length, as the max of OEI takeoff distance and 1.15 times AEO takeoff distance,
+    at MTOW.
+
+    Takeoff distance is computed in the same call for RTO power and for RTO power increased and
+    decreased by the "RTO_power_relative_step" option, so its derivative with respect to RTO
+    power comes from a single batched evaluation. This derivative is provided as
+    data:mission:sizing:takeoff:RTO_power_sensitivity, which is used as slope of the RTO power
+    update by "rta.loop.engine_size_implicit", and as partial derivative of takeoff distance.
+    """
+
+    def initialize(self):
+        self.options.declare("friction_coefficient", default=0.02, types=float)
+        self.options.declare(
+            "engine_failure_speed_ratio",
+            default=0.9,
+            types=float,
+            desc="engine failure speed relative to lift-off speed",
+        )
+        self.options.declare("rotation_duration", default=3.0, types=float, desc="in s")
+        self.options.declare("RTO_power_relative_step", default=1.0e-3, types=float)
+
+    def setup(self):
+        self._engine_wrapper = OMMLTPL1Wrapper()
+        self._engine_wrapper.setup(self)
+
+        self.add_input("data:mission:sizing:takeoff:altitude", val=0.0, units="m")
+        self.add_input("data:weight:aircraft:MTOW", val=np.nan, units="kg")
+        self.add_input("data:geometry:wing:area", val=np.nan, units="m**2")
+        self.add_input("data:aerodynamics:aircraft:takeoff:CL", val=np.nan, shape_by_conn=True)
+        self.add_input("data:aerodynamics:aircraft:takeoff:CD", val=np.nan, shape_by_conn=True)
+        self.add_input("data:aerodynamics:aircraft:takeoff:CL0", val=np.nan)
+        self.add_input("data:aerodynamics:aircraft:takeoff:CL_max", val=np.nan)
+        self.add_input(
+            "data:aerodynamics:aircraft:takeoff:lg_effect:DCD", val=np.nan, shape=ALPHA_POINT_COUNT
+        )
+        self.add_input("data:aerodynamics:aircraft:low_speed:CT", val=np.nan, shape_by_conn=True)
+        self.add_input(
+            "data:aerodynamics:aircraft:takeoff:OEI_effect:DCD", val=np.nan, shape_by_conn=True
+        )
+
+        self.add_output("data:mission:sizing:takeoff:distance", units="m")
+        self.add_output("data:mission:sizing:takeoff:AEO_distance", units="m")
+        self.add_output("data:mission:sizing:takeoff:OEI_distance", units="m")
+        self.add_output("data:mission:sizing:takeoff:RTO_power_sensitivity", units="m/W")
+
+        self.declare_partials("*", "*", method="fd")
+        self.declare_partials("data:mission:sizing:takeoff:distance", "data:propulsion:RTO_power")
+
+        # (inputs, RTO power sensitivity) of last call of compute that was not an approximation
+        self._last_sensitivity = None
+
+    def compute(self, inputs, outputs, discrete_inputs=None, discrete_outputs=None):
+        AEO_distance, OEI_distance = self._compute_distances(inputs)
+        distance = np.maximum(AEO_DISTANCE_FACTOR * AEO_distance, OEI_distance)
+        sensitivity = self._get_sensitivity(inputs, distance)
+
+        outputs["data:mission:sizing:takeoff:distance"] = distance[1]
+        outputs["data:mission:sizing:takeoff:AEO_distance"] = AEO_distance[1]
+        outputs["data:mission:sizing:takeoff:OEI_distance"] = OEI_distance[1]
+        outputs["data:mission:sizing:takeoff:RTO_power_sensitivity"] = sensitivity
+
+        # Finite differences of other inputs are run before compute_partials, so they must not
+        # replace the values of the differentiated call.
+        if not self.under_approx:
+            self._last_sensitivity = (inputs.asarray().copy(), sensitivity)
+
+    def compute_partials(self, inputs, partials, discrete_inputs=None):
+        if self._last_sensitivity is not None and np.array_equal(
+            self._last_sensitivity[0], inputs.asarray()
+        ):
+            sensitivity = self._last_sensitivity[1]
+        else:
+            AEO_distance, OEI_distance = self._compute_distances(inputs)
+            sensitivity = self._get_sensitivity(
+                inputs, np.maximum(AEO_DISTANCE_FACTOR * AEO_distance, OEI_distance)
+            )
+
+        partials["data:mission:sizing:takeoff:distance", "data:propulsion:RTO_power"] = sensitivity
+
+    def _get_sensitivity(self, inputs, distance: np.ndarray) -> np.ndarray:
+        """
+        :param distance: takeoff distances for RTO power decreased, unchanged and increased
+        :return: derivative of takeoff distance with respect to RTO power, in m/W
+        """
+        return (distance[2] - distance[0]) / (
+            2.0 * self.options["RTO_power_relative_step"] * inputs["data:propulsion:RTO_power"]
+        )
+
+    def _compute_distances(self, inputs) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        :return: AEO and OEI distances for RTO power decreased, unchanged and increased
+        """
+        engine_parameters = self._engine_wrapper.get_engine_parameters(inputs)
+        engine_parameters["RTO_power"] = engine_parameters["RTO_power"] * (
+            1.0 + self.options["RTO_power_relative_step"] * np.array([-1.0, 0.0, 1.0])
+        )
+        engine_parameters["use_engine_deck"] = False
+        engine_parameters["max_thrust_cache_size"] = 0
+        engine = ML_TP_L1(**engine_parameters)
+
+        aerodynamics = {
+            "CL": inputs["data:aerodynamics:aircraft:takeoff:CL"],
+            "CD": inputs["data:aerodynamics:aircraft:takeoff:CD"],
+            "CL0": inputs["data:aerodynamics:aircraft:takeoff:CL0"][0],
+            "CL_max": inputs["data:aerodynamics:aircraft:takeoff:CL_max"][0],
+            "DCD_gear": np.max(inputs["data:aerodynamics:aircraft:takeoff:lg_effect:DCD"]),
+            "CT": inputs["data:aerodynamics:aircraft:low_speed:CT"],
+            "OEI_DCD": inputs["data:aerodynamics:aircraft:takeoff:OEI_effect:DCD"],
+        }
+
+        return compute_takeoff_distance(
+            engine,
+            inputs["data:geometry:propulsion:engine:count"][0],
+            inputs["data:weight:aircraft:MTOW"][0],
+            inputs["data:geometry:wing:area"][0],
+            aerodynamics,
+            altitude=inputs["data:mission:sizing:takeoff:altitude"][0],
+            friction_coefficient=self.options["friction_coefficient"],
+            engine_failure_speed_ratio=self.options["engine_failure_speed_ratio"],
+            rotation_duration=self.options["rotation_duration"],
+        )
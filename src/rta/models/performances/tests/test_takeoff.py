@@ -0,0 +1,94 @@
+import os.path as pth
+
+import numpy as np
+import pytest
+from fastoad.io import VariableIO
+from fastoad.testing import run_system
+from pytest import approx
+
+from ...propulsion.fuel_engine.turboprop_engine.ml_tp_l1 import ML_TP_L1
+from ...propulsion.fuel_engine.turboprop_engine.openmdao import OMMLTPL1Wrapper
+from ..takeoff import ComputeTakeoffDistance, compute_takeoff_distance
+
+DATA_FOLDER_PATH = pth.join(pth.dirname(__file__), "data")
+
+
+def get_indep_var_comp():
+    return VariableIO(pth.join(DATA_FOLDER_PATH, "takeoff.xml")).read().to_ivc()
+
+
+def test_compute_takeoff_distance():
+    variables = VariableIO(pth.join(DATA_FOLDER_PATH, "takeoff.xml")).read()
+    inputs = {variable.name: np.atleast_1d(variable.value) for variable in variables}
+    inputs["settings:propulsion:engine_deck"] = np.array([0.0])
+    inputs["settings:propulsion:max_thrust_cache_size"] = np.array([0.0])
+    engine_parameters = OMMLTPL1Wrapper.get_engine_parameters(inputs)
+
+    aerodynamics = {
+        "CL": inputs["data:aerodynamics:aircraft:takeoff:CL"],
+        "CD": inputs["data:aerodynamics:aircraft:takeoff:CD"],
+        "CL0": inputs["data:aerodynamics:aircraft:takeoff:CL0"][0],
+        "CL_max": inputs["data:aerodynamics:aircraft:takeoff:CL_max"][0],
+        "DCD_gear": 0.02,
+        "CT": inputs["data:aerodynamics:aircraft:low_speed:CT"],
+        "OEI_DCD": inputs["data:aerodynamics:aircraft:takeoff:OEI_effect:DCD"],
+    }
+    args = (2.0, inputs["data:weight:aircraft:MTOW"][0], inputs["data:geometry:wing:area"][0])
+
+    # A batch of RTO powers gives the same distances as separate calls
+    RTO_powers = np.array([1.8e6, 2.0e6, 2.5e6, 3.0e6])
+    engine_parameters["RTO_power"] = RTO_powers
+    AEO_distances, OEI_distances = compute_takeoff_distance(
+        ML_TP_L1(**engine_parameters), *args, aerodynamics
+    )
+    assert AEO_distances.shape == OEI_distances.shape == (len(RTO_powers),)
+    for RTO_power, AEO_distance, OEI_distance in zip(RTO_powers, AEO_distances, OEI_distances):
+        engine_parameters["RTO_power"] = RTO_power
+        distances = compute_takeoff_distance(ML_TP_L1(**engine_parameters), *args, aerodynamics)
+        assert distances[0] == approx(AEO_distance, rel=1e-12)
+        assert distances[1] == approx(OEI_distance, rel=1e-12)
+
+    # Distances decrease with RTO power, and losing an engine lengthens takeoff
+    assert np.all(np.diff(AEO_distances) < 0.0)
+    assert np.all(np.diff(OEI_distances) < 0.0)
+    assert np.all(OEI_distances > AEO_distances)
+
+    # Remaining engine is at RTO rating after engine failure
+    engine_parameters["RTO_power"] = 2.0e6
+    engine_parameters["k_gb_RTO"] = 0.9 * engine_parameters["k_gb_RTO"]
+    distances = compute_takeoff_distance(ML_TP_L1(**engine_parameters), *args, aerodynamics)
+    assert distances[0] == approx(AEO_distances[1], rel=1e-12)
+    assert distances[1] > OEI_distances[1]
+
+    # Takeoff distance is not defined if thrust is too low
+    engine_parameters["RTO_power"] = 1.5e6
+    with pytest.raises(ValueError, match="one engine inoperative"):
+        compute_takeoff_distance(ML_TP_L1(**engine_parameters), *args, aerodynamics)
+
+
+def test_takeoff_distance_component():
+    problem = run_system(ComputeTakeoffDistance(), get_indep_var_comp())
+
+    assert problem["data:mission:sizing:takeoff:AEO_distance"] == approx(1174.6, abs=0.1)
+    assert problem["data:mission:sizing:takeoff:OEI_distance"] == approx(2343.9, abs=0.1)
+    assert problem["data:mission:sizing:takeoff:distance"] == approx(2343.9, abs=0.1)
+
+    # Derivative with respect to RTO power is computed with the batch of RTO powers
+    RTO_power = problem["data:propulsion:RTO_power"][0]
+    partial = problem.compute_totals(
+        "data:mission:sizing:takeoff:distance", "data:propulsion:RTO_power"
+    )["data:mission:sizing:takeoff:distance", "data:propulsion:RTO_power"]
+
+    distances = []
+    for RTO_power_ratio in [0.99, 1.01]:
+        problem["data:propulsion:RTO_power"] = RTO_power_ratio * RTO_power
+        problem.run_model()
+        distances.append(problem["data:mission:sizing:takeoff:distance"][0])
+    assert partial[0, 0] == approx((distances[1] - distances[0]) / (0.02 * RTO_power), rel=1e-2)
+
+    # Same derivative is provided as output for engine sizing
+    problem["data:propulsion:RTO_power"] = RTO_power
+    problem.run_model()
+    assert problem["data:mission:sizing:takeoff:RTO_power_sensitivity"][0] == approx(
+        partial[0, 0], rel=1e-12
+    )
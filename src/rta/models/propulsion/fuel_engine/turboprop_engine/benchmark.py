@@ -0,0 +1,263 @@
+"""Throughput benchmark of turboprop engine model."""
+#  This file is part of FAST : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2020  ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import argparse
+import json
+import platform
+import timeit
+from datetime import datetime, timezone
+from importlib.metadata import PackageNotFoundError, version
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from fastoad.constants import EngineSetting
+from stdatm import AtmosphereSI
+
+from .ml_tp_l1 import ML_TP_L1
+
+# Usage:
+#   python -m rta.models.propulsion.fuel_engine.turboprop_engine.benchmark -o results.json
+
+#: Numbers of flight points per call
+BATCH_SIZES = (1, 10, 1000, 100000)
+
+#: Engine settings, with the flight envelope (Mach range, altitude range in m) of flight points
+ENGINE_SETTINGS = {
+    "takeoff": (EngineSetting.TAKEOFF, (0.0, 0.2), (0.0, 500.0)),
+    "climb": (EngineSetting.CLIMB, (0.2, 0.45), (0.0, 7000.0)),
+    "cruise": (EngineSetting.CRUISE, (0.4, 0.5), (5000.0, 8000.0)),
+}
+
+#: Thrust modes, as values of thrust_is_regulated
+MODES = {"unregulated": False, "regulated": True}
+
+#: Engine parameters of the reference aircraft
+REFERENCE_ENGINE = {
+    "RTO_power": 2047252.6,
+    "Power_Offtake": 7500.0,
+    "gearbox_eta": 0.99,
+    "d_prop": 3.93,
+    "k_gb_RTO": 1.0,
+    "k_gb_NTO": 0.9,
+    "k_gb_MCL": 0.825,
+    "k_gb_MCR": 0.782,
+    "k_psfc": 0.93,
+    "k_prop": 1.0,
+}
+
+
+def generate_flight_points(
+    engine: ML_TP_L1, batch_size: int, setting_name: str, mode_name: str, seed: int = 0
+) -> pd.DataFrame:
+    """
+    Random flight points in the envelope of an engine setting.
+
+    Unregulated points have a thrust rate between 0.5 and 1. Regulated points use the thrust
+    obtained for these thrust rates.
+
+    :param engine: the benchmarked engine
+    :param batch_size: number of flight points
+    :param setting_name: a key of :data:`ENGINE_SETTINGS`
+    :param mode_name: a key of :data:`MODES`
+    :param seed: seed of the random generator
+    :return: flight points as a DataFrame
+    """
+    engine_setting, mach_range, altitude_range = ENGINE_SETTINGS[setting_name]
+    rng = np.random.default_rng(seed)
+
+    flight_points = pd.DataFrame(
+        {
+            "mach": rng.uniform(*mach_range, batch_size),
+            "altitude": rng.uniform(*altitude_range, batch_size),
+            "isa_offset": rng.uniform(-10.0, 20.0, batch_size),
+            "engine_setting": np.full(batch_size, engine_setting.value),
+            "thrust_is_regulated": np.zeros(batch_size),
+            "thrust_rate": rng.uniform(0.5, 1.0, batch_size),
+            "thrust": np.zeros(batch_size),
+        }
+    )
+    if MODES[mode_name]:
+        engine.compute_flight_points(flight_points)
+        flight_points["thrust_is_regulated"] = 1.0
+
+    return flight_points[
+        [
+            "mach",
+            "altitude",
+            "isa_offset",
+            "engine_setting",
+            "thrust_is_regulated",
+            "thrust_rate",
+            "thrust",
+        ]
+    ].copy()
+
+
+def measure(function, batch_size: int, min_duration: float) -> Dict[str, float]:
+    """
+    :param function: function to time, without argument
+    :param batch_size: number of flight points computed in each call
+    :param min_duration: minimum duration of the measure in seconds
+    :return: time per call in seconds and flight points per second
+    """
+    timer = timeit.Timer(function)
+    number = 1
+    while True:
+        duration = timer.timeit(number)
+        if duration >= min_duration:
+            break
+        number *= 2
+
+    time_per_call = duration / number
+    return {"time_per_call": time_per_call, "points_per_second": batch_size / time_per_call}
+
+
+def run_benchmark(
+    batch_sizes: Sequence[int] = BATCH_SIZES,
+    setting_names: Sequence[str] = tuple(ENGINE_SETTINGS),
+    mode_names: Sequence[str] = tuple(MODES),
+    min_duration: float = 0.2,
+) -> List[dict]:
+    """
+    Measures throughput of :meth:`ML_TP_L1.compute_flight_points` and of the propeller model.
+
+    The propeller model is measured with :meth:`Propeller.power_to_thrust_ADT` at max power
+    for unregulated points and with :meth:`Propeller.thrust_to_power_ADT` for regulated points,
+    as done by the engine.
+
+    :param batch_sizes: numbers of flight points per call
+    :param setting_names: keys of :data:`ENGINE_SETTINGS`
+    :param mode_names: keys of :data:`MODES`
+    :param min_duration: minimum duration of each measure in seconds
+    :return: list of measures
+    """
+    engine = ML_TP_L1(**REFERENCE_ENGINE)
+    propeller = engine.propeller
+
+    results = []
+    for setting_name in setting_names:
+        for mode_name in mode_names:
+            for batch_size in batch_sizes:
+                flight_points = generate_flight_points(engine, batch_size, setting_name, mode_name)
+                mach = flight_points["mach"].to_numpy()
+                atmosphere = AtmosphereSI(
+                    flight_points["altitude"].to_numpy(), flight_points["isa_offset"].to_numpy()
+                )
+                if MODES[mode_name]:
+                    thrust = flight_points["thrust"].to_numpy()
+                    propeller_name = "Propeller.thrust_to_power_ADT"
+
+                    def compute_propeller():
+                        propeller.thrust_to_power_ADT(engine, atmosphere, mach, thrust)
+
+                else:
+                    shaft_power = engine.max_power(
+                        atmosphere, mach, flight_points["engine_setting"].to_numpy()
+                    )[0]
+                    propeller_name = "Propeller.power_to_thrust_ADT"
+
+                    def compute_propeller():
+                        propeller.power_to_thrust_ADT(engine, atmosphere, mach, shaft_power)
+
+                def compute_engine():
+                    # Computed columns are kept, as they are overwritten at each call
+                    engine.compute_flight_points(flight_points)
+
+                for function_name, function in [
+                    ("ML_TP_L1.compute_flight_points", compute_engine),
+                    (propeller_name, compute_propeller),
+                ]:
+                    results.append(
+                        {
+                            "function": function_name,
+                            "engine_setting": setting_name,
+                            "mode": mode_name,
+                            "batch_size": batch_size,
+                            **measure(function, batch_size, min_duration),
+                        }
+                    )
+
+    return results
+
+
+def write_results(results: List[dict], file_path: str):
+    """
+    Writes measures in a JSON file, along with versions and platform information.
+
+    :param results: measures as provided by :func:`run_benchmark`
+    :param file_path: path of the JSON file
+    """
+    try:
+        rta_version = version("RTA")
+    except PackageNotFoundError:
+        rta_version = None
+
+    content = {
+        "date": datetime.now(timezone.utc).isoformat(),
+        "versions": {
+            "RTA": rta_version,
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+        },
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "results": results,
+    }
+
+    with open(file_path, "w") as file:
+        json.dump(content, file, indent=2)
+
+
+def main(args: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "-o", "--output", default="propulsion_benchmark.json", help="path of the JSON result file"
+    )
+    parser.add_argument(
+        "-b",
+        "--batch-sizes",
+        type=int,
+        nargs="+",
+        default=BATCH_SIZES,
+        help="numbers of flight points per call",
+    )
+    parser.add_argument(
+        "-d",
+        "--min-duration",
+        type=float,
+        default=0.2,
+        help="minimum duration of each measure in seconds",
+    )
+    parsed_args = parser.parse_args(args)
+
+    results = run_benchmark(parsed_args.batch_sizes, min_duration=parsed_args.min_duration)
+    write_results(results, parsed_args.output)
+
+    for result in results:
+        print(
+            "%-32s %-8s %-12s %7i points: %12.0f points/s"
+            % (
+                result["function"],
+                result["engine_setting"],
+                result["mode"],
+                result["batch_size"],
+                result["points_per_second"],
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
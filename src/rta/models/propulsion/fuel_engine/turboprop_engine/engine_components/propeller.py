@@ -1,12 +1,121 @@
 from scipy import constants
 import numpy as np
-from stdatm import AtmosphereSI
-from typing import Union, Sequence
+from stdatm import AtmosphereSI, AtmosphereWithPartials
+from typing import Dict, Tuple, Union, Sequence
 
-from scipy.optimize import fsolve
+# Number of Newton iterations used to polish the closed-form momentum theory solution
+NEWTON_ITERATION_COUNT = 2
+
+# True airspeed (in m/s) used for points below it when computing shaft power from thrust,
+# as momentum theory is singular at null speed
+MIN_TRUE_AIRSPEED = 0.1
+
+
+def momentum_theory_thrust(
+    shp_prop: Union[float, Sequence[float]],
+    V_TAS: Union[float, Sequence[float]],
+    rho: Union[float, Sequence[float]],
+    d: Union[float, Sequence[float]],
+) -> np.ndarray:
+    """
+    Thrust of an ideal actuator disk given its shaft power, element-wise.
+
+    Momentum theory gives T * V / P = 2 / (1 + (1 + T / (q * A)) ** 0.5) with q the
+    dynamic pressure and A the disk area. Using u = (1 + T / (q * A)) ** 0.5 - 1, it reduces
+    to the cubic u * (u + 2) ** 2 = 2 * P / (q * A * V), which has a single positive root.
+    The root is obtained with Cardano's formula, then polished by a few Newton iterations
+    as the formula loses accuracy when u is small.
+
+    :param shp_prop: shaft power in hp
+    :param V_TAS: true airspeed in m/s (should be > 0)
+    :param rho: air density in kg/m**3
+    :param d: propeller diameter in m
+    :return: thrust (in N)
+    """
+    V_TAS = np.asarray(V_TAS)
+    q_A = 0.5 * np.asarray(rho) * V_TAS**2 * constants.pi / 4 * np.asarray(d) ** 2
+    k = 2 * np.asarray(shp_prop) * constants.hp / (q_A * V_TAS)
+
+    # Cardano's formula on the depressed cubic in t = u + 4/3
+    half_q = 8.0 / 27.0 + 0.5 * k
+    sqrt_delta = np.sqrt(half_q**2 - 64.0 / 729.0)
+    u = np.cbrt(half_q + sqrt_delta) + np.cbrt(half_q - sqrt_delta) - 4.0 / 3.0
+
+    # u * (u + 2) ** 2 is increasing and convex for u >= 0, so Newton converges monotonically
+    u = np.maximum(u, 0.0)
+    for _ in range(NEWTON_ITERATION_COUNT):
+        u = u - (u * (u + 2) ** 2 - k) / ((u + 2) * (3 * u + 2))
+
+    return q_A * u * (u + 2)
+
+
+def momentum_theory_thrust_partials(
+    shp_prop: Union[float, Sequence[float]],
+    V_TAS: Union[float, Sequence[float]],
+    rho: Union[float, Sequence[float]],
+    d: Union[float, Sequence[float]],
+) -> Tuple[np.ndarray, ...]:
+    """
+    Thrust of an ideal actuator disk and its partial derivatives, element-wise.
+
+    Derivatives are obtained by implicit differentiation of P = T * V * (1 + s) / 2,
+    with s = (1 + T / (q * A)) ** 0.5.
+
+    :param shp_prop: shaft power in hp
+    :param V_TAS: true airspeed in m/s (should be > 0)
+    :param rho: air density in kg/m**3
+    :param d: propeller diameter in m
+    :return: thrust (in N) and its derivatives with respect to shaft power (in N/hp),
+             true airspeed, density and diameter
+    """
+    T = momentum_theory_thrust(shp_prop, V_TAS, rho, d)
+
+    V_TAS = np.asarray(V_TAS)
+    q_A = 0.5 * np.asarray(rho) * V_TAS**2 * constants.pi / 4 * np.asarray(d) ** 2
+    s = np.sqrt(1 + T / q_A)
+
+    # Partial derivatives of the residual P - T * V * (1 + s) / 2. Derivatives with respect
+    # to V, rho and d go partly through q * A, which is proportional to V**2 * rho * d**2.
+    dF_dT = V_TAS * (1 + s) / 2 + T * V_TAS / (4 * s * q_A)
+    dF_dlog_qA = -(T**2) * V_TAS / (4 * s * q_A)
+
+    return (
+        T,
+        constants.hp / dF_dT,
+        -(T * (1 + s) / 2 + 2 * dF_dlog_qA / V_TAS) / dF_dT,
+        -dF_dlog_qA / np.asarray(rho) / dF_dT,
+        -2 * dF_dlog_qA / np.asarray(d) / dF_dT,
+    )
 
 
 class Propeller(object):
+    """
+    Propeller model.
+
+    The computation methods are resolved once from the fidelity given at instantiation, so
+    :meth:`power_to_thrust` and :meth:`thrust_to_power` can be called without any lookup.
+    Their partial derivatives are provided by methods with the same name and the "_partials"
+    suffix, bound as :meth:`power_to_thrust_partials` and :meth:`thrust_to_power_partials`.
+    Propeller instances hold no data about the engine, which is provided at each call.
+    """
+
+    #: Available fidelities, as {name: (power to thrust method name, thrust to power method name)}
+    FIDELITIES = {"ADT": ("power_to_thrust_ADT", "thrust_to_power_ADT")}
+
+    def __init__(self, fidelity: str = "ADT"):
+        if fidelity not in self.FIDELITIES:
+            raise ValueError(
+                "Unknown propeller fidelity %s. Available fidelities are %s."
+                % (fidelity, list(self.FIDELITIES))
+            )
+        self.fidelity = fidelity
+
+        power_to_thrust_name, thrust_to_power_name = self.FIDELITIES[fidelity]
+        self.power_to_thrust = getattr(self, power_to_thrust_name)
+        self.thrust_to_power = getattr(self, thrust_to_power_name)
+        self.power_to_thrust_partials = getattr(self, power_to_thrust_name + "_partials")
+        self.thrust_to_power_partials = getattr(self, thrust_to_power_name + "_partials")
+
     def select(self, function, fidelity, data, atmosphere, mach, P_T):
         func = getattr(self, function + "_" + fidelity)
 
@@ -31,42 +140,91 @@ class Propeller(object):
         a = atmosphere.speed_of_sound
 
         # inputs
-        V_TAS = mach * a  # m/s
         rho = atmosphere.density
-        d = data.d_prop
         k_corr = 0.895
 
-        # evaluate thrust from given power
-        def P_to_T(T_prop, shp_prop, V_TAS, rho, d):
-            return (T_prop * V_TAS / (shp_prop * constants.hp)) - 2 / (
-                1 + (1 + (T_prop / (0.5 * rho * constants.pi / 4 * d**2 * V_TAS**2))) ** 0.5
-            )
+        # Engine parameters are broadcast too, as they may hold several designs
+        mach, shp_prop, a, rho, d, k_prop = np.broadcast_arrays(
+            mach, shp_prop, a, rho, data.d_prop, data.k_prop
+        )
 
-        if mach < 0.2:
-            # Formulation for low speed operation
+        # Formulation for low speed operation is used for mach < 0.2: thrust is interpolated
+        # between static thrust and thrust at mach=0.2. Momentum theory is solved once for all
+        # points, at mach=0.2 for low speed ones.
+        idx_low_speed = mach < 0.2
+        V_TAS = np.where(idx_low_speed, 0.2, mach) * a
+        T_mt = momentum_theory_thrust(shp_prop, V_TAS, rho, d) * k_corr * k_prop
 
-            # static thrust
-            eta = 0.0
-            T_prop_0 = (
-                55000 * shp_prop / (1200 * d / constants.foot) * constants.pound_force
-            )  # Skellett, A. M. National Advisory Committee for Aeronautics, Nineteenth Annual Report. Report n447
+        # static thrust
+        T_prop_0 = (
+            55000 * shp_prop / (1200 * d / constants.foot) * constants.pound_force
+        )  # Skellett, A. M. National Advisory Committee for Aeronautics, Nineteenth Annual Report. Report n447
 
-            # thrust at mach=0.2
-            T_prop_ref = fsolve(P_to_T, 1, args=(shp_prop, 0.2 * a, rho, d))[0]
-            T_prop_ref = T_prop_ref * k_corr * data.k_prop
+        # Interpol while mach is between [0,0.2] (ratio is 1 above)
+        ratio = np.clip(mach / 0.2, 0.0, 1.0)
+        T_prop = T_prop_0 + ratio * (T_mt - T_prop_0)
 
-            # Interpol while mach is between [0,0.2]
-            x = [0, 0.2]
-            y = [float(T_prop_0), float(T_prop_ref)]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            eta = np.where(idx_low_speed, 0.0, T_mt * V_TAS / (shp_prop * constants.hp))
 
-            T_prop = np.interp(float(mach), x, y)
+        return T_prop, eta
 
-        else:
-            T_prop = fsolve(P_to_T, 1, args=(shp_prop, V_TAS, rho, d))[0]
-            T_prop = T_prop * k_corr * data.k_prop
-            eta = T_prop * V_TAS / (shp_prop * constants.hp)  # N
+    def power_to_thrust_ADT_partials(
+        self,
+        data,
+        atmosphere: AtmosphereWithPartials,
+        mach: Union[float, Sequence[float]],
+        shaft_power: Union[float, Sequence[float]],
+    ) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Partial derivatives of :meth:`power_to_thrust_ADT`.
 
-        return T_prop, eta
+        :param shaft_power: shaft_power in W
+        :param atmosphere: Atmosphere instance at intended altitude, in meters
+        :param mach: Mach number(s)
+        :return: thrust (in N) and its derivatives with respect to "shaft_power", "mach",
+                 "altitude", "d_prop" and "k_prop"
+        """
+        shp_prop = shaft_power * data.gearbox_eta / constants.hp  # hp
+        a = atmosphere.speed_of_sound
+        da_dh = atmosphere.partial_speed_of_sound_altitude
+        rho = atmosphere.density
+        drho_dh = atmosphere.partial_density_altitude
+
+        mach, shp_prop, a, da_dh, rho, drho_dh, d, k_prop = np.broadcast_arrays(
+            mach, shp_prop, a, da_dh, rho, drho_dh, data.d_prop, data.k_prop
+        )
+        k = 0.895 * k_prop
+
+        # Same formulation as power_to_thrust_ADT()
+        idx_low_speed = mach < 0.2
+        V_mach = np.where(idx_low_speed, 0.2, mach)
+        T_mt, dTmt_dshp, dTmt_dV, dTmt_drho, dTmt_dd = momentum_theory_thrust_partials(
+            shp_prop, V_mach * a, rho, d
+        )
+        T_ref = k * T_mt
+
+        # static thrust (Skellett)
+        dT0_dshp = 55000 / (1200 * d / constants.foot) * constants.pound_force
+        T_prop_0 = dT0_dshp * shp_prop
+
+        ratio = np.clip(mach / 0.2, 0.0, 1.0)
+        dratio_dmach = np.where(idx_low_speed & (mach > 0.0), 1 / 0.2, 0.0)
+        T_prop = T_prop_0 + ratio * (T_ref - T_prop_0)
+
+        dT_dshp = (1 - ratio) * dT0_dshp + ratio * k * dTmt_dshp
+        dT_dmach = dratio_dmach * (T_ref - T_prop_0) + np.where(idx_low_speed, 0.0, k * dTmt_dV * a)
+        dT_dh = ratio * k * (dTmt_dV * V_mach * da_dh + dTmt_drho * drho_dh)
+        dT_dd = -(1 - ratio) * T_prop_0 / d + ratio * k * dTmt_dd
+        dT_dk_prop = ratio * 0.895 * T_mt
+
+        return T_prop, {
+            "shaft_power": dT_dshp * data.gearbox_eta / constants.hp,
+            "mach": dT_dmach,
+            "altitude": dT_dh,
+            "d_prop": dT_dd,
+            "k_prop": dT_dk_prop,
+        }
 
     def thrust_to_power_ADT(
         self,
@@ -78,24 +236,69 @@ class Propeller(object):
         """
         Computation of propeller shaft power given propeller thrust WITHOUT FR.
 
+        Works element-wise, with a floor of :data:`MIN_TRUE_AIRSPEED` applied to the
+        true airspeed of each point.
 
         :param atmosphere: Atmosphere instance at intended altitude
         :param mach: Mach number(s)
-        :return: thrust (in N)
+        :param thrust: thrust(s) in N
+        :return: shaft power (in W) and propeller efficiency
         """
 
         a = atmosphere.speed_of_sound
-        V_TAS = max(0.1, mach * a)  # m/s
+        V_TAS = np.maximum(MIN_TRUE_AIRSPEED, np.asarray(mach) * a)  # m/s
         rho = atmosphere.density
         d = data.d_prop
         k_corr = 0.895
 
         # evaluate required power from given thrust
+        one_plus_s = 1 + (1 + (thrust / (0.5 * rho * constants.pi / 4 * d**2 * V_TAS**2))) ** 0.5
+        eta = k_corr * data.k_prop * 2 / one_plus_s
 
-        eta = 2 / (1 + (1 + (thrust / (0.5 * rho * constants.pi / 4 * d**2 * V_TAS**2))) ** 0.5)
-        eta = k_corr * data.k_prop * eta
-
-        shp_prop = thrust * V_TAS / eta / constants.hp
-        shaft_power = (shp_prop * constants.hp) / data.gearbox_eta
+        # Same as thrust * V_TAS / eta, without dividing by eta
+        shaft_power = thrust * V_TAS * one_plus_s / (2 * k_corr * data.k_prop * data.gearbox_eta)
 
         return shaft_power, eta
+
+    def thrust_to_power_ADT_partials(
+        self,
+        data,
+        atmosphere: AtmosphereWithPartials,
+        mach: Union[float, Sequence[float]],
+        thrust: Union[float, Sequence],
+    ) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Partial derivatives of :meth:`thrust_to_power_ADT`.
+
+        :param atmosphere: Atmosphere instance at intended altitude, in meters
+        :param mach: Mach number(s)
+        :param thrust: thrust in N
+        :return: shaft power (in W) and its derivatives with respect to "thrust", "mach",
+                 "altitude", "d_prop" and "k_prop"
+        """
+        a = atmosphere.speed_of_sound
+        mach = np.asarray(mach)
+        is_moving = mach * a > MIN_TRUE_AIRSPEED
+        V_TAS = np.maximum(MIN_TRUE_AIRSPEED, mach * a)  # m/s
+        dV_dmach = np.where(is_moving, a, 0.0)
+        dV_dh = np.where(is_moving, mach * atmosphere.partial_speed_of_sound_altitude, 0.0)
+        rho = atmosphere.density
+        d = data.d_prop
+        k = 0.895 * data.k_prop
+
+        # shaft power = c * T * V * (1 + s) with s = (1 + T / (q * A)) ** 0.5
+        c = 1 / (2 * k * data.gearbox_eta)
+        q_A = 0.5 * rho * constants.pi / 4 * d**2 * V_TAS**2
+        s = (1 + thrust / q_A) ** 0.5
+        shaft_power = c * thrust * V_TAS * (1 + s)
+
+        dP_dV = c * (thrust * (1 + s) - thrust**2 / (s * q_A))
+        dP_drho = -c * thrust**2 * V_TAS / (2 * s * q_A * rho)
+
+        return shaft_power, {
+            "thrust": c * V_TAS * (1 + s + thrust / (2 * s * q_A)),
+            "mach": dP_dV * dV_dmach,
+            "altitude": dP_dV * dV_dh + dP_drho * atmosphere.partial_density_altitude,
+            "d_prop": -c * thrust**2 * V_TAS / (s * q_A * d),
+            "k_prop": -shaft_power / data.k_prop,
+        }
@@ -0,0 +1,231 @@
+"""Tabulated performances of turboprop engine."""
+#  This file is part of FAST : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2020  ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import logging
+from collections import OrderedDict
+from typing import Dict, Optional, Sequence, Union
+
+import numpy as np
+from scipy.interpolate import RegularGridInterpolator
+
+# Logger for this module
+_LOGGER = logging.getLogger(__name__)
+
+# Grid of the engine deck
+DECK_ALTITUDE = np.linspace(-500.0, 9500.0, 21)  # m
+DECK_MACH = np.concatenate(([0.0, 0.01, 0.025], np.linspace(0.05, 0.7, 14)))
+DECK_ISA_OFFSET = np.linspace(-30.0, 40.0, 8)  # K
+# Regulated thrust may exceed max thrust, and shaft power is strongly non-linear at low thrust
+DECK_THRUST_RATE = np.concatenate(([0.0, 0.01, 0.025, 0.05], np.linspace(0.1, 1.5, 15)))
+
+
+# Engine setting used to tabulate the performances without rating factor
+DEFAULT_SETTING = 0
+
+# Maximum number of engine decks kept in memory
+ENGINE_DECK_CACHE_SIZE = 4
+
+_ENGINE_DECKS = OrderedDict()
+
+
+def get_engine_deck(engine) -> "EngineDeck":
+    """
+    Provides the engine deck of an engine.
+
+    Decks are cached according to the engine parameters, so a deck is built again only
+    when parameters change.
+
+    :param engine: an :class:`~.ml_tp_l1.ML_TP_L1` instance
+    :return: the matching EngineDeck instance
+    """
+    key = tuple(
+        (name, value if isinstance(value, str) else tuple(np.ravel(value).tolist()))
+        for name, value in engine.parameters.items()
+    )
+
+    if key in _ENGINE_DECKS:
+        _ENGINE_DECKS.move_to_end(key)
+    else:
+        _ENGINE_DECKS[key] = EngineDeck(engine)
+        if len(_ENGINE_DECKS) > ENGINE_DECK_CACHE_SIZE:
+            _ENGINE_DECKS.popitem(last=False)
+
+    return _ENGINE_DECKS[key]
+
+
+def clear_engine_deck_cache():
+    """
+    Removes all engine decks kept in memory by :func:`get_engine_deck`.
+
+    It is called at setup of OpenMDAO wrappers, so decks are not kept from one problem to
+    another.
+    """
+    _ENGINE_DECKS.clear()
+
+
+class EngineDeck:
+    def __init__(self, engine):
+        """
+        Tabulated performances of an engine.
+
+        For each engine rating, max shaft power, max thrust, thermodynamic power and residual
+        thrust are tabulated on a grid of altitude, Mach and ISA offset. Shaft power and psfc
+        are tabulated on the same grid with an additional thrust rate dimension.
+
+        Flight points are then computed by multilinear interpolation (and extrapolation
+        outside of the grid).
+
+        :param engine: an :class:`~.ml_tp_l1.ML_TP_L1` instance, used for building the tables
+        """
+        _LOGGER.debug("Building engine deck.")
+        self.settings = list(engine.RATINGS) + [DEFAULT_SETTING]
+
+        grid_3d = (DECK_ALTITUDE, DECK_MACH, DECK_ISA_OFFSET)
+        grid_4d = grid_3d + (DECK_THRUST_RATE,)
+        shape_3d = tuple(len(axis) for axis in grid_3d)
+        altitude, mach, disa = np.meshgrid(*grid_3d, indexing="ij")
+
+        self._max_tables = {}
+        self._tables = {}
+        for setting in self.settings:
+            phase = np.full(shape_3d, setting)
+
+            # Performances at max power
+            performances = engine.compute_performances(mach, altitude, disa, phase, False, 1.0)
+            max_performances = np.stack(
+                [
+                    np.broadcast_to(performances[name], shape_3d)
+                    for name in [
+                        "thrust",
+                        "TPshaft_power",
+                        "thermo_power",
+                        "TP_residual_thrust",
+                        "psfc",
+                    ]
+                ],
+                axis=-1,
+            )
+
+            # Performances at partial thrust. Thrust is regulated so the propeller model is
+            # inverted even at max thrust, which keeps tables continuous along thrust rate.
+            # (sfc is not tabulated, so the division by zero thrust can be ignored)
+            thrust = DECK_THRUST_RATE * max_performances[..., :1]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                performances = engine.compute_performances(
+                    mach[..., None],
+                    altitude[..., None],
+                    disa[..., None],
+                    phase[..., None],
+                    True,
+                    thrust=thrust,
+                )
+            performances = np.stack(
+                [
+                    np.broadcast_to(performances[name], thrust.shape)
+                    for name in ["TPshaft_power", "psfc"]
+                ],
+                axis=-1,
+            )
+
+            self._max_tables[setting] = RegularGridInterpolator(
+                grid_3d, max_performances, bounds_error=False, fill_value=None
+            )
+            self._tables[setting] = RegularGridInterpolator(
+                grid_4d, performances, bounds_error=False, fill_value=None
+            )
+
+    def compute_performances(
+        self,
+        mach: Union[float, Sequence[float]],
+        altitude: Union[float, Sequence[float]],
+        disa: Union[float, Sequence[float]],
+        phase: Union[int, Sequence],
+        thrust_is_regulated: Optional[Union[float, Sequence]] = None,
+        thrust_rate: Optional[Union[float, Sequence]] = None,
+        thrust: Optional[Union[float, Sequence]] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Same as :meth:`~.ml_tp_l1.ML_TP_L1.compute_performances`, using interpolation.
+        """
+        if thrust_is_regulated is None:
+            thrust_is_regulated = thrust_rate is None
+
+        phase = np.asarray(phase)
+        shape = np.broadcast_shapes(
+            *(
+                np.shape(value)
+                for value in [mach, altitude, disa, phase, thrust_is_regulated, thrust_rate, thrust]
+                if value is not None
+            )
+        )
+
+        def _flat(value):
+            return np.ravel(np.broadcast_to(np.asarray(value, dtype=float), shape))
+
+        mach, altitude, disa = _flat(mach), _flat(altitude), _flat(disa)
+        thrust_is_regulated = np.ravel(
+            np.broadcast_to(np.asarray(np.round(thrust_is_regulated, 0), dtype=bool), shape)
+        )
+        thrust_rate = _flat(np.nan if thrust_rate is None else thrust_rate)
+        thrust = _flat(np.nan if thrust is None else thrust)
+        phase = np.ravel(np.broadcast_to(phase, shape))
+
+        # Points are dispatched on tables according to their engine setting
+        setting_index = np.full(phase.shape, len(self.settings) - 1)
+        for i, setting in enumerate(self.settings[:-1]):
+            setting_index[phase == setting] = i
+
+        max_thrust, max_shaft_power, thermo_power, residual_thrust = np.empty((4,) + phase.shape)
+        shaft_power, psfc, max_psfc = np.empty((3,) + phase.shape)
+        out_thrust_rate = np.empty(phase.shape)
+        for i, setting in enumerate(self.settings):
+            idx = setting_index == i
+            if not np.any(idx):
+                continue
+
+            points = np.column_stack([altitude[idx], mach[idx], disa[idx]])
+            max_performances = self._max_tables[setting](points)
+            max_thrust[idx] = max_performances[:, 0]
+            max_shaft_power[idx] = max_performances[:, 1]
+            thermo_power[idx] = max_performances[:, 2]
+            residual_thrust[idx] = max_performances[:, 3]
+            max_psfc[idx] = max_performances[:, 4]
+
+            out_thrust_rate[idx] = np.where(
+                thrust_is_regulated[idx], thrust[idx] / max_thrust[idx], thrust_rate[idx]
+            )
+            performances = self._tables[setting](np.column_stack([points, out_thrust_rate[idx]]))
+            shaft_power[idx] = performances[:, 0]
+            psfc[idx] = performances[:, 1]
+
+        out_thrust = np.where(thrust_is_regulated, thrust, out_thrust_rate * max_thrust)
+
+        # As in the analytical model, max power is used as is for unregulated points at
+        # full thrust rate
+        is_max_power = np.logical_not(thrust_is_regulated) & (thrust_rate == 1)
+        shaft_power = np.where(is_max_power, max_shaft_power, shaft_power)
+        psfc = np.where(is_max_power, max_psfc, psfc)
+
+        results = {
+            "psfc": psfc,
+            "thrust_rate": out_thrust_rate,
+            "thrust": out_thrust,
+            "TPshaft_power": shaft_power,
+            "TP_power_rate": shaft_power / max_shaft_power,
+            "thermo_power": thermo_power,
+            "TP_residual_thrust": residual_thrust,
+            "sfc": psfc * shaft_power / out_thrust,
+        }
+
+        return {name: np.reshape(value, shape) for name, value in results.items()}
@@ -0,0 +1,139 @@
+"""Memoization of turboprop engine max thrust."""
+#  This file is part of FAST : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2020  ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from collections import OrderedDict, namedtuple
+from typing import Sequence, Tuple, Union
+
+import numpy as np
+from stdatm import AtmosphereSI
+
+#: Statistics of a :class:`MaxThrustCache`, as for functools.lru_cache
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+# Default quantization steps of flight points
+ALTITUDE_STEP = 1.0  # m
+MACH_STEP = 1.0e-4
+ISA_OFFSET_STEP = 0.1  # K
+
+
+class MaxThrustCache:
+    def __init__(
+        self,
+        engine,
+        maxsize: int,
+        altitude_step: float = ALTITUDE_STEP,
+        mach_step: float = MACH_STEP,
+        isa_offset_step: float = ISA_OFFSET_STEP,
+    ):
+        """
+        Memoization of the max thrust envelope of an engine.
+
+        Flight points are quantized according to provided steps, and max performances are
+        computed for the quantized flight points, so results do not depend on the order of
+        calls. Values are kept for at most maxsize flight points, the least recently used
+        ones being discarded first.
+
+        As the cache belongs to the engine instance, engine parameters are part of the key
+        as long as they are not modified after instantiation.
+
+        :param engine: an :class:`~.ml_tp_l1.ML_TP_L1` instance
+        :param maxsize: maximum number of memoized flight points
+        :param altitude_step: quantization step of altitude in m
+        :param mach_step: quantization step of Mach number
+        :param isa_offset_step: quantization step of ISA temperature offset in K
+        """
+        self.engine = engine
+        self.maxsize = maxsize
+        self.steps = np.array([altitude_step, mach_step, isa_offset_step])
+
+        self._values = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def __call__(
+        self,
+        mach: Union[float, Sequence[float]],
+        altitude: Union[float, Sequence[float]],
+        disa: Union[float, Sequence[float]],
+        phase: Union[int, Sequence],
+    ) -> Tuple[np.ndarray, ...]:
+        """
+        Same as :meth:`~.ml_tp_l1.ML_TP_L1.compute_max_thrust`, for quantized flight points.
+
+        :param mach: Mach number(s)
+        :param altitude: altitude(s) in m
+        :param disa: temperature offset(s) from ISA in K
+        :param phase: engine setting(s)
+        :return: max shaft power (W), max thermodynamic power (W), residual thrust (N) and
+                 max thrust (N)
+        """
+        shape = np.broadcast_shapes(
+            np.shape(mach), np.shape(altitude), np.shape(disa), np.shape(phase)
+        )
+        # Unknown engine settings share the same key, as they share the same rating
+        setting = self.engine._get_setting_index(phase, max(self.engine.RATINGS) + 1)
+        quantized_points = np.column_stack(
+            [
+                np.ravel(np.broadcast_to(np.round(np.asarray(value, dtype=float) / step), shape))
+                for value, step in zip([altitude, mach, disa], self.steps)
+            ]
+            + [np.ravel(np.broadcast_to(setting, shape))]
+        )
+
+        values = np.empty((len(quantized_points), 4))
+        missing_keys = OrderedDict()
+        for i, key in enumerate(map(tuple, quantized_points.tolist())):
+            if key in self._values:
+                self._values.move_to_end(key)
+                values[i] = self._values[key]
+                self._hits += 1
+            elif key in missing_keys:
+                # Same quantized point as a previous one of the batch
+                missing_keys[key].append(i)
+                self._hits += 1
+            else:
+                missing_keys[key] = [i]
+                self._misses += 1
+
+        if missing_keys:
+            points = np.array(list(missing_keys))
+            altitude, mach, disa = (points[:, :3] * self.steps).T
+            computed_values = np.column_stack(
+                np.broadcast_arrays(
+                    *self.engine.compute_max_thrust(
+                        AtmosphereSI(altitude, disa), mach, points[:, 3].astype(int)
+                    )
+                )
+            )
+            for (key, indices), computed_value in zip(missing_keys.items(), computed_values):
+                values[indices] = computed_value
+                self._values[key] = computed_value
+
+            while len(self._values) > self.maxsize:
+                self._values.popitem(last=False)
+
+        return tuple(np.reshape(values[:, j], shape) for j in range(values.shape[1]))
+
+    def cache_info(self) -> CacheInfo:
+        """
+        :return: numbers of flight points found in cache (hits) and computed (misses),
+                 max size and current size of the cache
+        """
+        return CacheInfo(self._hits, self._misses, self.maxsize, len(self._values))
+
+    def cache_clear(self):
+        """Clears the cache and its statistics."""
+        self._values.clear()
+        self._hits = 0
+        self._misses = 0
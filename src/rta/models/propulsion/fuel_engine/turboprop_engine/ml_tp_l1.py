@@ -14,23 +14,122 @@
 
 from scipy import constants
 import logging
-from typing import Union, Sequence, Tuple, Optional
+from typing import Dict, Union, Sequence, Tuple, Optional
 import numpy as np
+from numpy.polynomial.polynomial import polyder
 from fastoad.constants import FlightPhase
 from fastoad_cs25.models.propulsion.fuel_propulsion.rubber_engine.exceptions import (
     FastRubberEngineInconsistentInputParametersError,
 )
-from stdatm import AtmosphereSI
+from stdatm import AtmosphereSI, AtmosphereWithPartials
 import pandas as pd
 from fastoad.model_base.flight_point import FlightPoint
 from .base import AbstractFuelPropulsion
+from .engine_deck import get_engine_deck
+from .max_thrust_cache import MaxThrustCache
 from .engine_components.propeller import Propeller
 
 # Logger for this module
 _LOGGER = logging.getLogger(__name__)
 
+#: Max degree of altitude and Mach in surrogate models
+SURROGATE_DEGREE = 3
+
+
+def _coefficient_tensor(terms: Dict[tuple, float], shape: tuple) -> np.ndarray:
+    """
+    :param terms: polynomial coefficients, keyed by the powers of each variable
+    :param shape: shape of the tensor (max power + 1 for each variable)
+    :return: tensor of polynomial coefficients, indexed by powers of each variable
+    """
+    coefficients = np.zeros(shape)
+    for powers, value in terms.items():
+        coefficients[powers] = value
+    return coefficients
+
 
 class ML_TP_L1(AbstractFuelPropulsion):
+    #: Gearbox rating factor associated to each engine setting value. Other engine settings
+    #: use the RTO power without rating factor.
+    RATINGS = {
+        1: "k_gb_NTO",  # 'TO'
+        2: "k_gb_MCL",  # 'MCL'
+        3: "k_gb_MCR",  # 'CRZ'
+        8: "k_gb_RTO",  # 'RTO'
+    }
+
+    #: Numerical parameters of the engine, which may hold several designs
+    DESIGN_PARAMETERS = (
+        "RTO_power",
+        "Power_Offtake",
+        "gearbox_eta",
+        "d_prop",
+        "k_gb_RTO",
+        "k_gb_NTO",
+        "k_gb_MCL",
+        "k_gb_MCR",
+        "k_psfc",
+        "k_prop",
+    )
+
+    #: Flight point fields and engine parameters for which :meth:`compute_partials` provides
+    #: derivatives
+    PARTIALS_WRT = (
+        "mach",
+        "altitude",
+        "thrust_rate",
+        "thrust",
+        "RTO_power",
+        "d_prop",
+        "k_psfc",
+        "k_prop",
+    )
+
+    #: Coefficients of the psfc surrogate, indexed by powers of altitude (ft), Mach
+    #: and power rate
+    PSFC_COEFFICIENTS = _coefficient_tensor(
+        {
+            (0, 0, 0): 0.9533,
+            (1, 0, 0): -1.4739e-5,
+            (0, 1, 0): -1.285e-1,
+            (0, 0, 1): -2.257,
+            (2, 0, 0): 1.887e-10,
+            (1, 1, 0): -4.882e-8,
+            (1, 0, 1): 2.685e-5,
+            (0, 2, 0): -2.707e-1,
+            (0, 1, 1): 4.479e-1,
+            (0, 0, 2): 2.511,
+            (3, 0, 0): -2.497e-15,
+            (2, 1, 0): 1.132e-10,
+            (2, 0, 1): -9.598e-11,
+            (1, 2, 0): -1.182e-6,
+            (1, 1, 1): -3.861e-6,
+            (1, 0, 2): -1.471e-5,
+            (0, 3, 0): 6.02e-2,
+            (0, 2, 1): 2.522e-1,
+            (0, 1, 3): -3.248e-1,
+            (0, 0, 3): -9.402e-1,
+        },
+        (SURROGATE_DEGREE + 1,) * 3,
+    )
+
+    #: Coefficients of the power lapse surrogate, indexed by powers of altitude (ft) and Mach
+    POWER_LAPSE_COEFFICIENTS = _coefficient_tensor(
+        {
+            (0, 0): 1.015,
+            (1, 0): -2.806e-6,
+            (0, 1): -8.498e-2,
+            (2, 0): -8.928e-10,
+            (1, 1): 2.253e-5,
+            (0, 2): 1.943e-1,
+            (3, 0): 1.914e-14,
+            (2, 1): -8.816e-10,
+            (1, 2): 1.919e-5,
+            (0, 3): -3.257e-1,
+        },
+        (SURROGATE_DEGREE + 1,) * 2,
+    )
+
     def __init__(
         self,
         RTO_power: float,
@@ -43,6 +142,9 @@ class ML_TP_L1(AbstractFuelPropulsion):
         k_gb_MCR: float,
         k_psfc: float,
         k_prop: float,
+        prop_fidelity: str = "ADT",
+        use_engine_deck: bool = False,
+        max_thrust_cache_size: int = 0,
     ):
         """
         Parametric turboprop engine.
@@ -57,6 +159,19 @@ class ML_TP_L1(AbstractFuelPropulsion):
         O. Majeed, ‘Parametric specific fuel consumtption analysis of the PW120A Turboprop engine’,
         Specific Range Solutions Ltd., Technical Report SRS-TSD-002 rev 1, Jul. 2009.
 
+        Numerical parameters may be arrays for evaluating several engine designs at once.
+        In such case, they are stored as column vectors, so that results of
+        :meth:`compute_performances` and :meth:`compute_partials` for 1D arrays of flight
+        points are shaped as (designs x points).
+
+        :param prop_fidelity: fidelity of the propeller model (see :attr:`Propeller.FIDELITIES`)
+        :param use_engine_deck: if True, flight points are computed by interpolation in an
+                                :class:`~.engine_deck.EngineDeck` built from this engine
+                                (not available for several designs)
+        :param max_thrust_cache_size: if not 0, max performances of the analytical model are
+                                      memoized for this number of flight points (see
+                                      :class:`~.max_thrust_cache.MaxThrustCache`, not
+                                      available for several designs)
 
         """
 
@@ -73,114 +188,341 @@ class ML_TP_L1(AbstractFuelPropulsion):
         self.k_psfc = k_psfc
         self.k_prop = k_prop
 
+        design_shape = np.broadcast_shapes(
+            *(np.shape(getattr(self, name)) for name in self.DESIGN_PARAMETERS)
+        )
+        self.design_count = int(np.prod(design_shape))
+        if self.design_count > 1:
+            if use_engine_deck or max_thrust_cache_size:
+                raise ValueError(
+                    "Engine deck and max thrust cache cannot be used for several engine designs."
+                )
+            for name in self.DESIGN_PARAMETERS:
+                value = getattr(self, name)
+                if np.size(value) > 1:
+                    setattr(self, name, np.reshape(value, (-1, 1)))
+
+        self.prop_fidelity = prop_fidelity
+        self.propeller = Propeller(prop_fidelity)
+
+        # Engine deck is built without max thrust cache, as its points are not revisited
+        self.max_thrust_cache = None
+        self.engine_deck = get_engine_deck(self) if use_engine_deck else None
+
+        if max_thrust_cache_size:
+            self.max_thrust_cache = MaxThrustCache(self, max_thrust_cache_size)
+
+    @property
+    def parameters(self) -> dict:
+        """Parameters that define the engine, with same names as instantiation arguments."""
+        parameters = {name: getattr(self, name) for name in self.DESIGN_PARAMETERS}
+        parameters["prop_fidelity"] = self.prop_fidelity
+        return parameters
+
     def compute_flight_points(self, flight_points: Union[FlightPoint, pd.DataFrame]):
         """
         Same as :meth:`compute_flight_points`
+
+        Works element-wise: flight_points may be a single FlightPoint or a DataFrame
+        where regulated and unregulated points, thrust rates and engine settings are mixed.
+        For several engine designs, results would not fit in a DataFrame, so
+        :meth:`compute_performances` should be used instead.
         """
 
-        Prop_fid = "ADT"
-        mach = np.asarray(flight_points.mach)
-        altitude = np.asarray(flight_points.altitude)
-        disa = np.asarray(flight_points.isa_offset)
-        thrust_rate = np.asarray(flight_points.thrust_rate)
-        thrust = np.asarray(flight_points.thrust)
-        phase = flight_points.engine_setting
-        thrust_is_regulated = flight_points.thrust_is_regulated
-        atmosphere = AtmosphereSI(altitude, delta_t=disa)
+        if self.engine_deck is None:
+            model = self
+        else:
+            model = self.engine_deck
+
+        performances = model.compute_performances(
+            flight_points.mach,
+            flight_points.altitude,
+            flight_points.isa_offset,
+            flight_points.engine_setting,
+            flight_points.thrust_is_regulated,
+            flight_points.thrust_rate,
+            flight_points.thrust,
+        )
 
-        if thrust_is_regulated is not None:
-            thrust_is_regulated = np.asarray(np.round(thrust_is_regulated, 0), dtype=bool)
+        # Setting a missing column as attribute of a DataFrame raises a warning, so
+        # needed fields are added before setting values
+        if isinstance(flight_points, pd.DataFrame):
+            new_column_names = flight_points.columns.tolist()
+            for name in performances:
+                if name not in new_column_names:
+                    flight_points.insert(len(flight_points.columns), name, value=np.nan)
+
+        for name, value in performances.items():
+            setattr(flight_points, name, value)
+
+    def compute_performances(
+        self,
+        mach: Union[float, Sequence[float]],
+        altitude: Union[float, Sequence[float]],
+        disa: Union[float, Sequence[float]],
+        phase: Union[FlightPhase, Sequence],
+        thrust_is_regulated: Optional[Union[float, Sequence]] = None,
+        thrust_rate: Optional[Union[float, Sequence]] = None,
+        thrust: Optional[Union[float, Sequence]] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Computes engine performances element-wise with the analytical model.
+
+        :param mach: Mach number(s)
+        :param altitude: altitude(s) in m
+        :param disa: temperature offset(s) from ISA in K
+        :param phase: engine setting(s)
+        :param thrust_is_regulated: tells if thrust_rate or thrust should be used
+        :param thrust_rate: thrust rate(s)
+        :param thrust: thrust(s) in N
+        :return: dict of computed FlightPoint fields
+        """
+        mach = np.asarray(mach)
+        atmosphere = AtmosphereSI(np.asarray(altitude), delta_t=np.asarray(disa))
 
         thrust_is_regulated, thrust_rate, thrust = self._check_thrust_inputs(
             thrust_is_regulated, thrust_rate, thrust
         )
         thrust_is_regulated = np.asarray(np.round(thrust_is_regulated, 0), dtype=bool)
-        max_shaft_power, max_thermo_power, gearbox_limit_power = self.max_power(
-            atmosphere, mach, phase
-        )
-
-        T_prop, eta = Propeller().select(
-            "power_to_thrust", Prop_fid, self, atmosphere, mach, max_shaft_power
-        )
-        FR = self.compute_engine_point(mach, T_prop=T_prop)
-
-        max_thrust = T_prop + FR
-
-        if not thrust_is_regulated:
-            if thrust_rate == 1:
-                power_rate = 1
-                shaft_power = max_shaft_power
-                thrust = thrust_rate * max_thrust
-            else:
-                thrust = thrust_rate * max_thrust
-                shaft_power, eta = Propeller().select(
-                    "thrust_to_power", Prop_fid, self, atmosphere, mach, thrust
-                )
 
-                power_rate = shaft_power / max_shaft_power
-        else:
-            power_rate = thrust_rate
-            shaft_power, eta = Propeller().select(
-                "thrust_to_power", Prop_fid, self, atmosphere, mach, thrust
-            )
-
-        thrust_rate = np.asarray(thrust_rate)
-        thrust = np.asarray(thrust)
-
-        shaft_power = np.asarray(shaft_power)
-        power_rate = np.asarray(power_rate)
-
-        # We compute thrust values from thrust rates when needed
-        idx = np.logical_not(thrust_is_regulated)
-        if np.size(max_thrust) == 1:  # se scalare
-            maximum_thrust = max_thrust
-            maximum_shaft_power = max_shaft_power
-            out_thrust_rate = thrust_rate
-            out_thrust = thrust
-            out_power_rate = power_rate
-            out_power = shaft_power
-        else:  # se vettore
-            out_thrust_rate = (
-                np.full(np.shape(max_thrust), thrust_rate.item())
-                if np.size(thrust_rate) == 1
-                else thrust_rate
-            )
-            out_power_rate = (
-                np.full(np.shape(max_shaft_power), power_rate.item())
-                if np.size(power_rate) == 1
-                else power_rate
+        altitude_mach_basis = self.altitude_mach_basis(atmosphere, mach)
+        if self.max_thrust_cache is None:
+            max_shaft_power, max_thermo_power, FR, max_thrust = self.compute_max_thrust(
+                atmosphere, mach, phase, altitude_mach_basis
             )
-            out_thrust = (
-                np.full(np.shape(max_thrust), thrust.item()) if np.size(thrust) == 1 else thrust
-            )
-            out_power = (
-                np.full(np.shape(max_shaft_power), shaft_power.item())
-                if np.size(shaft_power) == 1
-                else shaft_power
+        else:
+            max_shaft_power, max_thermo_power, FR, max_thrust = self.max_thrust_cache(
+                mach, altitude, disa, phase
             )
 
-            maximum_thrust = max_thrust[idx]
-            maximum_shaft_power = max_shaft_power[idx]
+        # Regulated points keep the provided thrust, the other ones get it from the thrust rate.
+        # At full thrust rate, the max shaft power is used as is, otherwise the propeller
+        # is inverted to get the shaft power required for the thrust.
+        with np.errstate(invalid="ignore", over="ignore"):
+            out_thrust = np.where(thrust_is_regulated, thrust, thrust_rate * max_thrust)
+        is_max_power = np.logical_not(thrust_is_regulated) & (thrust_rate == 1)
 
-        out_thrust[idx] = out_thrust_rate[idx] * maximum_thrust
-        out_power[idx] = out_power_rate[idx] * maximum_shaft_power
+        shaft_power, eta = self.propeller.thrust_to_power(self, atmosphere, mach, out_thrust)
+        out_power = np.where(is_max_power, max_shaft_power, shaft_power)
 
         out_thrust_rate = out_thrust / max_thrust
         out_power_rate = out_power / max_shaft_power
 
         # Now SFC can be computed
-        psfc = self.psfc(atmosphere, mach, out_power_rate, phase) * self.k_psfc  # kg/hp/hr
+        psfc = (
+            self.psfc(atmosphere, mach, out_power_rate, phase, altitude_mach_basis) * self.k_psfc
+        )  # kg/hp/hr
         ff = psfc / constants.hour * out_power / constants.hp  # Kg/s
         tsfc = ff / out_thrust
 
-        flight_points.psfc = psfc / constants.hour / constants.hp
-        flight_points.thrust_rate = out_thrust_rate
-        flight_points.thrust = out_thrust
-        flight_points.TPshaft_power = out_power
-        flight_points.TP_power_rate = out_power_rate
-        flight_points.thermo_power = max_thermo_power
-        flight_points.TP_residual_thrust = FR
-        flight_points.sfc = tsfc
+        return {
+            "psfc": psfc / constants.hour / constants.hp,
+            "thrust_rate": out_thrust_rate,
+            "thrust": out_thrust,
+            "TPshaft_power": out_power,
+            "TP_power_rate": out_power_rate,
+            "thermo_power": max_thermo_power,
+            "TP_residual_thrust": FR,
+            "sfc": tsfc,
+        }
+
+    def compute_max_thrust(
+        self,
+        atmosphere: AtmosphereSI,
+        mach: Union[float, Sequence[float]],
+        phase: Union[FlightPhase, Sequence],
+        altitude_mach_basis: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Computes max performances of the engine for given engine setting(s).
+
+        :param atmosphere: Atmosphere instance at intended altitude
+        :param mach: Mach number(s)
+        :param phase: engine setting(s)
+        :param altitude_mach_basis: monomials of altitude and Mach, as provided by
+                                    :meth:`altitude_mach_basis` (computed if not provided)
+        :return: max shaft power (W), max thermodynamic power (W), residual thrust (N) and
+                 max thrust (N)
+        """
+        max_shaft_power, max_thermo_power, _ = self.max_power(
+            atmosphere, mach, phase, altitude_mach_basis
+        )
+
+        T_prop, _ = self.propeller.power_to_thrust(self, atmosphere, mach, max_shaft_power)
+        FR = self.compute_engine_point(mach, T_prop=T_prop)
+
+        return max_shaft_power, max_thermo_power, FR, T_prop + FR
+
+    def compute_partials(
+        self,
+        mach: Union[float, Sequence[float]],
+        altitude: Union[float, Sequence[float]],
+        disa: Union[float, Sequence[float]],
+        phase: Union[FlightPhase, Sequence],
+        thrust_is_regulated: Optional[Union[float, Sequence]] = None,
+        thrust_rate: Optional[Union[float, Sequence]] = None,
+        thrust: Optional[Union[float, Sequence]] = None,
+    ) -> Dict[Tuple[str, str], np.ndarray]:
+        """
+        Computes partial derivatives of engine performances element-wise with the analytical
+        model (even if an engine deck is used for computing flight points).
+
+        Derivatives of "thrust", "TPshaft_power", "psfc" and "fuel_flow" (in kg/s) are
+        provided with respect to the flight point fields and engine parameters listed in
+        :attr:`PARTIALS_WRT`. As in :meth:`compute_performances`, the max shaft power is used
+        for unregulated points at full thrust rate, so are its derivatives.
+
+        Parameters are the same as :meth:`compute_performances`.
+
+        :return: dict of partial derivatives, keyed by (output name, input name)
+        """
+        mach = np.asarray(mach, dtype=float)
+        atmosphere = AtmosphereWithPartials(
+            np.asarray(altitude), delta_t=np.asarray(disa), altitude_in_feet=False
+        )
+
+        thrust_is_regulated, thrust_rate, thrust = self._check_thrust_inputs(
+            thrust_is_regulated, thrust_rate, thrust
+        )
+        thrust_is_regulated = np.asarray(np.round(thrust_is_regulated, 0), dtype=bool)
+
+        shape = np.broadcast_shapes(
+            mach.shape,
+            np.shape(altitude),
+            np.shape(disa),
+            np.shape(phase),
+            thrust_is_regulated.shape,
+            thrust_rate.shape,
+            thrust.shape,
+            *(np.shape(getattr(self, name)) for name in self.DESIGN_PARAMETERS),
+        )
+
+        def gradient(**partials):
+            # Partial derivatives stacked along first axis, in the order of PARTIALS_WRT
+            grad = np.zeros((len(self.PARTIALS_WRT),) + shape)
+            for name, value in partials.items():
+                grad[self.PARTIALS_WRT.index(name)] = value
+            return grad
+
+        # Max power (see max_power()). Polynomial derivatives are evaluated with the
+        # monomials of altitude (in ft) and Mach.
+        altitude_mach_basis = self.altitude_mach_basis(atmosphere, mach)
+        k_gb = self._get_k_gb(phase)
+        max_power_rating = k_gb * self.RTO_power / constants.hp
+        grad_max_power_rating = gradient(RTO_power=k_gb / constants.hp)
+
+        K_powerlapse = self._evaluate_surrogate(self.POWER_LAPSE_COEFFICIENTS, altitude_mach_basis)
+        dK_dmach = self._evaluate_surrogate(
+            self._derivative_coefficients(self.POWER_LAPSE_COEFFICIENTS, 1), altitude_mach_basis
+        )
+        dK_dh = (
+            self._evaluate_surrogate(
+                self._derivative_coefficients(self.POWER_LAPSE_COEFFICIENTS, 0),
+                altitude_mach_basis,
+            )
+            / constants.foot
+        )
+
+        temperature = atmosphere.temperature
+        std_temperature = temperature - atmosphere.delta_t
+        k_isa = ((std_temperature / temperature) ** 0.7) ** 0.7
+        dk_isa_dh = (
+            0.49
+            * k_isa
+            * atmosphere.partial_temperature_altitude
+            * (1 / std_temperature - 1 / temperature)
+        )
+
+        max_thermo_power = max_power_rating * K_powerlapse * k_isa
+        grad_max_thermo_power = K_powerlapse * k_isa * grad_max_power_rating + gradient(
+            mach=max_power_rating * k_isa * dK_dmach,
+            altitude=max_power_rating * (k_isa * dK_dh + K_powerlapse * dk_isa_dh),
+        )
+
+        is_gearbox_limited = max_thermo_power >= max_power_rating
+        max_shaft_power = np.minimum(max_thermo_power, max_power_rating) * constants.hp
+        grad_max_shaft_power = (
+            np.where(is_gearbox_limited, grad_max_power_rating, grad_max_thermo_power)
+            * constants.hp
+        )
+
+        # Max thrust, including residual thrust (see compute_engine_point())
+        T_prop, dT_prop = self.propeller.power_to_thrust_partials(
+            self, atmosphere, mach, max_shaft_power
+        )
+        grad_T_prop = dT_prop["shaft_power"] * grad_max_shaft_power + gradient(
+            mach=dT_prop["mach"],
+            altitude=dT_prop["altitude"],
+            d_prop=dT_prop["d_prop"],
+            k_prop=dT_prop["k_prop"],
+        )
+        ratio = np.interp(mach, [0, 0.5], [0.02, 0.06])
+        dratio_dmach = np.where((mach > 0.0) & (mach < 0.5), 0.08, 0.0)
+        max_thrust = T_prop / (1 - ratio)
+        grad_max_thrust = grad_T_prop / (1 - ratio) + gradient(
+            mach=T_prop * dratio_dmach / (1 - ratio) ** 2
+        )
+
+        with np.errstate(invalid="ignore", over="ignore", divide="ignore"):
+            out_thrust = np.where(thrust_is_regulated, thrust, thrust_rate * max_thrust)
+            grad_thrust = np.where(
+                thrust_is_regulated,
+                gradient(thrust=1.0),
+                thrust_rate * grad_max_thrust + gradient(thrust_rate=max_thrust),
+            )
+
+            shaft_power, dP = self.propeller.thrust_to_power_partials(
+                self, atmosphere, mach, out_thrust
+            )
+            grad_shaft_power = dP["thrust"] * grad_thrust + gradient(
+                mach=dP["mach"],
+                altitude=dP["altitude"],
+                d_prop=dP["d_prop"],
+                k_prop=dP["k_prop"],
+            )
+
+        is_max_power = np.logical_not(thrust_is_regulated) & (thrust_rate == 1)
+        shaft_power = np.where(is_max_power, max_shaft_power, shaft_power)
+        grad_shaft_power = np.where(is_max_power, grad_max_shaft_power, grad_shaft_power)
+
+        # psfc (see psfc())
+        power_rate = shaft_power / max_shaft_power
+        grad_power_rate = (grad_shaft_power - power_rate * grad_max_shaft_power) / max_shaft_power
+        is_takeoff = np.asarray(phase, dtype=float) == 1
+        power_rate = np.where(is_takeoff, 1.0, power_rate)
+        grad_power_rate = np.where(is_takeoff, 0.0, grad_power_rate)
+
+        psfc_ratio, dpsfc_dh, dpsfc_dmach, dpsfc_dpower_rate = (
+            self._evaluate_surrogate(coefficients, altitude_mach_basis, power_rate)
+            for coefficients in [
+                self.PSFC_COEFFICIENTS,
+                self._derivative_coefficients(self.PSFC_COEFFICIENTS, 0) / constants.foot,
+                self._derivative_coefficients(self.PSFC_COEFFICIENTS, 1),
+                self._derivative_coefficients(self.PSFC_COEFFICIENTS, 2),
+            ]
+        )
+        grad_psfc_ratio = dpsfc_dpower_rate * grad_power_rate + gradient(
+            mach=dpsfc_dmach, altitude=dpsfc_dh
+        )
+
+        psfc_unit = 1 / constants.hour / constants.hp  # kg/hp/hr to kg/W/s
+        psfc = psfc_ratio * self.k_psfc * psfc_unit
+        grad_psfc = self.k_psfc * psfc_unit * grad_psfc_ratio + gradient(
+            k_psfc=psfc_ratio * psfc_unit
+        )
+        grad_fuel_flow = shaft_power * grad_psfc + psfc * grad_shaft_power
+
+        gradients = {
+            "thrust": grad_thrust,
+            "TPshaft_power": grad_shaft_power,
+            "psfc": grad_psfc,
+            "fuel_flow": grad_fuel_flow,
+        }
+        return {
+            (output_name, input_name): grad[i]
+            for output_name, grad in gradients.items()
+            for i, input_name in enumerate(self.PARTIALS_WRT)
+        }
 
     @staticmethod
     def _check_thrust_inputs(
@@ -263,69 +605,31 @@ class ML_TP_L1(AbstractFuelPropulsion):
         mach: Union[float, Sequence[float]],
         power_rate: Union[float, Sequence[float]],
         phase: Union[FlightPhase, Sequence],
+        altitude_mach_basis: Optional[np.ndarray] = None,
     ) -> np.ndarray:
         """
         :param atmosphere: Atmosphere instance at intended altitude (should be <=20km)
         :param mach: Mach number(s) (should be between 0.05 and 1.0)
         :param phase: Flight phase which influences engine rating (max mechanical power)
         :param power_rate: The power rate [0,1.0]
+        :param altitude_mach_basis: monomials of altitude and Mach, as provided by
+                                    :meth:`altitude_mach_basis` (computed if not provided)
         :return: SFC ratio
         """
-        altitude = atmosphere.get_altitude(altitude_in_feet=True)
-        if phase == 1:
-            power_rate = 1.0
-
-        c0 = 0.9533
-        c1 = -1.4739e-5
-        c2 = -1.285e-1
-        c3 = -2.257
-        c4 = 1.887e-10
-        c5 = -4.882e-8
-        c6 = 2.685e-5
-        c7 = -2.707e-1
-        c8 = 4.479e-1
-        c9 = 2.511
-        c10 = -2.497e-15
-        c11 = 1.132e-10
-        c12 = -9.598e-11
-        c13 = -1.182e-6
-        c14 = -3.861e-6
-        c15 = -1.471e-5
-        c16 = 6.02e-2
-        c17 = 2.522e-1
-        c18 = -3.248e-1
-        c19 = -9.402e-1
+        if altitude_mach_basis is None:
+            altitude_mach_basis = self.altitude_mach_basis(atmosphere, mach)
 
-        psfc = (
-            c0
-            + c1 * altitude
-            + c2 * mach
-            + c3 * power_rate
-            + c4 * altitude**2
-            + c5 * altitude * mach
-            + c6 * altitude * power_rate
-            + c7 * mach**2
-            + c8 * mach * power_rate
-            + c9 * power_rate**2
-            + c10 * altitude**3
-            + c11 * altitude**2 * mach
-            + c12 * altitude**2 * power_rate
-            + c13 * altitude * mach**2
-            + c14 * altitude * mach * power_rate
-            + c15 * altitude * power_rate**2
-            + c16 * mach**3
-            + c17 * mach**2 * power_rate
-            + c18 * mach * power_rate**3
-            + c19 * power_rate**3
-        )
+        # Takeoff points are evaluated at full power
+        power_rate = np.where(np.asarray(phase, dtype=float) == 1, 1.0, power_rate)
 
-        return psfc
+        return self._evaluate_surrogate(self.PSFC_COEFFICIENTS, altitude_mach_basis, power_rate)
 
     def max_power(
         self,
         atmosphere: AtmosphereSI,
         mach: Union[float, Sequence[float]],
         phase: Union[FlightPhase, Sequence],
+        altitude_mach_basis: Optional[np.ndarray] = None,
     ) -> tuple:
         """
         Computation of maximum available power.
@@ -333,6 +637,8 @@ class ML_TP_L1(AbstractFuelPropulsion):
         :param atmosphere: Atmosphere instance at intended altitude (should be <=20km)
         :param mach: Mach number(s) (should be between 0.05 and 1.0)
         :param phase: flight phase which influences engine rating (max mechanical power)
+        :param altitude_mach_basis: monomials of altitude and Mach, as provided by
+                                    :meth:`altitude_mach_basis` (computed if not provided)
         :return: (m)aximum shaft power, maximum thermal power, maximum rated power) (in W)
         """
         """
@@ -342,65 +648,28 @@ class ML_TP_L1(AbstractFuelPropulsion):
         CRUISE = 3  : k_gb_mcr
         DESCENT = 5 : k_gb_mcl
         """
-        altitude = atmosphere.get_altitude(altitude_in_feet=True)
-        mach = np.asarray(mach)
-
-        if phase == 2:  # 'MCL'
-            max_power_rating = self.k_gb_MCL * self.RTO_power / constants.hp  # *1.05
-
-        elif phase == 1:  # 'TO'
-            max_power_rating = self.k_gb_NTO * self.RTO_power / constants.hp
+        if altitude_mach_basis is None:
+            altitude_mach_basis = self.altitude_mach_basis(atmosphere, mach)
 
-        elif phase == 3:  # 'CRZ'
-            max_power_rating = self.k_gb_MCR * self.RTO_power / constants.hp
+        max_power_rating = self._get_k_gb(phase) * self.RTO_power / constants.hp
 
-        elif phase == 8:  # 'RTO'
-            max_power_rating = self.k_gb_RTO * self.RTO_power / constants.hp  # Watt =2400. hp
-
-        else:
-            max_power_rating = self.RTO_power / constants.hp
-
-        c0 = 1.015
-        c1 = -2.806e-6
-        c2 = -8.498e-2
-        c3 = -8.928e-10
-        c4 = 2.253e-5
-        c5 = 1.943e-1
-        c6 = 1.914e-14
-        c7 = -8.816e-10
-        c8 = 1.919e-5
-        c9 = -3.257e-1
-
-        K_powerlapse = (
-            c0
-            + c1 * altitude
-            + c2 * mach
-            + c3 * altitude**2
-            + c4 * altitude * mach
-            + c5 * mach**2
-            + c6 * altitude**3
-            + c7 * altitude**2 * mach
-            + c8 * altitude * mach**2
-            + c9 * mach**3
-        )
+        K_powerlapse = self._evaluate_surrogate(self.POWER_LAPSE_COEFFICIENTS, altitude_mach_basis)
 
         # Correction coefficient to account for DISA (Mattingly)
         # Assumes the surrogate model behaves as P ~ (rho / rho_0)**0.7
         # Compares two ratios (rho_ISA0 / rho_0_ISA0) and (rho_ISA / rho_0_ISA0)
         # If the ratios differ, then k_isa represent the correction to apply
-        density_isa0 = AtmosphereSI(altitude=atmosphere.altitude, delta_t=0).density
-        density_ground_isa0 = AtmosphereSI(altitude=0, delta_t=0).density
-
-        density_ratio_isa0 = (density_isa0 / density_ground_isa0) ** 0.7
-        density_ratio = (atmosphere.density / density_ground_isa0) ** 0.7
-        k_isa = (density_ratio / density_ratio_isa0) ** 0.7
+        # Both densities are at the same pressure, so the ground density cancels out and
+        # rho_ISA / rho_ISA0 is the ratio of standard-day temperature to actual temperature,
+        # which spares the computation of a standard-day atmosphere.
+        temperature = atmosphere.temperature
+        temperature_correction = ((temperature - atmosphere.delta_t) / temperature) ** 0.7
+        k_isa = temperature_correction**0.7
 
         max_thermo_power = max_power_rating * K_powerlapse * k_isa
 
-        if max_thermo_power > max_power_rating:
-            max_shaft_power = max_power_rating  # hp #gearbox mechanical limit
-        else:
-            max_shaft_power = max_thermo_power
+        # gearbox mechanical limit
+        max_shaft_power = np.minimum(max_thermo_power, max_power_rating)  # hp
 
         return (
             max_shaft_power * constants.hp,
@@ -408,6 +677,93 @@ class ML_TP_L1(AbstractFuelPropulsion):
             max_power_rating * constants.hp,
         )
 
+    @staticmethod
+    def altitude_mach_basis(
+        atmosphere: AtmosphereSI, mach: Union[float, Sequence[float]]
+    ) -> np.ndarray:
+        """
+        Monomials of altitude and Mach used by surrogate models, so they can be computed once
+        for :meth:`max_power` and :meth:`psfc`.
+
+        :param atmosphere: Atmosphere instance at intended altitude
+        :param mach: Mach number(s)
+        :return: array where element [i, j] is altitude**i * mach**j (altitude in ft)
+        """
+        altitude, mach = np.broadcast_arrays(
+            atmosphere.get_altitude(altitude_in_feet=True), np.asarray(mach, dtype=float)
+        )
+        altitude_powers = np.ones((SURROGATE_DEGREE + 1,) + altitude.shape)
+        mach_powers = np.ones((SURROGATE_DEGREE + 1,) + mach.shape)
+        for i in range(1, SURROGATE_DEGREE + 1):
+            altitude_powers[i] = altitude_powers[i - 1] * altitude
+            mach_powers[i] = mach_powers[i - 1] * mach
+
+        return altitude_powers[:, None] * mach_powers[None, :]
+
+    @staticmethod
+    def _evaluate_surrogate(
+        coefficients: np.ndarray,
+        altitude_mach_basis: np.ndarray,
+        power_rate: Optional[Union[float, np.ndarray]] = None,
+    ) -> np.ndarray:
+        """
+        :param coefficients: coefficient tensor, indexed by powers of altitude, Mach and
+                             (optionally) power rate
+        :param altitude_mach_basis: monomials of altitude and Mach
+        :param power_rate: power rate(s), needed if coefficients has 3 dimensions
+        :return: polynomial value(s)
+        """
+        coefficients = np.tensordot(coefficients, altitude_mach_basis, axes=([0, 1], [0, 1]))
+        if power_rate is None:
+            return coefficients
+
+        # Polynomial in power rate, evaluated with Horner scheme
+        value = coefficients[-1]
+        for coefficient in coefficients[-2::-1]:
+            value = value * power_rate + coefficient
+        return value
+
+    @staticmethod
+    def _derivative_coefficients(coefficients: np.ndarray, axis: int) -> np.ndarray:
+        """
+        :param coefficients: coefficient tensor of a surrogate model
+        :param axis: index of the variable for derivation
+        :return: coefficient tensor of the derivative, with same shape as coefficients
+        """
+        pad_width = [(0, 0)] * coefficients.ndim
+        pad_width[axis] = (0, 1)
+        return np.pad(polyder(coefficients, axis=axis), pad_width)
+
+    def _get_k_gb(self, phase: Union[FlightPhase, Sequence]) -> Union[float, np.ndarray]:
+        """
+        :param phase: flight phase(s)
+        :return: gearbox rating factor(s) according to engine setting, 1.0 for unknown settings
+        """
+        # Rating factors are gathered from a table indexed by engine setting, whose last
+        # element is used for unknown settings. Table elements may be arrays of several
+        # designs, that are broadcast against engine settings.
+        k_gb_table = [1.0] * (max(self.RATINGS) + 2)
+        for phase_value, k_gb_name in self.RATINGS.items():
+            k_gb_table[phase_value] = getattr(self, k_gb_name)
+
+        return np.choose(self._get_setting_index(phase, len(k_gb_table) - 1), k_gb_table)
+
+    @staticmethod
+    def _get_setting_index(
+        phase: Union[FlightPhase, Sequence], default: int
+    ) -> Union[int, np.ndarray]:
+        """
+        :param phase: flight phase(s), as EngineSetting instances or numbers. None and NaN
+                      values are accepted.
+        :param default: index returned for missing and non-integer settings
+        :return: engine setting(s) as integer array
+        """
+        # Conversion to float turns EngineSetting instances into their value and None into NaN
+        setting = np.asarray(phase, dtype=float)
+        is_valid = (setting >= 0) & (setting < default) & (np.mod(setting, 1.0) == 0.0)
+
+        return np.where(is_valid, setting, default).astype(int)
+
     def compute_engine_point(
         self,
         mach: Union[float, Sequence[float]],
@@ -12,6 +12,8 @@
 #  You should have received a copy of the GNU General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+from collections import OrderedDict
+
 import numpy as np
 from fastoad.model_base.propulsion import (
     IOMPropulsionWrapper,
@@ -20,8 +22,12 @@ from fastoad.model_base.propulsion import (
 )
 from fastoad.module_management.service_registry import RegisterPropulsion
 from openmdao.core.component import Component
+from .engine_deck import clear_engine_deck_cache
 from .ml_tp_l1 import ML_TP_L1
 
+# Maximum number of engine models kept in memory by each OMMLTPL1Wrapper instance
+ENGINE_MODEL_CACHE_SIZE = 8
+
 
 ####################################################################################################
 # TURBOPROP model
@@ -38,7 +44,14 @@ class OMMLTPL1Wrapper(IOMPropulsionWrapper):
 
     """
 
+    def __init__(self):
+        self._engine_models = OrderedDict()
+
     def setup(self, component: Component):
+        # Engines of a previous problem are not reused
+        self._engine_models = OrderedDict()
+        clear_engine_deck_cache()
+
         component.add_input("data:propulsion:RTO_power", np.nan, units="W")
         component.add_input("data:propulsion:Power_Offtake", np.nan, units="W")
         component.add_input("data:propulsion:gearbox_eta", np.nan)
@@ -55,26 +68,57 @@ class OMMLTPL1Wrapper(IOMPropulsionWrapper):
         component.add_input("settings:propulsion:ratings:MCT:k_gb", np.nan)
         component.add_input("settings:propulsion:ratings:MCR:k_gb", np.nan)
 
-    @staticmethod
-    def get_model(inputs) -> IPropulsion:
+        # If 1, engine performances are interpolated in a precomputed engine deck
+        component.add_input("settings:propulsion:engine_deck", 0.0)
+        # If not 0, max thrust is memoized for this number of flight points
+        component.add_input("settings:propulsion:max_thrust_cache_size", 0.0)
+
+    def get_model(self, inputs) -> IPropulsion:
         """
+        Engine models are cached by the wrapper according to input values, so the same
+        instance, with its engine deck if any, is returned as long as inputs that define the
+        engine do not change. The cache is emptied at setup.
 
         :param inputs: input parameters that define the engine
         :return: an :class:`ML_TP_L1` instance
         """
-        engine_params = {
-            "RTO_power": inputs["data:propulsion:RTO_power"],
-            "Power_Offtake": inputs["data:propulsion:Power_Offtake"],
-            "gearbox_eta": inputs["data:propulsion:gearbox_eta"],
-            "d_prop": inputs["data:geometry:propulsion:propeller:diameter"],
-            "k_gb_RTO": inputs["settings:propulsion:ratings:RTO:k_gb"],
-            "k_gb_NTO": inputs["settings:propulsion:ratings:NTO:k_gb"],
-            "k_gb_MCL": inputs["settings:propulsion:ratings:MCL:k_gb"],
-            "k_gb_MCR": inputs["settings:propulsion:ratings:MCR:k_gb"],
-            "k_psfc": inputs["tuning:propulsion:k_psfc"],
-            "k_prop": inputs["tuning:propulsion:k_prop"],
-        }
+        engine_params = OMMLTPL1Wrapper.get_engine_parameters(inputs)
+        engine_count = np.array(inputs["data:geometry:propulsion:engine:count"])
+
+        key = tuple(
+            (name, value if np.isscalar(value) else tuple(np.ravel(value).tolist()))
+            for name, value in engine_params.items()
+        ) + (("engine_count", tuple(np.ravel(engine_count).tolist())),)
 
-        return FuelEngineSet(
-            ML_TP_L1(**engine_params), inputs["data:geometry:propulsion:engine:count"]
-        )
+        if key in self._engine_models:
+            self._engine_models.move_to_end(key)
+        else:
+            self._engine_models[key] = FuelEngineSet(ML_TP_L1(**engine_params), engine_count)
+            if len(self._engine_models) > ENGINE_MODEL_CACHE_SIZE:
+                self._engine_models.popitem(last=False)
+
+        return self._engine_models[key]
+
+    @staticmethod
+    def get_engine_parameters(inputs) -> dict:
+        """
+        :param inputs: input parameters that define the engine
+        :return: arguments of :class:`ML_TP_L1` constructor
+        """
+        # Input values are copied, as OpenMDAO may modify provided arrays in place
+        return {
+            "RTO_power": np.array(inputs["data:propulsion:RTO_power"]),
+            "Power_Offtake": np.array(inputs["data:propulsion:Power_Offtake"]),
+            "gearbox_eta": np.array(inputs["data:propulsion:gearbox_eta"]),
+            "d_prop": np.array(inputs["data:geometry:propulsion:propeller:diameter"]),
+            "k_gb_RTO": np.array(inputs["settings:propulsion:ratings:RTO:k_gb"]),
+            "k_gb_NTO": np.array(inputs["settings:propulsion:ratings:NTO:k_gb"]),
+            "k_gb_MCL": np.array(inputs["settings:propulsion:ratings:MCL:k_gb"]),
+            "k_gb_MCR": np.array(inputs["settings:propulsion:ratings:MCR:k_gb"]),
+            "k_psfc": np.array(inputs["tuning:propulsion:k_psfc"]),
+            "k_prop": np.array(inputs["tuning:propulsion:k_prop"]),
+            "use_engine_deck": bool(np.round(inputs["settings:propulsion:engine_deck"][0])),
+            "max_thrust_cache_size": int(
+                np.round(inputs["settings:propulsion:max_thrust_cache_size"][0])
+            ),
+        }
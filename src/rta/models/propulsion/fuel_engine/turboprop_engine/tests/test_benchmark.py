@@ -0,0 +1,19 @@
+import json
+import os.path as pth
+
+from ..benchmark import main
+
+
+def test_benchmark(tmp_path):
+    file_path = pth.join(tmp_path, "benchmark.json")
+    main(["-o", file_path, "-b", "1", "10", "-d", "0"])
+
+    with open(file_path) as file:
+        content = json.load(file)
+
+    assert content["versions"]["numpy"]
+    # 3 engine settings, 2 modes, 2 batch sizes, and engine + propeller
+    assert len(content["results"]) == 24
+    for result in content["results"]:
+        assert result["batch_size"] in [1, 10]
+        assert result["points_per_second"] > 0.0
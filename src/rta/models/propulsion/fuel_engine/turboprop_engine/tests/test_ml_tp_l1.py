@@ -1,7 +1,11 @@
 import os.path as pth
 
 import numpy as np
+import pytest
+from stdatm import AtmosphereSI
+import pandas as pd
 from fastoad.io import VariableIO
+from ..engine_deck import clear_engine_deck_cache
 from ..ml_tp_l1 import ML_TP_L1
 from fastoad.model_base import FlightPoint
 from fastoad.constants import EngineSetting
@@ -26,7 +30,7 @@ engine_params = {
 }
 
 
-def test_ML_TP_L1():
+def get_engine(**kwargs):
     var_name = []
     for var, name in engine_params.items():
         var_name.append(name)
@@ -37,7 +41,13 @@ def test_ML_TP_L1():
     for var, name in engine_params.items():
         argument[var] = input_data[name].value[0]
 
-    engine = ML_TP_L1(**argument)
+    argument.update(kwargs)
+
+    return ML_TP_L1(**argument)
+
+
+def test_ML_TP_L1():
+    engine = get_engine()
 
     # Test scalar
     flight_point = FlightPoint(
@@ -83,3 +93,293 @@ def test_ML_TP_L1():
     np.testing.assert_allclose(flight_point.psfc, 8.216e-8, rtol=1e-3)
     np.testing.assert_allclose(flight_point.sfc, 9.551e-6, rtol=1e-3)
     np.testing.assert_allclose(flight_point.TPshaft_power, 1.579e6, rtol=1e-3)
+
+
+def test_ML_TP_L1_vectorized():
+    engine = get_engine()
+
+    # Mixed regulated/unregulated points, thrust rates and engine settings
+    flight_points = pd.DataFrame(
+        {
+            "mach": [0.45, 0.0, 0.3, 0.3, 0.1, 0.5],
+            "altitude": [6096.0, 0.0, 3000.0, 3000.0, 100.0, 7000.0],
+            "isa_offset": [0.0, 0.0, 0.0, 15.0, 10.0, 0.0],
+            "engine_setting": [
+                EngineSetting.CRUISE,
+                EngineSetting.TAKEOFF,
+                EngineSetting.CLIMB,
+                EngineSetting.CLIMB,
+                8,
+                EngineSetting.IDLE,
+            ],
+            "thrust_is_regulated": [1.0, 0.0, 0.0, 0.0, 0.0, 1.0],
+            "thrust_rate": [0.0, 0.8, 1.0, 1.0, 0.6, 0.0],
+            "thrust": [7250.0, 0.0, 0.0, 0.0, 0.0, 3000.0],
+        }
+    )
+
+    engine.compute_flight_points(flight_points)
+
+    # Reference values from the scalar implementation of compute_flight_points, before
+    # vectorization, called for each point
+    expected = {
+        "thrust": [7250.0, 31605.0508033, 14292.9708202, 13584.3355423, 20081.8079783, 3000.0],
+        "thrust_rate": [0.831674917518, 0.8, 1.0, 1.0, 0.6, 0.307017318461],
+        "psfc": [
+            8.43085015498e-08,
+            9.25316417005e-08,
+            8.21592188209e-08,
+            8.21592188209e-08,
+            1.10706915462e-07,
+            1.05675771757e-07,
+        ],
+        "sfc": [
+            1.38321410180e-05,
+            3.41408125803e-06,
+            9.32267797550e-06,
+            9.55130641051e-06,
+            6.12348256041e-06,
+            1.87810760612e-05,
+        ],
+        "TPshaft_power": [
+            1189476.98675,
+            1166111.50114,
+            1621835.82296,
+            1579228.15004,
+            1110776.14640,
+            533170.728230,
+        ],
+        "TP_power_rate": [0.876046766959, 0.632886940378, 1.0, 1.0, 0.547413487822, 0.320225297392],
+    }
+    for name, value in expected.items():
+        np.testing.assert_allclose(flight_points[name], value, rtol=1e-9)
+
+
+def test_max_power_isa_offset():
+    engine = get_engine()
+
+    altitude = np.array([0.0, 3000.0, 6000.0, 12000.0])
+    disa = np.array([-20.0, 0.0, 15.0, 30.0])
+    mach = 0.3
+
+    max_shaft_power, max_thermo_power, max_power_rating = engine.max_power(
+        AtmosphereSI(altitude, disa), mach, EngineSetting.CLIMB
+    )
+    _, max_thermo_power_isa, _ = engine.max_power(AtmosphereSI(altitude), mach, EngineSetting.CLIMB)
+
+    # DISA correction as (rho_ISA / rho_ISA0) ** 0.49
+    k_isa = (AtmosphereSI(altitude, disa).density / AtmosphereSI(altitude).density) ** 0.49
+    np.testing.assert_allclose(max_thermo_power, max_thermo_power_isa * k_isa, rtol=1e-10)
+    np.testing.assert_allclose(
+        max_shaft_power, np.minimum(max_thermo_power, max_power_rating), rtol=1e-10
+    )
+
+
+def test_ML_TP_L1_mixed_settings():
+    engine = get_engine()
+
+    # One batch over takeoff, climb and cruise segments, and unknown or missing settings
+    segments = [
+        EngineSetting.TAKEOFF,
+        EngineSetting.CLIMB,
+        EngineSetting.CRUISE,
+        EngineSetting.IDLE,
+        None,
+    ]
+    mach = np.array([0.1, 0.2333, 0.5, 0.3667, 0.3])
+    altitude = np.array([0.0, 2333.0, 7000.0, 4667.0, 3000.0])
+    engine_setting = np.array(segments, dtype=object)
+
+    np.testing.assert_allclose(
+        engine._get_k_gb(engine_setting),
+        [engine.k_gb_NTO, engine.k_gb_MCL, engine.k_gb_MCR, 1.0, 1.0],
+    )
+
+    performances = engine.compute_performances(mach, altitude, 0.0, engine_setting, False, 0.9)
+
+    # Reference values from the scalar implementation of compute_flight_points, before
+    # vectorization, called for each point
+    expected = {
+        "thrust": [27597.7193740, 15753.5405110, 6917.39480030, 12430.0977858, 15413.9621549],
+        "psfc": [
+            9.23013345668e-08,
+            8.87038536495e-08,
+            7.65092195362e-08,
+            8.27692390981e-08,
+            8.66979030947e-08,
+        ],
+        "TPshaft_power": [
+            1617828.60606,
+            1513509.07135,
+            1242731.96437,
+            1732308.55058,
+            1830572.91312,
+        ],
+        "sfc": [
+            5.41087244985e-06,
+            8.52215329426e-06,
+            1.37451244915e-05,
+            1.15350549196e-05,
+            1.02963035354e-05,
+        ],
+    }
+    for name, value in expected.items():
+        np.testing.assert_allclose(performances[name], value, rtol=1e-9)
+
+
+def test_ML_TP_L1_partials():
+    engine = get_engine()
+
+    # Low and high speed, regulated and unregulated points, with and without ISA offset
+    flight_points = {
+        "mach": np.array([0.0, 0.1, 0.15, 0.3, 0.45, 0.6, 0.3, 0.05]),
+        "altitude": np.array([0.0, 500.0, 1000.0, 3000.0, 6096.0, 9000.0, 12000.0, 100.0]),
+        "disa": np.array([0.0, 10.0, -10.0, 15.0, 0.0, 20.0, 0.0, 0.0]),
+        "phase": np.array([1, 8, 2, 2, 3, 3, 2, 4]),
+        "thrust_is_regulated": np.array([0.0, 0.0, 1.0, 0.0, 1.0, 0.0, 0.0, 1.0]),
+        "thrust_rate": np.array([0.8, 1.0, 0.0, 0.7, 0.0, 0.9, 1.0, 0.0]),
+        "thrust": np.array([0.0, 0.0, 20000.0, 0.0, 7250.0, 0.0, 0.0, 3000.0]),
+    }
+
+    def compute_outputs(engine, **kwargs):
+        performances = engine.compute_performances(**dict(flight_points, **kwargs))
+        performances["fuel_flow"] = performances["psfc"] * performances["TPshaft_power"]
+        return performances
+
+    partials = engine.compute_partials(**flight_points)
+
+    for input_name in engine.PARTIALS_WRT:
+        # Central finite differences
+        if input_name in flight_points:
+            value = flight_points[input_name]
+            step = 1e-6 * np.maximum(np.abs(value), 1.0)
+            outputs_plus = compute_outputs(engine, **{input_name: value + step})
+            outputs_minus = compute_outputs(engine, **{input_name: value - step})
+        else:
+            value = getattr(engine, input_name)
+            step = 1e-6 * value
+            outputs_plus = compute_outputs(get_engine(**{input_name: value + step}))
+            outputs_minus = compute_outputs(get_engine(**{input_name: value - step}))
+
+        # Derivatives are not continuous at null Mach and at full thrust rate
+        if input_name == "mach":
+            idx = flight_points["mach"] > 0.0
+        elif input_name == "thrust_rate":
+            idx = flight_points["thrust_rate"] < 1.0
+        else:
+            idx = np.ones(flight_points["mach"].shape, dtype=bool)
+
+        for output_name in ["thrust", "TPshaft_power", "psfc", "fuel_flow"]:
+            expected = (outputs_plus[output_name] - outputs_minus[output_name]) / (2 * step)
+            np.testing.assert_allclose(
+                np.broadcast_to(partials[(output_name, input_name)], idx.shape)[idx],
+                expected[idx],
+                rtol=1e-4,
+                atol=1e-6 * np.max(np.abs(expected)),
+            )
+
+
+def test_ML_TP_L1_designs():
+    RTO_power = np.array([1.5e6, 2.0e6, 2.5e6])
+    d_prop = np.array([3.5, 3.93, 4.2])
+    k_psfc = np.array([0.95, 1.0, 1.05])
+    engine = get_engine(RTO_power=RTO_power, d_prop=d_prop, k_psfc=k_psfc)
+    assert engine.design_count == 3
+
+    flight_points = {
+        "mach": np.array([0.0, 0.1, 0.3, 0.45, 0.6]),
+        "altitude": np.array([0.0, 500.0, 3000.0, 6096.0, 9000.0]),
+        "disa": np.array([0.0, 10.0, 15.0, 0.0, 0.0]),
+        "phase": np.array([1, 8, 2, 3, 3]),
+        "thrust_is_regulated": np.array([0.0, 0.0, 0.0, 1.0, 0.0]),
+        "thrust_rate": np.array([0.8, 1.0, 0.7, 0.0, 0.9]),
+        "thrust": np.array([0.0, 0.0, 0.0, 7250.0, 0.0]),
+    }
+
+    performances = engine.compute_performances(**flight_points)
+    partials = engine.compute_partials(**flight_points)
+
+    for i in range(engine.design_count):
+        design = get_engine(RTO_power=RTO_power[i], d_prop=d_prop[i], k_psfc=k_psfc[i])
+        expected = design.compute_performances(**flight_points)
+        for name, value in expected.items():
+            assert np.shape(performances[name]) == (3, 5)
+            np.testing.assert_allclose(performances[name][i], value, rtol=1e-12)
+
+        expected = design.compute_partials(**flight_points)
+        for name, value in expected.items():
+            assert np.shape(partials[name]) == (3, 5)
+            np.testing.assert_allclose(partials[name][i], value, rtol=1e-12)
+
+    with pytest.raises(ValueError):
+        get_engine(RTO_power=RTO_power, use_engine_deck=True)
+
+
+def test_ML_TP_L1_max_thrust_cache():
+    engine = get_engine()
+    cached_engine = get_engine(max_thrust_cache_size=4)
+
+    flight_points = {
+        "mach": np.array([0.1, 0.3, 0.3, 0.45, 0.3]),
+        "altitude": np.array([100.0, 3000.0, 3000.1, 6096.0, 3000.0]),
+        "disa": np.array([0.0, 15.0, 15.0, 0.0, 15.0]),
+        "phase": np.array([1, 2, 2, 3, 3]),
+        "thrust_is_regulated": np.array([0.0, 0.0, 0.0, 1.0, 0.0]),
+        "thrust_rate": np.array([0.8, 1.0, 0.7, 0.0, 0.9]),
+        "thrust": np.array([0.0, 0.0, 0.0, 7250.0, 0.0]),
+    }
+
+    expected = engine.compute_performances(**flight_points)
+    for _ in range(2):
+        performances = cached_engine.compute_performances(**flight_points)
+        for name, value in expected.items():
+            np.testing.assert_allclose(performances[name], value, rtol=1e-4)
+
+    # Points 2 and 3 are the same once quantized, and 2 and 5 have different ratings
+    info = cached_engine.max_thrust_cache.cache_info()
+    assert (info.hits, info.misses, info.maxsize, info.currsize) == (6, 4, 4, 4)
+
+    flight_point = FlightPoint(
+        mach=0.5, altitude=7000.0, engine_setting=EngineSetting.CRUISE, thrust_rate=0.9
+    )
+    cached_engine.compute_flight_points(flight_point)
+    assert cached_engine.max_thrust_cache.cache_info().currsize == 4
+
+    cached_engine.max_thrust_cache.cache_clear()
+    assert cached_engine.max_thrust_cache.cache_info() == (0, 0, 4, 0)
+
+
+def test_ML_TP_L1_engine_deck():
+    engine = get_engine()
+    deck_engine = get_engine(use_engine_deck=True)
+
+    # Deck is built once for given engine parameters
+    assert get_engine(use_engine_deck=True).engine_deck is deck_engine.engine_deck
+    clear_engine_deck_cache()
+    assert get_engine(use_engine_deck=True).engine_deck is not deck_engine.engine_deck
+
+    flight_points = pd.DataFrame(
+        {
+            "mach": [0.45, 0.0, 0.3, 0.3, 0.15, 0.5],
+            "altitude": [6096.0, 0.0, 3000.0, 3000.0, 200.0, 5000.0],
+            "isa_offset": [0.0, 0.0, 0.0, 15.0, 10.0, -5.0],
+            "engine_setting": [
+                EngineSetting.CRUISE,
+                EngineSetting.TAKEOFF,
+                EngineSetting.CLIMB,
+                EngineSetting.CLIMB,
+                8,
+                EngineSetting.IDLE,
+            ],
+            "thrust_is_regulated": [1.0, 0.0, 0.0, 0.0, 0.0, 1.0],
+            "thrust_rate": [0.0, 0.8, 1.0, 1.0, 0.6, 0.0],
+            "thrust": [7250.0, 0.0, 0.0, 0.0, 0.0, 3000.0],
+        }
+    )
+    deck_flight_points = flight_points.copy()
+
+    engine.compute_flight_points(flight_points)
+    deck_engine.compute_flight_points(deck_flight_points)
+
+    for name in ["thrust", "thrust_rate", "psfc", "sfc", "TPshaft_power", "thermo_power"]:
+        np.testing.assert_allclose(deck_flight_points[name], flight_points[name], rtol=1e-2)
@@ -0,0 +1,51 @@
+import os.path as pth
+
+import numpy as np
+from fastoad.io import VariableIO
+from openmdao.core.explicitcomponent import ExplicitComponent
+
+from ..openmdao import OMMLTPL1Wrapper
+
+DATA_FOLDER_PATH = pth.join(pth.dirname(__file__), "data")
+SOURCE_FILE = "problem_outputs.xml"
+
+input_names = [
+    "data:propulsion:RTO_power",
+    "data:propulsion:Power_Offtake",
+    "data:propulsion:gearbox_eta",
+    "data:geometry:propulsion:propeller:diameter",
+    "data:geometry:propulsion:engine:count",
+    "settings:propulsion:ratings:RTO:k_gb",
+    "settings:propulsion:ratings:NTO:k_gb",
+    "settings:propulsion:ratings:MCL:k_gb",
+    "settings:propulsion:ratings:MCR:k_gb",
+    "tuning:propulsion:k_psfc",
+    "tuning:propulsion:k_prop",
+]
+
+
+def test_get_model_cache():
+    input_data = VariableIO(pth.join(DATA_FOLDER_PATH, SOURCE_FILE)).read(only=input_names)
+    inputs = {name: np.array(input_data[name].value, dtype=float) for name in input_names}
+    inputs["settings:propulsion:engine_deck"] = np.array([0.0])
+    inputs["settings:propulsion:max_thrust_cache_size"] = np.array([0.0])
+
+    wrapper = OMMLTPL1Wrapper()
+    model = wrapper.get_model(inputs)
+    assert wrapper.get_model(inputs) is model
+
+    # Engine keeps its own copy of inputs, that are modified in place by OpenMDAO
+    RTO_power = inputs["data:propulsion:RTO_power"][0]
+    inputs["data:propulsion:RTO_power"][:] = 1.1 * RTO_power
+    new_model = wrapper.get_model(inputs)
+    assert new_model is not model
+    np.testing.assert_allclose(model.engine.RTO_power, RTO_power)
+    np.testing.assert_allclose(new_model.engine.RTO_power, 1.1 * RTO_power)
+
+    inputs["data:propulsion:RTO_power"][:] = RTO_power
+    assert wrapper.get_model(inputs) is model
+
+    # Setup, e.g. for a new problem, and other wrappers do not reuse engines
+    assert OMMLTPL1Wrapper().get_model(inputs) is not model
+    wrapper.setup(ExplicitComponent())
+    assert wrapper.get_model(inputs) is not model
@@ -0,0 +1,160 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from scipy import constants
+from scipy.optimize import fsolve
+from stdatm import AtmosphereSI
+
+from ..engine_components.propeller import (
+    Propeller,
+    momentum_theory_thrust,
+    momentum_theory_thrust_partials,
+)
+
+
+def P_to_T(T_prop, shp_prop, V_TAS, rho, d):
+    return (T_prop * V_TAS / (shp_prop * constants.hp)) - 2 / (
+        1 + (1 + (T_prop / (0.5 * rho * constants.pi / 4 * d**2 * V_TAS**2))) ** 0.5
+    )
+
+
+def power_to_thrust_ref(data, altitude, mach, shaft_power):
+    # Scalar formulation of power_to_thrust_ADT, with iterative solving of momentum theory
+    atmosphere = AtmosphereSI(altitude)
+    a, rho = atmosphere.speed_of_sound, atmosphere.density
+    shp_prop = shaft_power * data.gearbox_eta / constants.hp
+    k = 0.895 * data.k_prop
+
+    def solve(V_TAS):
+        return fsolve(P_to_T, 1, args=(shp_prop, V_TAS, rho, data.d_prop), xtol=1e-14)[0]
+
+    if mach < 0.2:
+        thrust_0 = 55000 * shp_prop / (1200 * data.d_prop / constants.foot) * constants.pound_force
+        thrust_ref = solve(0.2 * a) * k
+        return np.interp(mach, [0.0, 0.2], [thrust_0, thrust_ref]), 0.0
+
+    thrust = solve(mach * a) * k
+    return thrust, thrust * mach * a / (shp_prop * constants.hp)
+
+
+def test_momentum_theory_thrust():
+    shp_prop = np.array([50.0, 500.0, 1500.0, 2500.0, 3500.0])  # hp
+    V_TAS = np.array([20.0, 68.0, 100.0, 150.0, 250.0])  # m/s
+    rho = np.array([1.225, 1.1, 0.9, 0.65, 0.4])  # kg/m**3
+    d = 3.93  # m
+
+    thrust_ref = [
+        fsolve(P_to_T, 1, args=(shp_prop[i], V_TAS[i], rho[i], d), xtol=1e-14)[0]
+        for i in range(len(shp_prop))
+    ]
+
+    thrust = momentum_theory_thrust(shp_prop, V_TAS, rho, d)
+
+    np.testing.assert_allclose(thrust, thrust_ref, rtol=1e-8)
+    np.testing.assert_allclose(P_to_T(thrust, shp_prop, V_TAS, rho, d), 0.0, atol=1e-12)
+
+    # Scalar inputs
+    np.testing.assert_allclose(
+        momentum_theory_thrust(shp_prop[2], V_TAS[2], rho[2], d), thrust_ref[2], rtol=1e-8
+    )
+
+
+def test_momentum_theory_thrust_partials():
+    inputs = [
+        np.array([50.0, 500.0, 1500.0, 2500.0, 3500.0]),  # hp
+        np.array([20.0, 68.0, 100.0, 150.0, 250.0]),  # m/s
+        np.array([1.225, 1.1, 0.9, 0.65, 0.4]),  # kg/m**3
+        np.full(5, 3.93),  # m
+    ]
+
+    thrust, *partials = momentum_theory_thrust_partials(*inputs)
+
+    np.testing.assert_allclose(thrust, momentum_theory_thrust(*inputs), rtol=1e-12)
+    for i, partial in enumerate(partials):
+        step = 1e-6 * inputs[i]
+        inputs_plus = [value + step if j == i else value for j, value in enumerate(inputs)]
+        inputs_minus = [value - step if j == i else value for j, value in enumerate(inputs)]
+        expected = (
+            momentum_theory_thrust(*inputs_plus) - momentum_theory_thrust(*inputs_minus)
+        ) / (2 * step)
+        np.testing.assert_allclose(partial, expected, rtol=1e-6)
+
+
+def test_power_to_thrust_ADT():
+    propeller = Propeller("ADT")
+    data = SimpleNamespace(gearbox_eta=0.98, d_prop=3.93, k_prop=1.0)
+
+    # Low speed and high speed points in the same batch
+    mach = np.array([0.0, 0.05, 0.1, 0.199, 0.2, 0.3, 0.5])
+    atmosphere = AtmosphereSI(np.array([0.0, 0.0, 500.0, 1000.0, 1000.0, 3000.0, 7000.0]))
+    shaft_power = np.array([2.0e6, 2.0e6, 1.9e6, 1.8e6, 1.8e6, 1.6e6, 1.2e6])
+
+    thrust, eta = propeller.power_to_thrust_ADT(data, atmosphere, mach, shaft_power)
+
+    for i in range(len(mach)):
+        thrust_i, eta_i = power_to_thrust_ref(data, atmosphere.altitude[i], mach[i], shaft_power[i])
+        np.testing.assert_allclose(thrust[i], thrust_i, rtol=1e-10)
+        np.testing.assert_allclose(eta[i], eta_i, rtol=1e-10)
+
+    # Static thrust from Skellett, and continuity at mach=0.2
+    np.testing.assert_allclose(
+        thrust[0],
+        55000
+        * 2.0e6
+        * 0.98
+        / constants.hp
+        / (1200 * 3.93 / constants.foot)
+        * constants.pound_force,
+        rtol=1e-12,
+    )
+    np.testing.assert_allclose(thrust[3], thrust[4], rtol=1e-2)
+    np.testing.assert_allclose(eta[:4], 0.0)
+
+
+def test_thrust_to_power_ADT():
+    propeller = Propeller("ADT")
+    data = SimpleNamespace(gearbox_eta=0.98, d_prop=3.93, k_prop=1.0)
+
+    mach = np.array([0.2, 0.3, 0.45, 0.5, 0.6])
+    atmosphere = AtmosphereSI(np.array([1000.0, 3000.0, 6096.0, 7000.0, 9000.0]))
+    shaft_power = np.array([1.8e6, 1.6e6, 1.3e6, 1.2e6, 0.9e6])
+
+    thrust, _ = propeller.power_to_thrust_ADT(data, atmosphere, mach, shaft_power)
+    computed_power, computed_eta = propeller.thrust_to_power_ADT(data, atmosphere, mach, thrust)
+
+    # Computed power satisfies momentum theory, where the correction factor divides power
+    shp_prop = computed_power * data.gearbox_eta / constants.hp * 0.895 * data.k_prop
+    np.testing.assert_allclose(
+        P_to_T(thrust, shp_prop, mach * atmosphere.speed_of_sound, atmosphere.density, 3.93),
+        0.0,
+        atol=1e-12,
+    )
+    np.testing.assert_allclose(
+        computed_eta, 0.895 * thrust * mach * atmosphere.speed_of_sound / (shp_prop * constants.hp)
+    )
+
+    # Correction factor is applied on thrust by power_to_thrust_ADT, and on efficiency by
+    # thrust_to_power_ADT, so they are close to, but not exactly, inverse of each other.
+    np.testing.assert_allclose(computed_power, shaft_power, rtol=2e-2)
+
+    # Null thrust needs no power, and static points use the airspeed floor
+    shaft_power, eta = propeller.thrust_to_power_ADT(
+        data, AtmosphereSI([0.0, 0.0]), [0.0, 0.3], [10000.0, 0.0]
+    )
+    assert np.all(np.isfinite(shaft_power))
+    assert shaft_power[0] > 0.0
+    np.testing.assert_allclose(shaft_power[1], 0.0)
+    np.testing.assert_allclose(eta[1], 0.895)
+
+
+def test_propeller_fidelity():
+    propeller = Propeller("ADT")
+
+    assert propeller.power_to_thrust == propeller.power_to_thrust_ADT
+    assert propeller.thrust_to_power == propeller.thrust_to_power_ADT
+    assert propeller.power_to_thrust_partials == propeller.power_to_thrust_ADT_partials
+    assert propeller.thrust_to_power_partials == propeller.thrust_to_power_ADT_partials
+
+    with pytest.raises(ValueError):
+        Propeller("unknown")
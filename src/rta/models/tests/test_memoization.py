@@ -0,0 +1,64 @@
+import openmdao.api as om
+from pytest import approx
+
+from ..geometry.geom_components.wing.components.compute_toc_wing_rta import ComputeToCWingRTA
+from ..memoization import MemoizationStatistics
+
+
+def get_problem(**options):
+    model = om.Group()
+    ivc = om.IndepVarComp()
+    ivc.add_output("data:TLAR:cruise_mach", val=0.5)
+    ivc.add_output("data:geometry:wing:sweep_25", val=2.0, units="deg")
+    model.add_subsystem("inputs", ivc, promotes=["*"])
+    model.add_subsystem("toc", ComputeToCWingRTA(**options), promotes=["*"])
+
+    problem = om.Problem(model)
+    problem.setup()
+    return problem
+
+
+def test_memoize_compute_default():
+    # Memoization is off by default
+    problem = get_problem()
+    problem.run_model()
+    thickness_ratio = problem["data:geometry:wing:thickness_ratio"][0]
+    problem["data:geometry:wing:thickness_ratio"] = 0.0
+    problem.run_model()
+    assert problem["data:geometry:wing:thickness_ratio"][0] == thickness_ratio
+    assert problem.model.toc.memoization_statistics == MemoizationStatistics(hits=0, misses=0)
+
+
+def test_memoize_compute():
+    problem = get_problem(memoize_compute=True)
+    problem.run_model()
+    thickness_ratio = problem["data:geometry:wing:thickness_ratio"][0]
+    assert problem.model.toc.memoization_statistics == MemoizationStatistics(hits=0, misses=1)
+
+    # Same inputs: outputs are reused, even if they have been modified
+    problem["data:geometry:wing:thickness_ratio"] = 0.0
+    problem.run_model()
+    assert problem["data:geometry:wing:thickness_ratio"][0] == thickness_ratio
+    assert problem.model.toc.memoization_statistics == MemoizationStatistics(hits=1, misses=1)
+
+    # Finite difference calls are not memoized and keep the stored call
+    partials = problem.compute_totals(
+        "data:geometry:wing:thickness_ratio", "data:TLAR:cruise_mach"
+    )["data:geometry:wing:thickness_ratio", "data:TLAR:cruise_mach"]
+    assert partials[0, 0] == approx(-0.204 * thickness_ratio / 0.5, rel=1e-4)
+    assert problem.model.toc.memoization_statistics == MemoizationStatistics(hits=1, misses=1)
+    problem.run_model()
+    assert problem.model.toc.memoization_statistics == MemoizationStatistics(hits=2, misses=1)
+
+    # New inputs are computed
+    problem["data:TLAR:cruise_mach"] = 0.6
+    problem.run_model()
+    assert problem["data:geometry:wing:thickness_ratio"][0] == approx(
+        thickness_ratio * 1.2**-0.204, rel=1e-12
+    )
+    assert problem.model.toc.memoization_statistics == MemoizationStatistics(hits=2, misses=2)
+
+    # Setup resets the stored call
+    problem.setup()
+    problem.run_model()
+    assert problem.model.toc.memoization_statistics == MemoizationStatistics(hits=0, misses=1)
@@ -12,9 +12,11 @@ from fastoad.module_management.service_registry import RegisterSubmodel
 from rta.models.weight.mass_breakdown.b_propulsion.constants import (
     SERVICE_TURBOPROP_MASS,
 )
+from rta.models.memoization import memoize_compute
 
 
 @RegisterSubmodel(SERVICE_TURBOPROP_MASS, "rta.submodel.weight.mass.propulsion.turboprop.legacy")
+@memoize_compute
 class TurbopropWeight(ExplicitComponent):
     """
     Weight estimation for turboprop propulsion systems
@@ -17,9 +17,11 @@ Estimation of automatic flight systems weight
 from openmdao.core.explicitcomponent import ExplicitComponent
 from fastoad.module_management.service_registry import RegisterSubmodel
 from rta.models.weight.mass_breakdown.c_systems.constants import SERVICE_MASS_ATA22
+from rta.models.memoization import memoize_compute
 
 
 @RegisterSubmodel(SERVICE_MASS_ATA22, "rta.submodel.mass.system.ata22")
+@memoize_compute
 class AutoFlightSystemWeight(ExplicitComponent):
     """
     Weight estimation for automatic flight systems
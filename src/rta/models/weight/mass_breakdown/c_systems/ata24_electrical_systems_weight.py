@@ -18,9 +18,11 @@ import numpy as np
 from openmdao.core.explicitcomponent import ExplicitComponent
 from fastoad.module_management.service_registry import RegisterSubmodel
 from rta.models.weight.mass_breakdown.c_systems.constants import SERVICE_MASS_ATA24
+from rta.models.memoization import memoize_compute
 
 
 @RegisterSubmodel(SERVICE_MASS_ATA24, "rta.submodel.mass.system.ata24")
+@memoize_compute
 class ElectricalPowerSystemWeight(ExplicitComponent):
     """
     Weight estimation for electrical power systems (generation and distribution)
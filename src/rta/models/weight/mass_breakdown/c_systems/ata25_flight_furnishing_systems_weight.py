@@ -19,9 +19,11 @@ from fastoad.module_management.service_registry import RegisterSubmodel
 from rta.models.weight.mass_breakdown.c_systems.constants import (
     SERVICE_MASS_ATA25_SYSTEM,
 )
+from rta.models.memoization import memoize_compute
 
 
 @RegisterSubmodel(SERVICE_MASS_ATA25_SYSTEM, "rta.submodel.mass.system.ata25")
+@memoize_compute
 class FlightFurnishingWeight(ExplicitComponent):
     """
     Weight estimation for flight compartment furnishing
@@ -17,9 +17,11 @@ Estimation of fire protection weight
 from openmdao.core.explicitcomponent import ExplicitComponent
 from fastoad.module_management.service_registry import RegisterSubmodel
 from rta.models.weight.mass_breakdown.c_systems.constants import SERVICE_MASS_ATA26
+from rta.models.memoization import memoize_compute
 
 
 @RegisterSubmodel(SERVICE_MASS_ATA26, "rta.submodel.mass.system.ata26")
+@memoize_compute
 class FireSystemWeight(ExplicitComponent):
     """
     Weight estimation for fire protection systems
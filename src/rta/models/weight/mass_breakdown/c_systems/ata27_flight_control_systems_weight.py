@@ -18,9 +18,11 @@ import numpy as np
 from openmdao.core.explicitcomponent import ExplicitComponent
 from fastoad.module_management.service_registry import RegisterSubmodel
 from rta.models.weight.mass_breakdown.c_systems.constants import SERVICE_MASS_ATA27
+from rta.models.memoization import memoize_compute
 
 
 @RegisterSubmodel(SERVICE_MASS_ATA27, "rta.submodel.mass.system.ata27")
+@memoize_compute
 class FlightControlsSystemWeight(ExplicitComponent):
     """
     Weight estimation for mechanical flight control systems
@@ -18,9 +18,11 @@ import numpy as np
 from openmdao.core.explicitcomponent import ExplicitComponent
 from fastoad.module_management.service_registry import RegisterSubmodel
 from rta.models.weight.mass_breakdown.c_systems.constants import SERVICE_MASS_ATA29
+from rta.models.memoization import memoize_compute
 
 
 @RegisterSubmodel(SERVICE_MASS_ATA29, "rta.submodel.mass.system.ata29")
+@memoize_compute
 class HydraulicPowerSystemWeight(ExplicitComponent):
     """
     Weight estimation for hydraulic power systems (generation and distribution)
@@ -19,9 +19,11 @@ from openmdao.core.explicitcomponent import ExplicitComponent
 from scipy.constants import degree
 from fastoad.module_management.service_registry import RegisterSubmodel
 from rta.models.weight.mass_breakdown.c_systems.constants import SERVICE_MASS_ATA30
+from rta.models.memoization import memoize_compute
 
 
 @RegisterSubmodel(SERVICE_MASS_ATA30, "rta.submodel.mass.system.ata30")
+@memoize_compute
 class DeIceSystemWeight(ExplicitComponent):
     """
     Weight estimation for de-icing systems
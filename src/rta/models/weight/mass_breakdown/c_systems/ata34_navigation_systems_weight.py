@@ -16,10 +16,12 @@ Estimation of navigation systems weight
 
 import numpy as np
 from openmdao.core.explicitcomponent import ExplicitComponent
+from rta.models.memoization import memoize_compute
 
 """ Can be replaced by CS25 model"""
 
 
+@memoize_compute
 class NavigationSystemWeight(ExplicitComponent):
     """
     Weight estimation for navigation systems
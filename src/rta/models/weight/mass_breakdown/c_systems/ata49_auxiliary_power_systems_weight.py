@@ -18,9 +18,11 @@ import numpy as np
 from openmdao.core.explicitcomponent import ExplicitComponent
 from fastoad.module_management.service_registry import RegisterSubmodel
 from rta.models.weight.mass_breakdown.c_systems.constants import SERVICE_MASS_ATA49
+from rta.models.memoization import memoize_compute
 
 
 @RegisterSubmodel(SERVICE_MASS_ATA49, "rta.submodel.mass.system.ata49")
+@memoize_compute
 class APUWeight(ExplicitComponent):
     """
     Weight estimation for Auxiliary Power Unit (APU)